@@ -0,0 +1,212 @@
+"""
+Database concurrency benchmark: stock vs tuned SQLite, and sync vs async
+sessions (database.py).
+
+Boots the app under uvicorn once per profile, each on a fresh database
+seeded with cases and calendar events, and drives a mixed read/write load
+with a fixed client concurrency: case detail, case list and calendar reads
+against case creation, case edits, new calendar events and event
+deletions. Reports throughput and latency separately for reads and
+writes, plus errors (typically "database is locked" 500s under the stock
+settings).
+
+Profiles:
+    stock     LAWBOT_SQLITE_TUNED=0: rollback journal, default pool, no pragmas
+    uncached  WAL, synchronous=NORMAL, mmap, cache, busy_timeout, sized pools
+              and the separate read pool, without the view cache
+    tuned     the same with the case detail and calendar view cache
+              (view_cache.py)
+    async     tuned, with DATABASE_URL=sqlite+aiosqlite:// so the case,
+              document and calendar routers run on an AsyncSession
+
+Usage:
+    python -m benchmarks.db_concurrency
+    python -m benchmarks.db_concurrency --workers 4 --requests 4000 --concurrency 64 --write-ratio 0.5
+    python -m benchmarks.db_concurrency --profiles tuned,async --write-ratio 0.5
+    python -m benchmarks.db_concurrency --profiles uncached,tuned --write-ratio 0.1
+    python -m benchmarks.db_concurrency --profiles tuned --json db.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.replay import REPO_ROOT, _fire, _free_port, _percentile, start_app, stop_app
+
+# profile -> (DATABASE_URL scheme, extra env)
+PROFILES = {
+    "stock": ("sqlite", {"LAWBOT_SQLITE_TUNED": "0"}),
+    "uncached": ("sqlite", {"LAWBOT_SQLITE_TUNED": "1", "LAWBOT_VIEW_CACHE": "0"}),
+    "tuned": ("sqlite", {"LAWBOT_SQLITE_TUNED": "1"}),
+    "async": ("sqlite+aiosqlite", {"LAWBOT_SQLITE_TUNED": "1"}),
+}
+
+# (weight, operation) within reads and within writes
+READS = [(5, "case_detail"), (2, "calendar_range"), (1, "case_list")]
+WRITES = [(2, "update_case"), (2, "create_event"), (1, "create_case"), (1, "delete_event")]
+
+
+def _seed(base_url: str, cases: int, events_per_case: int, rng: random.Random) -> Tuple[List[str], List[str]]:
+    """Create the cases and events the load works on: (case ids, event ids)."""
+    session = requests.Session()
+    case_ids, event_ids = [], []
+    for i in range(cases):
+        resp = session.post(f"{base_url}/api/cases", json={
+            "title": f"Bench case {i}", "case_number": f"BENCH/{i}", "client_name": f"Client {i % 37}",
+            "description": "Seeded by benchmarks.db_concurrency. " * 8,
+        }, timeout=30)
+        resp.raise_for_status()
+        case_ids.append(resp.json()["id"])
+    for case_id in case_ids:
+        for _ in range(events_per_case):
+            resp = session.post(f"{base_url}/api/calendar/events", json=_event_body(case_id, rng), timeout=30)
+            resp.raise_for_status()
+            event_ids.append(resp.json()["id"])
+    return case_ids, event_ids
+
+
+def _event_body(case_id: str, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "case_id": case_id,
+        "title": "Hearing",
+        "event_type": rng.choice(["hearing", "deadline", "reminder"]),
+        "event_date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:30:00",
+    }
+
+
+def build_plan(case_ids: List[str], event_ids: List[str], total: int, write_ratio: float,
+               rng: random.Random) -> List[Dict[str, Any]]:
+    """Concrete requests, each tagged "read" or "write"; every seeded event is deleted at most once."""
+    deletable = list(event_ids)
+    rng.shuffle(deletable)
+    plan = []
+    for n in range(total):
+        case_id = rng.choice(case_ids)
+        if rng.random() < write_ratio:
+            op = rng.choices([o for _, o in WRITES], weights=[w for w, _ in WRITES])[0]
+            if op == "delete_event" and deletable:
+                entry = {"method": "DELETE", "path": f"/api/calendar/events/{deletable.pop()}", "body": None}
+            elif op == "update_case":
+                entry = {"method": "PUT", "path": f"/api/cases/{case_id}",
+                         "body": {"current_stage": f"Stage {n}", "description": f"Edited by request {n}"}}
+            elif op in ("create_event", "delete_event"):
+                entry = {"method": "POST", "path": "/api/calendar/events", "body": _event_body(case_id, rng)}
+            else:
+                entry = {"method": "POST", "path": "/api/cases", "body": {"title": f"Bench new case {n}"}}
+            entry["kind"] = "write"
+        else:
+            op = rng.choices([o for _, o in READS], weights=[w for w, _ in READS])[0]
+            if op == "case_detail":
+                path = f"/api/cases/{case_id}"
+            elif op == "calendar_range":
+                month = rng.randint(1, 11)
+                path = f"/api/calendar/events?start_date=2026-{month:02d}-01T00:00:00&end_date=2026-{month + 1:02d}-01T00:00:00"
+            else:
+                path = "/api/cases?status_filter=active"
+            entry = {"method": "GET", "path": path, "body": None, "kind": "read"}
+        plan.append(entry)
+    return plan
+
+
+def _summarize(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(r["latency"] for r in results)
+    errors = [r for r in results if not (isinstance(r["status"], int) and r["status"] < 400)]
+    return {
+        "requests": len(results),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        "errors": len(errors),
+    }
+
+
+def run_load(base_url: str, plan: List[Dict[str, Any]], concurrency: int, timeout: float) -> Dict[str, Any]:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda e: dict(_fire(base_url, e, timeout), kind=e["kind"]), plan))
+    elapsed = time.perf_counter() - started
+
+    by_status: Dict[str, int] = {}
+    for r in results:
+        by_status[str(r["status"])] = by_status.get(str(r["status"]), 0) + 1
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "total": _summarize(results, elapsed),
+        "read": _summarize([r for r in results if r["kind"] == "read"], elapsed),
+        "write": _summarize([r for r in results if r["kind"] == "write"], elapsed),
+        "status_counts": by_status,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mixed read/write load against stock, tuned and async database settings")
+    parser.add_argument("--profiles", default="stock,tuned", help="Comma-separated: stock, uncached, tuned, async")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn worker processes")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per profile")
+    parser.add_argument("--concurrency", type=int, default=48, help="Concurrent client connections")
+    parser.add_argument("--write-ratio", type=float, default=0.3, help="Share of requests that write")
+    parser.add_argument("--cases", type=int, default=200, help="Cases seeded before the run")
+    parser.add_argument("--events-per-case", type=int, default=3, help="Calendar events seeded per case")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request client timeout")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", dest="json_out", type=Path, help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    tmpdir = tempfile.mkdtemp(prefix="lawbot-dbbench-")
+    runs = []
+    for profile in [p.strip() for p in args.profiles.split(",") if p.strip()]:
+        scheme, profile_env = PROFILES[profile]
+        env = dict(os.environ)
+        env.update(profile_env)
+        env.update({
+            "LAWBOT_ENV_OVERRIDE": "0",
+            "LAWBOT_JOB_INLINE_WORKERS": "0",  # no queue polling in the measurement
+            "DATABASE_URL": f"{scheme}:///{os.path.join(tmpdir, f'{profile}.db')}",
+            # As bootstrap.configure_workers does: workers share one cache (and its invalidations)
+            "LAWBOT_CACHE_DB": os.path.join(tmpdir, f"{profile}-cache.db"),
+            "PYTHONPATH": str(REPO_ROOT) + os.pathsep + env.get("PYTHONPATH", ""),
+        })
+        subprocess.run([sys.executable, "migrate.py"], cwd=str(REPO_ROOT), env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        rng = random.Random(args.seed)
+        port = _free_port()
+        proc = start_app("main:app", args.workers, port, env, "/")
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            case_ids, event_ids = _seed(base_url, args.cases, args.events_per_case, rng)
+            plan = build_plan(case_ids, event_ids, args.requests, args.write_ratio, rng)
+            result = run_load(base_url, plan, args.concurrency, args.timeout)
+        finally:
+            stop_app(proc)
+
+        result["profile"] = profile
+        runs.append(result)
+        read, write = result["read"], result["write"]
+        print(
+            f"{profile:<8} rps={result['total']['throughput_rps']:<8} "
+            f"reads: rps={read['throughput_rps']} p50={read['p50_ms']}ms p95={read['p95_ms']}ms  "
+            f"writes: rps={write['throughput_rps']} p50={write['p50_ms']}ms p95={write['p95_ms']}ms  "
+            f"errors={result['total']['errors']}"
+        )
+
+    summary = {
+        "workers": args.workers, "concurrency": args.concurrency,
+        "write_ratio": args.write_ratio, "requests": args.requests, "runs": runs,
+    }
+    if args.json_out:
+        args.json_out.write_text(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+Local stand-ins for the paid upstreams used by YuktiAI, for load testing
+without spending API quota.
+
+Serves, from a single port:
+    POST /v1/chat/completions        OpenAI chat completions (json_schema structured output)
+    POST /search/                    Indian Kanoon search
+    POST /doc|origdoc|docfragment|docmeta/<id>/   Indian Kanoon document endpoints
+    GET  /search                     SerpAPI Google search
+    POST /v18.0/<id>/messages        Meta Graph WhatsApp send
+
+Latency is drawn per request from a log-normal distribution (median + sigma)
+and a configurable fraction of requests fail with 500 or 429.
+
+Usage:
+    python -m benchmarks.mock_upstreams --port 9100 --median-ms 300 --error-rate 0.02
+
+Point the apps at it with:
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1  OPENAI_API_KEY=mock
+    INDIAN_KANOON_BASE_URL=http://127.0.0.1:9100  INDIAN_KANOON_TOKEN=mock
+    SERPAPI_URL=http://127.0.0.1:9100/search  SERPAPI_KEY=mock
+    META_GRAPH_BASE_URL=http://127.0.0.1:9100  WHATSAPP_API_TOKEN=mock
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+
+class LatencyProfile:
+    """Per-upstream latency/error distribution."""
+
+    def __init__(self, median_ms: float = 200.0, sigma: float = 0.5,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+
+    def sample_delay(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        return rng.lognormvariate(math.log(self.median_ms / 1000.0), self.sigma)
+
+    def sample_status(self, rng: random.Random) -> int:
+        roll = rng.random()
+        if roll < self.error_rate:
+            return 500
+        if roll < self.error_rate + self.rate_limit_rate:
+            return 429
+        return 200
+
+
+# ─── Canned payloads ──────────────────────────────────────────
+
+_ROUTE_KEYWORDS = [
+    ("web_search", ("news", "latest", "amendment", "recent development")),
+    ("procedural_navigator", ("timeline", "limitation", "next step", "deadline", "how many days")),
+    ("drafting_agent", ("draft", "write a", "prepare a", "notice for")),
+    ("adversarial_engine", ("stress-test", "weakness", "opposing", "review my draft")),
+    ("document_processor", ("summarize this", "translate", "extract timeline")),
+    ("legal_search", ("find", "judgment", "judgement", "case law", "precedent")),
+]
+
+
+def _route_for(text: str) -> Dict[str, Any]:
+    lowered = text.lower()
+    target = "general_chat"
+    for tool, words in _ROUTE_KEYWORDS:
+        if any(w in lowered for w in words):
+            target = tool
+            break
+    query = re.sub(r"^user query: '|'$", "", text.strip(), flags=re.IGNORECASE)
+    return {
+        "target_tool": target,
+        "extracted_kwargs": {
+            "query": query,
+            "case_stage": "summons received" if target == "procedural_navigator" else "",
+            "law_code": "CPC" if target == "procedural_navigator" else "",
+            "draft_type": "legal notice" if target == "drafting_agent" else "",
+        },
+        "reasoning": f"mock router matched {target}",
+    }
+
+
+def _plan_for(text: str) -> Dict[str, Any]:
+    query = re.sub(r"^user query: '|'$", "", text.strip(), flags=re.IGNORECASE)
+    parts = [p.strip() for p in re.split(r"\band\b|;", query) if p.strip()][:4] or [query]
+    steps = []
+    for i, part in enumerate(parts, 1):
+        route = _route_for(part)
+        steps.append({"id": f"s{i}", "tool": route["target_tool"] if route["target_tool"] != "unknown" else "general_chat",
+                      **route["extracted_kwargs"], "depends_on": []})
+    return {"steps": steps, "reasoning": f"mock planner split query into {len(steps)} step(s)"}
+
+
+def fill_schema(schema: Dict[str, Any], depth: int = 0) -> Any:
+    """Produce a minimal value that validates against a (strict) JSON schema."""
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if "enum" in schema:
+        return schema["enum"][0]
+    if kind == "object":
+        return {k: fill_schema(v, depth + 1) for k, v in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [fill_schema(schema.get("items", {}), depth + 1)] if depth < 4 else []
+    if kind == "integer":
+        return 7
+    if kind == "number":
+        return 0.5
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return "Mock upstream response."
+
+
+def chat_completion(body: Dict[str, Any]) -> Dict[str, Any]:
+    messages = body.get("messages") or []
+    user_text = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    fmt = (body.get("response_format") or {}).get("json_schema") or {}
+    if fmt.get("name") == "intent_routing":
+        content = json.dumps(_route_for(user_text))
+    elif fmt.get("name") == "tool_plan":
+        content = json.dumps(_plan_for(user_text))
+    elif fmt.get("schema"):
+        content = json.dumps(fill_schema(fmt["schema"]))
+    else:
+        content = "Mock upstream response."
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+    return {
+        "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content, "refusal": None},
+            "logprobs": None,
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_tokens + len(content) // 4,
+        },
+    }
+
+
+def kanoon_search(query: str, pagenum: int) -> Dict[str, Any]:
+    docs = []
+    for i in range(10):
+        tid = 100000 + pagenum * 10 + i
+        docs.append({
+            "tid": tid,
+            "title": f"Mock Judgment {tid} on <b>{query[:40]}</b>",
+            "headline": f"... held that <b>{query[:40]}</b> ...",
+            "docsource": "Supreme Court of India",
+            "docsize": 20000 + i,
+            "cites": i,
+        })
+    return {"docs": docs, "found": "1 - 10 of 100", "categories": []}
+
+
+def kanoon_doc(docid: str) -> Dict[str, Any]:
+    paragraphs = "".join(
+        f"<p>Paragraph {i} of mock judgment {docid}. The court considered the facts. "
+        f"The appeal raises a question of law. Precedent was cited.</p>"
+        for i in range(40)
+    )
+    return {"tid": docid, "title": f"Mock Judgment {docid}", "doc": paragraphs, "docsource": "Mock Court"}
+
+
+def serp_search(query: str, num: int) -> Dict[str, Any]:
+    return {
+        "organic_results": [
+            {"title": f"Mock result {i} for {query[:40]}", "link": f"https://example.org/{i}", "snippet": "Mock snippet."}
+            for i in range(max(1, num))
+        ]
+    }
+
+
+# ─── Server ───────────────────────────────────────────────────
+
+class MockUpstreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, profiles: Dict[str, LatencyProfile], seed: Optional[int] = None):
+        super().__init__(address, _Handler)
+        self.profiles = profiles
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+
+    def draw(self, upstream: str):
+        profile = self.profiles.get(upstream) or self.profiles["default"]
+        with self._rng_lock:
+            self.hits[upstream] = self.hits.get(upstream, 0) + 1
+            return profile.sample_delay(self._rng), profile.sample_status(self._rng)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that redirect every upstream to this server."""
+        base = self.base_url
+        return {
+            "OPENAI_BASE_URL": f"{base}/v1",
+            "OPENAI_API_KEY": "mock",
+            "INDIAN_KANOON_BASE_URL": base,
+            "INDIAN_KANOON_TOKEN": "mock",
+            "SERPAPI_URL": f"{base}/search",
+            "SERPAPI_KEY": "mock",
+            "META_GRAPH_BASE_URL": base,
+            "WHATSAPP_API_TOKEN": "mock",
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockUpstreamServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # keep load-test output clean
+        pass
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, upstream: str, produce) -> None:
+        delay, status = self.server.draw(upstream)
+        if delay:
+            time.sleep(delay)
+        if status != 200:
+            self._send(status, {"error": {"message": f"mock {upstream} error", "type": "mock_error"}})
+            return
+        self._send(200, produce())
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path.rstrip("/") == "/search":
+            qs = parse_qs(parsed.query)
+            query = (qs.get("q") or [""])[0]
+            num = int((qs.get("num") or ["3"])[0])
+            return self._dispatch("serpapi", lambda: serp_search(query, num))
+        if parsed.path == "/health":
+            return self._send(200, {"status": "ok", "hits": self.server.hits})
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        raw = self._body()
+
+        if path.endswith("/chat/completions"):
+            body = json.loads(raw or b"{}")
+            return self._dispatch("openai", lambda: chat_completion(body))
+
+        form = {k: v[0] for k, v in parse_qs(raw.decode(errors="ignore")).items()}
+        if path.rstrip("/") == "/search":
+            return self._dispatch(
+                "kanoon", lambda: kanoon_search(form.get("formInput", ""), int(form.get("pagenum", 0) or 0))
+            )
+        match = re.match(r"^/(doc|origdoc|docfragment|docmeta)/([^/]+)/?$", path)
+        if match:
+            return self._dispatch("kanoon", lambda: kanoon_doc(match.group(2)))
+        if re.match(r"^/v\d+\.\d+/[^/]+/messages$", path):
+            return self._dispatch("meta_graph", lambda: {"messages": [{"id": f"wamid.mock{uuid.uuid4().hex[:8]}"}]})
+        self._send(404, {"error": "not found"})
+
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0,
+                      profiles: Optional[Dict[str, LatencyProfile]] = None,
+                      seed: Optional[int] = None) -> MockUpstreamServer:
+    """Start the stand-in server on a background thread and return it (port 0 = any free port)."""
+    profiles = dict(profiles or {})
+    profiles.setdefault("default", LatencyProfile())
+    server = MockUpstreamServer((host, port), profiles, seed=seed)
+    threading.Thread(target=server.serve_forever, name="mock-upstreams", daemon=True).start()
+    return server
+
+
+def profiles_from_args(args) -> Dict[str, LatencyProfile]:
+    default = LatencyProfile(args.median_ms, args.sigma, args.error_rate, args.rate_limit_rate)
+    profiles = {"default": default}
+    # Per-upstream overrides: --profile openai=800:0.6:0.01:0
+    for spec in args.profile or []:
+        name, _, values = spec.partition("=")
+        parts = [float(v) for v in values.split(":")] + [None] * 4
+        profiles[name] = LatencyProfile(
+            parts[0] if parts[0] is not None else default.median_ms,
+            parts[1] if parts[1] is not None else default.sigma,
+            parts[2] if parts[2] is not None else default.error_rate,
+            parts[3] if parts[3] is not None else default.rate_limit_rate,
+        )
+    return profiles
+
+
+def add_profile_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--median-ms", type=float, default=200.0, help="Median upstream latency")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Log-normal sigma of upstream latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--profile", action="append",
+                        help="Per-upstream override NAME=median_ms:sigma:error_rate:rate_limit_rate "
+                             "(NAME in openai, kanoon, serpapi, meta_graph)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run mock OpenAI / Indian Kanoon / SerpAPI / Meta Graph servers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--seed", type=int, default=None)
+    add_profile_args(parser)
+    args = parser.parse_args()
+
+    server = MockUpstreamServer((args.host, args.port), profiles_from_args(args), seed=args.seed)
+    print(f"Mock upstreams listening on {server.base_url}")
+    for key, value in server.env().items():
+        print(f"  export {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
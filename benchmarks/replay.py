@@ -0,0 +1,308 @@
+"""
+Offline replay load test for main.py / lawbot/backend/app.py.
+
+Starts the mock upstreams (benchmarks/mock_upstreams.py), boots the target
+app under uvicorn once per worker count, replays a weighted query mix with a
+fixed client concurrency, and reports throughput, latency percentiles and
+peak resident memory of the server process tree.
+
+Usage:
+    python -m benchmarks.replay --workers 1,2,4 --requests 400 --concurrency 32
+    python -m benchmarks.replay --app lawbot.backend.app:app --health-path /ping \\
+        --mix my_backend_mix.jsonl --median-ms 50
+
+Mix format (JSONL, one request shape per line, optional "weight"):
+    {"query": "Explain Section 482 CrPC"}                       -> POST /api/query
+    {"method": "GET", "path": "/api/cases"}
+    {"method": "POST", "path": "/api/summarize", "body": {"text": "..."}}
+    {"request_id": "...", "title": "...", "body": "..."}        -> POST /api/query with the title
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from benchmarks.mock_upstreams import add_profile_args, profiles_from_args, start_mock_server
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MIX = Path(__file__).resolve().parent / "query_mix.jsonl"
+
+
+def load_mix(path: Path) -> List[Dict[str, Any]]:
+    """Normalize a JSONL mix into {"method", "path", "body", "weight"} entries."""
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            raw = json.loads(line)
+            if "path" in raw:
+                entry = {"method": raw.get("method", "POST").upper(), "path": raw["path"], "body": raw.get("body")}
+            elif "query" in raw:
+                entry = {"method": "POST", "path": "/api/query", "body": {"query": raw["query"]}}
+            elif "title" in raw:
+                entry = {"method": "POST", "path": "/api/query", "body": {"query": raw["title"]}}
+            else:
+                raise ValueError(f"{path}:{lineno}: unrecognised mix entry")
+            entry["weight"] = float(raw.get("weight", 1))
+            entries.append(entry)
+    if not entries:
+        raise ValueError(f"{path} contains no requests")
+    return entries
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+# ─── Memory sampling (Linux /proc; reports None elsewhere) ─────
+
+def _children(pid: int) -> List[int]:
+    out = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            if int(fields[1]) == pid:
+                out.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return out
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def tree_rss(pid: int) -> Optional[Dict[str, int]]:
+    if not os.path.isdir("/proc"):
+        return None
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        stack.extend(_children(current))
+    per_pid = {p: _rss_bytes(p) for p in pids}
+    return {"total": sum(per_pid.values()), "processes": len(per_pid)}
+
+
+class _MemorySampler(threading.Thread):
+    def __init__(self, pid: int, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_total = 0
+        self.processes = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            sample = tree_rss(self.pid)
+            if sample and sample["total"] > self.peak_total:
+                self.peak_total = sample["total"]
+                self.processes = sample["processes"]
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# ─── Server lifecycle ─────────────────────────────────────────
+
+def start_app(app: str, workers: int, port: int, env: Dict[str, str], health_path: str,
+              timeout: float = 60.0) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "uvicorn", app,
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    # A file, not a pipe: nobody reads stderr during the run, and an app that
+    # logs errors under load would block once a pipe's buffer filled up
+    log = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, cwd=str(REPO_ROOT), env=env,
+                            stdout=subprocess.DEVNULL, stderr=log)
+    deadline = time.monotonic() + timeout
+    url = f"http://127.0.0.1:{port}{health_path}"
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            log.seek(0)
+            raise RuntimeError(f"App exited during startup:\n{log.read().decode(errors='ignore')}")
+        try:
+            if requests.get(url, timeout=1).status_code < 500:
+                return proc
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    stop_app(proc)
+    raise RuntimeError(f"App did not become healthy at {url} within {timeout}s")
+
+
+def stop_app(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+# ─── Load generation ──────────────────────────────────────────
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def _fire(base_url: str, entry: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        resp = _session().request(entry["method"], base_url + entry["path"], json=entry["body"], timeout=timeout)
+        status = resp.status_code
+    except requests.RequestException as e:
+        status = type(e).__name__
+    return {"path": entry["path"], "status": status, "latency": time.perf_counter() - started}
+
+
+def run_load(base_url: str, mix: List[Dict[str, Any]], total: int, concurrency: int,
+             timeout: float, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    plan = rng.choices(mix, weights=[e["weight"] for e in mix], k=total)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda e: _fire(base_url, e, timeout), plan))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(r["latency"] for r in results)
+    errors = [r for r in results if not (isinstance(r["status"], int) and r["status"] < 500)]
+    by_status: Dict[str, int] = {}
+    for r in results:
+        by_status[str(r["status"])] = by_status.get(str(r["status"]), 0) + 1
+
+    return {
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        "errors": len(errors),
+        "status_counts": by_status,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a query mix against the app with mocked upstreams")
+    parser.add_argument("--app", default="main:app", help="uvicorn import string of the app under test")
+    parser.add_argument("--health-path", default="/", help="GET path polled until the app is ready")
+    parser.add_argument("--mix", type=Path, default=DEFAULT_MIX, help="JSONL query mix")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated uvicorn worker counts")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per worker-count run")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client connections")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request client timeout")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests before each run")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--max-p95-ms", type=float, help="Exit non-zero if any run's p95 exceeds this")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the shared result cache (LAWBOT_CACHE=0)")
+    parser.add_argument("--json", dest="json_out", type=Path, help="Also write results to this JSON file")
+    add_profile_args(parser)
+    args = parser.parse_args(argv)
+
+    mix = load_mix(args.mix)
+    mock = start_mock_server(profiles=profiles_from_args(args), seed=args.seed)
+    print(f"Mock upstreams on {mock.base_url}; {len(mix)} request shapes from {args.mix}")
+
+    tmpdir = tempfile.mkdtemp(prefix="lawbot-bench-")
+    env = dict(os.environ)
+    env.update(mock.env())
+    env.update({
+        "LAWBOT_ENV_OVERRIDE": "0",  # keep .env from pointing the app back at real upstreams
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+        "PYTHONPATH": str(REPO_ROOT) + os.pathsep + env.get("PYTHONPATH", ""),
+    })
+    if args.no_cache:
+        env["LAWBOT_CACHE"] = "0"
+    # The app no longer creates its schema at boot
+    subprocess.run([sys.executable, "migrate.py"], cwd=str(REPO_ROOT), env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+    runs = []
+    for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+        port = _free_port()
+        # Each run starts with an empty cache shared by its workers
+        env["LAWBOT_CACHE_DB"] = os.path.join(tmpdir, f"cache-{workers}.db")
+        hits_before = dict(mock.hits)
+        proc = start_app(args.app, workers, port, env, args.health_path)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            if args.warmup:
+                run_load(base_url, mix, args.warmup, min(args.concurrency, args.warmup), args.timeout, args.seed)
+            sampler = _MemorySampler(proc.pid)
+            sampler.start()
+            result = run_load(base_url, mix, args.requests, args.concurrency, args.timeout, args.seed)
+            sampler.stop()
+        finally:
+            stop_app(proc)
+
+        result["workers"] = workers
+        result["upstream_calls"] = {k: v - hits_before.get(k, 0) for k, v in mock.hits.items() if v - hits_before.get(k, 0)}
+        if sampler.peak_total:
+            result["peak_rss_mb"] = round(sampler.peak_total / 2**20, 1)
+            result["rss_per_worker_mb"] = round(sampler.peak_total / 2**20 / max(workers, 1), 1)
+        runs.append(result)
+        print(
+            f"workers={workers:<3} rps={result['throughput_rps']:<8} "
+            f"p50={result['p50_ms']}ms p95={result['p95_ms']}ms p99={result['p99_ms']}ms "
+            f"errors={result['errors']} rss={result.get('peak_rss_mb', 'n/a')}MB "
+            f"upstream_calls={sum(result['upstream_calls'].values())}"
+        )
+
+    mock.shutdown()
+    summary = {"app": args.app, "mix": str(args.mix), "upstream_hits": mock.hits, "runs": runs}
+    if args.json_out:
+        args.json_out.write_text(json.dumps(summary, indent=2))
+    if args.max_p95_ms and any(r["p95_ms"] > args.max_p95_ms for r in runs):
+        print(f"FAIL: p95 above {args.max_p95_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Cold-start benchmark for main.py / lawbot/backend/app.py.
+
+Imports each target module in fresh interpreters under ``python -X importtime``
+and reports the median wall time of the import plus the modules that cost
+the most (cumulative and self time, median across runs). With --serve it
+also boots the app under uvicorn and times process start to first healthy
+response, which adds start-up hooks to the import cost.
+
+Modules that are meant to load lazily (the OpenAI SDK, numpy, requests) are
+checked for: the run fails if any of them is imported at start-up.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --target main --runs 10 --top 25 --serve
+    python -m benchmarks.startup --max-ms 800 --json startup.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks.replay import REPO_ROOT, _free_port, stop_app
+
+DEFAULT_TARGETS = ("main", "lawbot.backend.app")
+DEFAULT_FORBIDDEN = ("openai", "numpy", "requests")
+_APPS = {"main": "main:app", "lawbot.backend.app": "lawbot.backend.app:app"}
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+_PROBE = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(REPO_ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def measure_import(module: str) -> Dict:
+    """One fresh-interpreter import: wall seconds plus per-module importtime rows."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        cwd=str(REPO_ROOT), env=_env(), capture_output=True, text=True, check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cum_us, indent, name = match.groups()
+            # Nesting depth is two spaces per level below the top-level import
+            modules[name] = {"self_us": int(self_us), "cum_us": int(cum_us), "depth": len(indent) // 2}
+    return {"wall_s": float(proc.stdout.strip().splitlines()[-1]), "modules": modules}
+
+
+def measure_serve(module: str, timeout: float = 60.0) -> float:
+    """Seconds from launching uvicorn to the first successful GET /."""
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", _APPS.get(module, f"{module}:app"),
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=str(REPO_ROOT), env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"App exited during startup:\n{proc.stderr.read().decode(errors='ignore')}")
+            try:
+                requests.get(f"http://127.0.0.1:{port}/", timeout=1)
+                return time.perf_counter() - start
+            except requests.RequestException:
+                time.sleep(0.01)
+        raise RuntimeError(f"{module} did not answer within {timeout}s")
+    finally:
+        stop_app(proc)
+
+
+def summarize(module: str, runs: List[Dict], top: int) -> Dict:
+    names = set().union(*(r["modules"] for r in runs))
+
+    def median_of(name: str, field: str) -> float:
+        return statistics.median(r["modules"].get(name, {}).get(field, 0) for r in runs)
+
+    rows = [
+        {
+            "module": name,
+            "cum_ms": round(median_of(name, "cum_us") / 1000, 1),
+            "self_ms": round(median_of(name, "self_us") / 1000, 1),
+            "depth": min(r["modules"][name]["depth"] for r in runs if name in r["modules"]),
+        }
+        for name in names
+    ]
+    direct = sorted((r for r in rows if r["depth"] == 1), key=lambda r: -r["cum_ms"])
+    return {
+        "target": module,
+        "runs": len(runs),
+        "import_ms": round(statistics.median(r["wall_s"] for r in runs) * 1000, 1),
+        "modules_loaded": round(statistics.median(len(r["modules"]) for r in runs)),
+        "direct_imports": direct[:top],
+        "top_self": sorted(rows, key=lambda r: -r["self_ms"])[:top],
+        "loaded": sorted(names),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time per module")
+    parser.add_argument("--target", action="append", help=f"Module to import (default: {', '.join(DEFAULT_TARGETS)})")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=15, help="Modules to list per table")
+    parser.add_argument("--serve", action="store_true", help="Also time uvicorn start to first response")
+    parser.add_argument("--forbid", default=",".join(DEFAULT_FORBIDDEN),
+                        help="Comma-separated modules that must not load at start-up ('' to skip)")
+    parser.add_argument("--max-ms", type=float, help="Exit non-zero if any target's median import exceeds this")
+    parser.add_argument("--json", dest="json_out", help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    forbidden = [m for m in args.forbid.split(",") if m]
+    failed = False
+    results = []
+    for module in args.target or DEFAULT_TARGETS:
+        # First run warms the bytecode cache so every target is measured the same way
+        measure_import(module)
+        summary = summarize(module, [measure_import(module) for _ in range(args.runs)], args.top)
+        if args.serve:
+            summary["serve_ms"] = round(statistics.median(measure_serve(module) for _ in range(args.runs)) * 1000, 1)
+        summary["forbidden_loaded"] = [m for m in forbidden if m in summary["loaded"]]
+        results.append(summary)
+
+        print(f"\n{module}: import {summary['import_ms']}ms (median of {args.runs}), "
+              f"{summary['modules_loaded']} modules"
+              + (f", first response {summary['serve_ms']}ms" if "serve_ms" in summary else ""))
+        print(f"  {'cumulative':>10}  {'self':>8}  direct import")
+        for row in summary["direct_imports"]:
+            print(f"  {row['cum_ms']:>8}ms  {row['self_ms']:>6}ms  {row['module']}")
+        print(f"  {'self':>10}  heaviest modules by own time")
+        for row in summary["top_self"]:
+            print(f"  {row['self_ms']:>8}ms  {row['module']}")
+        if summary["forbidden_loaded"]:
+            print(f"  FAIL: loaded at start-up: {', '.join(summary['forbidden_loaded'])}", file=sys.stderr)
+            failed = True
+        if args.max_ms and summary["import_ms"] > args.max_ms:
+            print(f"  FAIL: import above {args.max_ms}ms", file=sys.stderr)
+            failed = True
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump([{k: v for k, v in r.items() if k != "loaded"} for r in results], f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,625 @@
+"""
+Content-addressed storage for uploaded files.
+
+Each distinct file content is stored once, under the SHA-256 of its bytes
+(models.Blob). A document points at it by hash (Document.blob_sha256, with
+file_path "blob:<key>"), and blobs.ref_count counts those documents: an
+identical upload costs no space, and deleting a document or a case drops
+references instead of removing files another document may share.
+
+    stage(fileobj, ext)       copy an upload to a temp file, hashing it on the way
+    reserve(db, staged)       create (or revive) its blob row; returns the key
+    ensure(key, staged)       make sure the object exists (after flushing the document)
+    local_path(doc)           a file on disk with the document's bytes (for ffmpeg & co.)
+    download(doc, accept)     the HTTP response for a download
+
+Backends (LAWBOT_BLOB_BACKEND):
+    local   files under LAWBOT_BLOB_DIR, fanned out as ab/cd/<key>
+    s3      a bucket on S3 or an S3-compatible store (MinIO, Ceph, ...), via boto3
+    tiered  new blobs on local disk; those not downloaded for
+            LAWBOT_BLOB_COLD_AFTER_DAYS move to the s3 bucket
+
+Text-like formats (.txt, .csv, .json) are stored gzip-compressed when that
+saves at least a tenth. Reads decompress them; downloads hand the gzip
+bytes straight to clients that accept that encoding.
+
+Previews of a blob (preview.py) are stored beside it as <sha256>.<suffix>
+and are deleted with it.
+
+Reference counts change in the transaction that adds, deletes or re-points
+a document (a SQLAlchemy after_flush hook); bulk inserts that bypass the
+unit of work call add_references(). The periodic blob_gc job removes
+blobs unreferenced for LAWBOT_BLOB_GC_GRACE_S, plus stray objects whose
+upload never committed. It deletes the row and then the object inside
+one transaction, and an upload checks for the object only after taking
+its row, so the two exclude each other through the database lock:
+re-uploading content while it is being collected cannot lose the file.
+On SQLite that lock is the single write lock, held while an upload is put
+to S3; use PostgreSQL (a row lock per blob) with a remote backend.
+
+Documents stored before the blob store keep their path on disk;
+`python migrate_blobs.py --import-files` moves them in. Such a path is only
+read or deleted while it resolves to a file under uploads/ (legacy_path()).
+
+Env:
+    LAWBOT_BLOB_BACKEND=local          local | s3 | tiered
+    LAWBOT_BLOB_DIR=uploads/blobs      local store, and the hot tier
+    LAWBOT_BLOB_S3_BUCKET=             bucket for s3 and the cold tier
+    LAWBOT_BLOB_S3_PREFIX=blobs/
+    LAWBOT_BLOB_S3_ENDPOINT=           e.g. http://127.0.0.1:9000 for MinIO (credentials: AWS_* variables)
+    LAWBOT_BLOB_COLD_AFTER_DAYS=30     tiered: days without a download before a blob moves to s3
+    LAWBOT_BLOB_GC_GRACE_S=3600        how long an unreferenced blob is kept
+    LAWBOT_BLOB_GC_INTERVAL_S=3600     pause between blob_gc runs
+"""
+import gzip
+import hashlib
+import itertools
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import Response
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import case, delete, event, func, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+import jobs
+from database import SessionLocal
+from models import Blob, Document, utcnow
+from telemetry import count, observe
+
+BACKEND = os.environ.get("LAWBOT_BLOB_BACKEND", "local")
+BLOB_DIR = os.environ.get("LAWBOT_BLOB_DIR", os.path.join("uploads", "blobs"))
+S3_BUCKET = os.environ.get("LAWBOT_BLOB_S3_BUCKET", "")
+S3_PREFIX = os.environ.get("LAWBOT_BLOB_S3_PREFIX", "blobs/")
+S3_ENDPOINT = os.environ.get("LAWBOT_BLOB_S3_ENDPOINT", "")
+COLD_AFTER_DAYS = float(os.environ.get("LAWBOT_BLOB_COLD_AFTER_DAYS", "30"))
+GC_GRACE_S = float(os.environ.get("LAWBOT_BLOB_GC_GRACE_S", "3600"))
+GC_INTERVAL_S = float(os.environ.get("LAWBOT_BLOB_GC_INTERVAL_S", "3600"))
+
+PREFIX = "blob:"  # Document.file_path of a stored document
+LEGACY_DIR = "uploads"  # where files were stored before the blob store
+# Worth compressing; media, PDFs and office files are compressed already
+COMPRESSIBLE = {".txt", ".csv", ".json"}
+MIN_SAVING = 0.10
+CHUNK = 1024 * 1024
+GC_BATCH = 500
+
+IDENTITY, GZIP = "identity", "gzip"
+HOT, COLD = "hot", "cold"
+
+logger = logging.getLogger("lawbot.blob_store")
+
+
+def key_for(sha256: str, encoding: str) -> str:
+    return f"{sha256}.gz" if encoding == GZIP else sha256
+
+
+# ─── Backends ─────────────────────────────────────────────────
+
+class LocalBackend:
+    """Objects as files under `root`, fanned out by the first hex digits of the key."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def local_path(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        return path if os.path.isfile(path) else None
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def put(self, key: str, source: str) -> None:
+        """Store the file at `source` (consuming it) under `key`."""
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.replace(source, target)
+        except OSError:
+            # Another filesystem: copy next to the target, then rename into place
+            partial = f"{target}.{os.getpid()}.{threading.get_ident()}.part"
+            shutil.copyfile(source, partial)
+            os.replace(partial, target)
+            os.remove(source)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), "rb")
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def list(self) -> Iterator[Tuple[str, float]]:
+        """(key, modified time) of every object."""
+        for folder, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                if not name.endswith(".part"):
+                    yield name, os.path.getmtime(os.path.join(folder, name))
+
+
+class S3Backend:
+    """Objects in a bucket on S3 or an S3-compatible store (MinIO, Ceph, ...), through boto3."""
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint: str = ""):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("The s3 blob backend needs boto3 (pip install boto3).") from e
+        if not bucket:
+            raise RuntimeError("LAWBOT_BLOB_S3_BUCKET is not set.")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint or None)
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def put(self, key: str, source: str) -> None:
+        """Upload the file at `source` (consuming it) under `key`."""
+        self.client.upload_file(source, self.bucket, self.prefix + key)
+        os.remove(source)
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"]
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.prefix + key)
+
+    def list(self) -> Iterator[Tuple[str, float]]:
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                yield item["Key"][len(self.prefix):], item["LastModified"].timestamp()
+
+
+class TieredBackend:
+    """New objects on local disk (hot); demote() moves one to the remote store (cold)."""
+
+    def __init__(self, hot: LocalBackend, cold: S3Backend):
+        self.hot = hot
+        self.cold = cold
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self.hot.local_path(key)
+
+    def exists(self, key: str) -> bool:
+        return self.hot.exists(key) or self.cold.exists(key)
+
+    def put(self, key: str, source: str) -> None:
+        self.hot.put(key, source)
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return self.hot.open(key)
+        except FileNotFoundError:
+            return self.cold.open(key)
+
+    def delete(self, key: str) -> None:
+        self.hot.delete(key)
+        self.cold.delete(key)
+
+    def list(self) -> Iterator[Tuple[str, float]]:
+        yield from self.hot.list()
+        yield from self.cold.list()
+
+    def demote(self, key: str) -> None:
+        path = self.hot.local_path(key)
+        if path is None:
+            return
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        shutil.copyfile(path, partial)
+        self.cold.put(key, partial)
+        self.hot.delete(key)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def backend():
+    """The configured backend, created on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if BACKEND == "local":
+                    _backend = LocalBackend(BLOB_DIR)
+                elif BACKEND == "s3":
+                    _backend = S3Backend(S3_BUCKET, S3_PREFIX, S3_ENDPOINT)
+                elif BACKEND == "tiered":
+                    _backend = TieredBackend(LocalBackend(BLOB_DIR), S3Backend(S3_BUCKET, S3_PREFIX, S3_ENDPOINT))
+                else:
+                    raise RuntimeError(f"Unknown LAWBOT_BLOB_BACKEND {BACKEND!r} (local, s3 or tiered).")
+    return _backend
+
+
+# ─── Writing ──────────────────────────────────────────────────
+
+@dataclass
+class Staged:
+    """An upload copied to a temp file, with its hash."""
+    sha256: str
+    size: int
+    path: str                      # the bytes as uploaded
+    gzip_path: Optional[str]       # a compressed copy, when it saves enough
+
+    def payload(self, encoding: str) -> str:
+        """A temp file holding the object for `encoding`; put() consumes it."""
+        if encoding == GZIP and self.gzip_path is None:
+            self.gzip_path = self.path + ".gz"
+            with open(self.path, "rb") as src, open(self.gzip_path, "wb") as raw, \
+                    gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as out:
+                shutil.copyfileobj(src, out, CHUNK)
+        return self.gzip_path if encoding == GZIP else self.path
+
+    def discard(self) -> None:
+        for path in (self.path, self.gzip_path):
+            if path:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+def _staging() -> str:
+    staging = os.path.join(BLOB_DIR, ".staging")  # same filesystem: put() is a rename
+    os.makedirs(staging, exist_ok=True)
+    return staging
+
+
+@contextmanager
+def stage(source: BinaryIO, ext: str) -> Iterator[Staged]:
+    """Copy an upload to a temp file, hashing (and for text-like formats compressing) it on the way."""
+    fd, path = tempfile.mkstemp(dir=_staging(), suffix=".upload")
+    gzip_path = path + ".gz" if ext.lower() in COMPRESSIBLE else None
+    staged = Staged("", 0, path, None)
+    try:
+        hasher = hashlib.sha256()
+        with os.fdopen(fd, "wb") as out:
+            raw = open(gzip_path, "wb") if gzip_path else None
+            packed = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) if raw else None
+            try:
+                while True:
+                    chunk = source.read(CHUNK)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    out.write(chunk)
+                    staged.size += len(chunk)
+                    if packed:
+                        packed.write(chunk)
+            finally:
+                if packed:
+                    packed.close()
+                    raw.close()
+        staged.sha256 = hasher.hexdigest()
+        staged.gzip_path = gzip_path
+        if gzip_path and os.path.getsize(gzip_path) > staged.size * (1 - MIN_SAVING):
+            os.remove(gzip_path)
+            staged.gzip_path = None
+        yield staged
+    finally:
+        staged.discard()
+
+
+def _insert(db: Session):
+    return (postgresql if db.get_bind().dialect.name == "postgresql" else sqlite).insert(Blob)
+
+
+def reserve(db: Session, staged: Staged) -> str:
+    """
+    Create the blob row for staged content, or revive an unreferenced one,
+    and return the key its documents point at (file_path = PREFIX + key).
+    Add the documents, flush, then call ensure() before committing.
+    """
+    encoding = GZIP if staged.gzip_path else IDENTITY
+    stmt = _insert(db).values(
+        sha256=staged.sha256, size=staged.size, encoding=encoding, tier=HOT, ref_count=0,
+        stored_size=os.path.getsize(staged.payload(encoding)), created_at=utcnow(),
+    )
+    db.execute(stmt.on_conflict_do_update(index_elements=[Blob.sha256], set_={"released_at": None}))
+    # Content stored before keeps its first encoding
+    stored = db.execute(select(Blob.encoding).where(Blob.sha256 == staged.sha256)).scalar_one()
+    return key_for(staged.sha256, stored)
+
+
+def ensure(key: str, staged: Staged) -> None:
+    """Put the object unless the backend has it (a duplicate upload stores nothing)."""
+    store = backend()
+    if store.exists(key):
+        count("lawbot_blob_uploads_total", result="deduplicated")
+        return
+    started = time.perf_counter()
+    store.put(key, staged.payload(GZIP if key.endswith(".gz") else IDENTITY))
+    observe("lawbot_blob_put_seconds", time.perf_counter() - started)
+    count("lawbot_blob_uploads_total", result="stored")
+
+
+@contextmanager
+def scratch(suffix: str = "") -> Iterator[str]:
+    """A temp file path for an object the app writes itself (a preview); removed unless put() took it."""
+    fd, path = tempfile.mkstemp(dir=_staging(), suffix=suffix)
+    os.close(fd)
+    try:
+        yield path
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# ─── Reference counts ─────────────────────────────────────────
+
+@event.listens_for(Session, "after_flush")
+def _count_references(session: Session, _flush_context) -> None:
+    deltas: Counter = Counter()
+    for obj in session.new:
+        if isinstance(obj, Document) and obj.blob_sha256:
+            deltas[obj.blob_sha256] += 1
+    for obj in session.dirty:
+        if isinstance(obj, Document):
+            history = inspect(obj).attrs.blob_sha256.history
+            for sha in history.added or ():
+                if sha:
+                    deltas[sha] += 1
+            for sha in history.deleted or ():
+                if sha:
+                    deltas[sha] -= 1
+    for obj in session.deleted:
+        if isinstance(obj, Document):
+            history = inspect(obj).attrs.blob_sha256.history
+            for sha in itertools.chain(history.unchanged or (), history.deleted or ()):
+                if sha:
+                    deltas[sha] -= 1
+    _apply(session, deltas)
+
+
+def add_references(session: Session, hashes: Iterable[Optional[str]]) -> None:
+    """Count documents inserted without the unit of work (insert(Document) executemany)."""
+    _apply(session, Counter(sha for sha in hashes if sha))
+
+
+def _apply(session: Session, deltas: Counter) -> None:
+    now = utcnow()
+    conn = None
+    for sha, delta in deltas.items():
+        if delta:
+            conn = conn or session.connection()
+            conn.execute(
+                update(Blob).where(Blob.sha256 == sha).values(
+                    ref_count=Blob.ref_count + delta,
+                    released_at=case((Blob.ref_count + delta <= 0, now), else_=None),
+                )
+            )
+
+
+# ─── Reading ──────────────────────────────────────────────────
+
+def _key(doc: Document) -> Optional[str]:
+    return doc.file_path[len(PREFIX):] if doc.file_path.startswith(PREFIX) else None
+
+
+def _within(path: str, root: str) -> bool:
+    root = os.path.realpath(root)
+    return path != root and os.path.commonpath([path, root]) == root
+
+
+def legacy_path(file_path: str) -> Optional[str]:
+    """
+    The real path of a file stored before the blob store, or None unless it
+    lies under LEGACY_DIR (and outside the local blob store, whose files
+    belong to their blobs). Symlinks and ".." are resolved first.
+    """
+    path = os.path.realpath(file_path)
+    if not _within(path, LEGACY_DIR) or _within(path, BLOB_DIR):
+        return None
+    return path
+
+
+def _open(key: str) -> BinaryIO:
+    raw = backend().open(key)
+    return gzip.GzipFile(fileobj=raw, mode="rb") if key.endswith(".gz") else raw
+
+
+@contextmanager
+def local_path(doc: Document) -> Iterator[str]:
+    """A file on disk with the document's bytes: the stored file itself when it can be, else a temp copy."""
+    key = _key(doc)
+    if key is None:
+        path = legacy_path(doc.file_path)
+        if path is None:
+            raise FileNotFoundError(doc.file_path)
+        yield path
+        return
+    path = None if key.endswith(".gz") else backend().local_path(key)
+    if path is not None:
+        yield path
+        return
+    fd, path = tempfile.mkstemp(suffix=f".{doc.file_type}" if doc.file_type else "")
+    try:
+        with os.fdopen(fd, "wb") as out, _open(key) as src:
+            shutil.copyfileobj(src, out, CHUNK)
+        yield path
+    finally:
+        os.remove(path)
+
+
+def _stream(fileobj: BinaryIO) -> Iterator[bytes]:
+    with fileobj:
+        while True:
+            chunk = fileobj.read(CHUNK)
+            if not chunk:
+                break
+            yield chunk
+
+
+def download(doc: Document, accept_encoding: str = "") -> Response:
+    """
+    The download response for a document: the file itself where it is on
+    local disk (ranges work), else a stream, compressed objects going out
+    with Content-Encoding: gzip to clients that accept it. Raises
+    FileNotFoundError when the bytes are missing.
+    """
+    key = _key(doc)
+    if key is None:
+        path = legacy_path(doc.file_path)
+        if path is None or not os.path.isfile(path):
+            raise FileNotFoundError(doc.file_path)
+        return FileResponse(path=path, filename=doc.original_filename, media_type="application/octet-stream")
+    _note_access(doc.blob_sha256)
+    store = backend()
+    if not key.endswith(".gz"):
+        path = store.local_path(key)
+        if path is not None:
+            return FileResponse(path=path, filename=doc.original_filename, media_type="application/octet-stream")
+    if not store.exists(key):
+        raise FileNotFoundError(key)
+    headers = {"Content-Disposition": f"attachment; filename*=utf-8''{quote(doc.original_filename)}"}
+    if key.endswith(".gz") and "gzip" in accept_encoding.lower():
+        headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(_stream(store.open(key)), media_type="application/octet-stream", headers=headers)
+    if doc.file_size is not None:
+        headers["Content-Length"] = str(doc.file_size)
+    return StreamingResponse(_stream(_open(key)), media_type="application/octet-stream", headers=headers)
+
+
+def object_response(key: str, media_type: str, headers: Dict[str, str]) -> Response:
+    """A stored object as is (a preview): from local disk where it is there, else streamed."""
+    store = backend()
+    path = store.local_path(key)
+    if path is not None:
+        return FileResponse(path=path, media_type=media_type, headers=headers)
+    if not store.exists(key):
+        raise FileNotFoundError(key)
+    return StreamingResponse(_stream(store.open(key)), media_type=media_type, headers=headers)
+
+
+def _note_access(sha256: Optional[str]) -> None:
+    """Record a download (at most daily per blob) so the tiered backend keeps it hot."""
+    if BACKEND != "tiered" or not sha256:
+        return
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Blob)
+            .where(Blob.sha256 == sha256,
+                   func.coalesce(Blob.accessed_at, Blob.created_at) < utcnow() - timedelta(days=1))
+            .values(accessed_at=utcnow())
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def discard_legacy(doc: Document) -> None:
+    """Remove the file of a document stored before the blob store (blobs are collected instead)."""
+    path = legacy_path(doc.file_path) if _key(doc) is None else None
+    if path is not None and os.path.isfile(path):
+        os.remove(path)
+
+
+# ─── Garbage collection ───────────────────────────────────────
+
+def collect_garbage(grace_s: float = GC_GRACE_S) -> Dict[str, int]:
+    """Delete unreferenced blobs, stray objects and (tiered) demote cold blobs; returns the tallies."""
+    store = backend()
+    cutoff = utcnow() - timedelta(seconds=grace_s)
+    tallies = {"blobs_removed": 0, "bytes_freed": 0, "strays_removed": 0, "demoted": 0}
+    db = SessionLocal()
+    try:
+        expired = db.execute(
+            select(Blob.sha256, Blob.encoding, Blob.stored_size, Blob.preview)
+            .where(Blob.ref_count <= 0, Blob.released_at.isnot(None), Blob.released_at < cutoff)
+            .limit(GC_BATCH * 10)
+        ).all()
+        for sha, encoding, stored_size, preview in expired:
+            # Row, then object, then commit: an upload of the same content waits
+            # for this transaction and then finds the object gone (see ensure())
+            gone = db.execute(
+                delete(Blob).where(Blob.sha256 == sha, Blob.ref_count <= 0, Blob.released_at < cutoff)
+            ).rowcount == 1
+            if gone:
+                store.delete(key_for(sha, encoding))
+                if preview:
+                    store.delete(preview)
+                tallies["blobs_removed"] += 1
+                tallies["bytes_freed"] += stored_size
+            db.commit()
+
+        # Objects with no row: uploads whose transaction rolled back, and
+        # previews rendered for content collected in the meantime
+        stale_before = time.time() - grace_s
+        batch: List[str] = []
+
+        def sweep(keys: List[str]) -> None:
+            known = set(db.execute(select(Blob.sha256).where(Blob.sha256.in_([k[:64] for k in keys]))).scalars())
+            for key in keys:
+                if key[:64] not in known:
+                    store.delete(key)
+                    tallies["strays_removed"] += 1
+
+        for key, modified in store.list():
+            if modified < stale_before:
+                batch.append(key)
+                if len(batch) >= GC_BATCH:
+                    sweep(batch)
+                    batch = []
+        if batch:
+            sweep(batch)
+        # Temp files of uploads that died mid-request
+        for entry in os.scandir(_staging()):
+            if entry.stat().st_mtime < stale_before:
+                os.remove(entry.path)
+
+        if isinstance(store, TieredBackend) and COLD_AFTER_DAYS > 0:
+            cold = db.execute(
+                select(Blob.sha256, Blob.encoding)
+                .where(Blob.tier == HOT, Blob.ref_count > 0,
+                       func.coalesce(Blob.accessed_at, Blob.created_at) < utcnow() - timedelta(days=COLD_AFTER_DAYS))
+                .limit(GC_BATCH)
+            ).all()
+            for sha, encoding in cold:
+                store.demote(key_for(sha, encoding))
+                db.execute(update(Blob).where(Blob.sha256 == sha).values(tier=COLD))
+                db.commit()
+                tallies["demoted"] += 1
+    finally:
+        db.close()
+    for name, value in tallies.items():
+        count("lawbot_blob_gc_total", value, result=name)
+    return tallies
+
+
+def _run_gc(ctx: "jobs.JobContext", payload: Dict[str, Any]) -> Dict[str, int]:
+    tallies = collect_garbage()
+    if any(tallies.values()):
+        logger.info("Blob GC: %s", tallies)
+    return tallies
+
+
+jobs.register("blob_gc", _run_gc, max_attempts=1, every_s=GC_INTERVAL_S)
@@ -0,0 +1,139 @@
+"""
+Process start-up helpers: environment loading and lazy imports.
+
+Cold start matters on serverless and autoscaled deployments, so the API
+imports only what it needs to accept a request. The OpenAI SDK alone
+takes ~0.4s to import; it, the tool modules and numpy are loaded on
+first use instead.
+
+    load_env()          load .env once per process (every module may call it)
+    lazy_function(m, n) stand-in for m.n that imports m on first call
+    openai_client(key)  shared OpenAI client, with the request's budget applied
+    preload()           import the lazily loaded modules now (LAWBOT_PRELOAD=1
+                        does this in the background at server start-up)
+    configure_workers() defaults for running several worker processes
+    after_fork()        reset per-process state in a worker forked from a
+                        preloaded master (gunicorn.conf.py)
+
+Env:
+    LAWBOT_ENV_OVERRIDE=1   values in .env override the caller's environment
+    LAWBOT_WORKERS=         worker processes for `python main.py` / gunicorn (default: CPU count)
+"""
+import importlib
+import os
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+from request_budget import openai_options
+
+# Modules the API defers; preload() imports them ahead of the first request
+LAZY_MODULES = (
+    "openai",
+    "tools.legal_search",
+    "tools.web_search",
+    "tools.adversarial_engine",
+    "tools.procedural_navigator",
+    "tools.document_processor",
+    "tools.general_chat",
+    "tools.drafting_agent",
+    "tools.deadline_engine",
+)
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """
+    Load .env into os.environ, once per process. LAWBOT_ENV_OVERRIDE=0 keeps
+    variables already set by the caller (e.g. the load-test harness pointing
+    upstreams at local stand-ins).
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if _env_loaded:
+            return
+        try:
+            from dotenv import load_dotenv
+        except ImportError:  # dotenv is optional; the shell may set everything
+            pass
+        else:
+            load_dotenv(override=os.environ.get("LAWBOT_ENV_OVERRIDE", "1") == "1")
+        _env_loaded = True
+
+
+def lazy_function(module: str, name: str) -> Callable[..., Any]:
+    """A callable that imports `module` on its first call and forwards to `module.name`."""
+    target = None
+
+    def call(*args, **kwargs):
+        nonlocal target
+        if target is None:
+            target = getattr(importlib.import_module(module), name)
+        return target(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    call.__doc__ = f"Lazily imported {module}.{name}."
+    return call
+
+
+_clients: Dict[Tuple[str, str], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def openai_client(api_key: str):
+    """
+    An OpenAI client for `api_key` with the active request's timeout and
+    retry policy. The SDK is imported, and the underlying client (with its
+    connection pool) created, once per key rather than on every call.
+    """
+    key = (api_key, os.environ.get("OPENAI_BASE_URL", ""))
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                from openai import OpenAI
+                client = _clients[key] = OpenAI(api_key=api_key)
+    return client.with_options(**openai_options())
+
+
+def preload() -> None:
+    """Import every lazily loaded module now."""
+    for module in LAZY_MODULES:
+        importlib.import_module(module)
+
+
+def worker_count() -> int:
+    return int(os.environ.get("LAWBOT_WORKERS", "0")) or (os.cpu_count() or 1)
+
+
+def configure_workers(workers: int) -> None:
+    """
+    With more than one worker, per-process caches and sessions would be
+    duplicated (and a follow-up could land on a worker that never saw the
+    conversation), so default both to SQLite files every worker shares.
+    Must run before the app is imported; explicit settings win.
+    """
+    if workers > 1:
+        os.environ.setdefault("LAWBOT_CACHE_DB", os.path.abspath("lawbot_cache.db"))
+        os.environ.setdefault("LAWBOT_SESSION_DB", os.path.abspath("lawbot_sessions.db"))
+
+
+def after_fork() -> None:
+    """Drop connections a forked worker inherited from the master process."""
+    from database import async_engine, async_read_engine, engine, read_engine
+    from session_store import store
+
+    for pool_engine in (engine, read_engine, async_engine, async_read_engine):
+        if pool_engine is not None:
+            (getattr(pool_engine, "sync_engine", None) or pool_engine).dispose(close=False)
+    store.reopen()
+
+
+def preload_in_background() -> threading.Thread:
+    thread = threading.Thread(target=preload, name="preload", daemon=True)
+    thread.start()
+    return thread
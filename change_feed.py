@@ -0,0 +1,112 @@
+"""
+Change feed for cases, documents and calendar events.
+
+Every write to one of them appends a row to the `changes` table (models.Change)
+in the same transaction: the entity, its id and whether it now exists
+("upsert") or is gone ("delete"). Change ids only grow, so the id of the
+last change a client has seen is its sync token; GET /api/sync?since=<token>
+(routers/sync.py) returns the current state of everything changed after it,
+plus tombstones for what was deleted.
+
+Rows are written by a SQLAlchemy after_flush hook, so every unit-of-work
+write is covered (sync and async routers, transcription progress, cascaded
+deletes). Statements that bypass the unit of work (insert(Model)
+executemany in bulk import and deadline sync) report their rows with
+record().
+
+Ids are assigned inside the write transaction. SQLite takes one writer at a
+time, so they commit in order; with concurrent writers on PostgreSQL a
+later id can commit first, so there the feed holds back changes younger
+than LAWBOT_SYNC_SETTLE_S.
+
+Changes older than LAWBOT_SYNC_RETENTION_DAYS are pruned (the newest is
+always kept); a client whose token predates them is told to start over.
+
+Env:
+    LAWBOT_SYNC_RETENTION_DAYS=30   how long changes are kept
+    LAWBOT_SYNC_SETTLE_S=2          hold-back for out-of-order commits (not SQLite)
+"""
+import itertools
+import os
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from database import is_sqlite
+from models import CalendarEvent, Case, Change, Document, utcnow
+
+RETENTION_DAYS = float(os.environ.get("LAWBOT_SYNC_RETENTION_DAYS", "30"))
+SETTLE_S = 0.0 if is_sqlite else float(os.environ.get("LAWBOT_SYNC_SETTLE_S", "2"))
+PRUNE_EVERY = 1000  # changes recorded by this process between prunes
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+ENTITIES = {Case: "case", Document: "document", CalendarEvent: "event"}
+
+_unpruned = 0
+
+
+def _counted_in(obj, added_or_removed: bool) -> List[str]:
+    """Cases whose document or event count changes with `obj` (on a re-link, old and new)."""
+    history = inspect(obj).attrs.case_id.history
+    if not added_or_removed and not history.has_changes():
+        return []
+    values = itertools.chain(history.added or (), history.unchanged or (), history.deleted or ())
+    return [case_id for case_id in values if case_id]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, _flush_context) -> None:
+    ops: Dict[Tuple[str, str], str] = {}
+    dirty = session.dirty
+    for obj in itertools.chain(session.new, dirty, session.deleted):
+        if isinstance(obj, (Document, CalendarEvent)):
+            # CaseResponse carries the counts
+            for case_id in _counted_in(obj, obj not in dirty):
+                ops[("case", case_id)] = UPSERT
+    for obj in itertools.chain(session.new, dirty):
+        entity = ENTITIES.get(type(obj))
+        if entity is not None and session.is_modified(obj, include_collections=False):
+            ops[(entity, obj.id)] = UPSERT
+    for obj in session.deleted:
+        entity = ENTITIES.get(type(obj))
+        if entity is not None:
+            ops[(entity, obj.id)] = DELETE
+    if ops:
+        _write(session, [(entity, entity_id, op) for (entity, entity_id), op in ops.items()])
+
+
+def record(session: Session, entity: str, ids: Iterable[str], case_ids: Iterable[Optional[str]] = ()) -> None:
+    """
+    Log rows inserted without the unit of work (and, for documents and
+    events, the cases whose counts they change); committed or rolled back
+    with the session.
+    """
+    changes = [(entity, entity_id, UPSERT) for entity_id in ids]
+    changes += [("case", case_id, UPSERT) for case_id in dict.fromkeys(case_ids) if case_id]
+    if changes:
+        _write(session, changes)
+
+
+def _write(session: Session, changes) -> None:
+    now = utcnow()
+    conn = session.connection()
+    conn.execute(insert(Change), [
+        {"entity": entity, "entity_id": entity_id, "op": op, "changed_at": now}
+        for entity, entity_id, op in changes
+    ])
+    global _unpruned
+    _unpruned += len(changes)
+    if _unpruned >= PRUNE_EVERY:
+        _unpruned = 0
+        _prune(conn, now)
+
+
+def _prune(conn, now) -> None:
+    newest = select(func.max(Change.id)).scalar_subquery()
+    conn.execute(
+        delete(Change).where(Change.changed_at < now - timedelta(days=RETENTION_DAYS), Change.id < newest)
+    )
@@ -0,0 +1,217 @@
+"""
+Per-upstream circuit breakers for YuktiAI.
+
+Each upstream (openai, kanoon, serpapi, meta_graph) has one breaker shared by
+every call site. After FAILURE_THRESHOLD consecutive failures (timeouts,
+connection errors, 5xx, 429) the breaker opens and calls fail immediately with
+CircuitOpen, so callers can fall back instead of waiting out a timeout. After
+COOLDOWN_S one probe call is let through (half-open); its outcome closes the
+breaker or re-opens it for another cooldown. A call that times out because
+the request's time budget ran out says nothing about the upstream: guard()
+turns it into BudgetExceeded and does not count it.
+
+Env:
+    LAWBOT_BREAKERS=0             disable breaking (calls are always allowed)
+    LAWBOT_BREAKER_FAILURES=5     consecutive failures that open a breaker
+    LAWBOT_BREAKER_COOLDOWN_S=30  seconds an open breaker waits before probing
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from telemetry import count, gauge, registry
+from request_budget import BudgetExceeded, budget_allows, check_budget, current_budget
+from shared_cache import mark_uncacheable
+
+BREAKERS_ENABLED = os.environ.get("LAWBOT_BREAKERS", "1") != "0"
+FAILURE_THRESHOLD = int(os.environ.get("LAWBOT_BREAKER_FAILURES", "5"))
+COOLDOWN_S = float(os.environ.get("LAWBOT_BREAKER_COOLDOWN_S", "30"))
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+# Gauge encoding of the states for lawbot_circuit_state
+_STATE_VALUE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+registry.describe("lawbot_circuit_state", "Upstream circuit breaker state (0 closed, 1 half-open, 2 open).")
+registry.describe("lawbot_circuit_transitions_total", "Circuit breaker state changes by upstream and new state.")
+registry.describe("lawbot_circuit_rejected_total", "Upstream calls failed fast by an open circuit breaker.")
+registry.describe("lawbot_fallback_total", "Requests answered from a fallback because an upstream was unavailable.")
+registry.describe("lawbot_upstream_errors_total", "Failed upstream calls by upstream and HTTP status (or exception type).")
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"{upstream} is temporarily unavailable (circuit open); retry in {retry_after:.0f}s.")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+def _status_of(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Whether an exception says something about the upstream's health."""
+    # An SDK that was never imported cannot have raised the exception, so
+    # look the modules up rather than importing them here.
+    requests = sys.modules.get("requests")
+    if requests and isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    openai = sys.modules.get("openai")
+    if openai and isinstance(exc, (openai.APIConnectionError, openai.InternalServerError, openai.RateLimitError)):
+        return True
+    status = _status_of(exc)
+    return status is not None and (status >= 500 or status == 429)
+
+
+def is_timeout(exc: BaseException) -> bool:
+    """Whether an exception is an upstream call running out of time."""
+    requests = sys.modules.get("requests")
+    if requests and isinstance(exc, requests.exceptions.Timeout):
+        return True
+    openai = sys.modules.get("openai")
+    return bool(openai and isinstance(exc, openai.APITimeoutError))
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, cooldown_s: float = COOLDOWN_S):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        gauge("lawbot_circuit_state", 0, upstream=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def retry_after(self) -> float:
+        with self._lock:
+            return max(0.0, self._opened_at + self.cooldown_s - time.monotonic())
+
+    def _transition(self, state: str) -> None:
+        # Caller holds the lock
+        if state == self._state:
+            return
+        self._state = state
+        gauge("lawbot_circuit_state", _STATE_VALUE[state], upstream=self.name)
+        count("lawbot_circuit_transitions_total", upstream=self.name, state=state)
+
+    def allow(self) -> None:
+        """Raise CircuitOpen unless a call may go out now."""
+        if not BREAKERS_ENABLED:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self._state == CLOSED:
+                return
+            if self._state == OPEN and now - self._opened_at >= self.cooldown_s:
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                # One probe at a time; a probe that never reported back is
+                # given up on after a cooldown so the breaker cannot wedge.
+                if self._probe_started is None or now - self._probe_started >= self.cooldown_s:
+                    self._probe_started = now
+                    return
+            retry_after = max(0.0, self._opened_at + self.cooldown_s - now)
+        count("lawbot_circuit_rejected_total", upstream=self.name)
+        raise CircuitOpen(self.name, retry_after)
+
+    def record(self, ok: Optional[bool]) -> None:
+        """Report a call's outcome: True healthy, False failed, None says nothing about the upstream."""
+        with self._lock:
+            self._probe_started = None
+            if ok is None:
+                return
+            if ok:
+                self._failures = 0
+                self._transition(CLOSED)
+                return
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def record_status(self, status_code: int) -> None:
+        """Report an HTTP response: 5xx and 429 count as failures, anything else as healthy."""
+        if not 200 <= status_code < 300:
+            count("lawbot_upstream_errors_total", upstream=self.name, status=str(status_code))
+        self.record(not (status_code >= 500 or status_code == 429))
+
+    @contextmanager
+    def guard(self):
+        """
+        Wrap one upstream call:
+
+            with breaker("openai").guard():
+                client.chat.completions.create(...)
+        """
+        self.allow()
+        try:
+            yield
+        except BudgetExceeded:
+            self.record(None)
+            raise
+        except Exception as e:
+            if is_timeout(e) and not budget_allows(0):
+                # The call was cut short by the request's budget (its timeout is
+                # what was left of it): the request ran out of time, not the upstream
+                self.record(None)
+                check_budget()
+            status = _status_of(e)
+            if status is not None or is_upstream_failure(e):
+                # An SDK raises for non-2xx responses, timeouts and refused connections
+                count("lawbot_upstream_errors_total", upstream=self.name, status=str(status or type(e).__name__))
+            self.record(False if is_upstream_failure(e) else None)
+            raise
+        else:
+            self.record(True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_started = None
+            self._transition(CLOSED)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+UPSTREAMS = ("openai", "kanoon", "serpapi", "meta_graph")
+
+
+def breaker(name: str) -> CircuitBreaker:
+    """The shared breaker for an upstream, created on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def breaker_states() -> Dict[str, str]:
+    return {name: breaker(name).state for name in UPSTREAMS}
+
+
+def note_fallback(upstream: str, kind: str) -> None:
+    """Record that a request was answered by a fallback (counted, and listed in its budget report)."""
+    count("lawbot_fallback_total", upstream=upstream, kind=kind)
+    # A degraded answer must not be served from the cache once the upstream is back
+    mark_uncacheable()
+    budget = current_budget.get()
+    if budget is not None:
+        budget.note_fallback(upstream, kind)
+
+
+# Register the known upstreams so their state shows in /metrics from the start
+for _name in UPSTREAMS:
+    breaker(_name)
@@ -1,23 +1,113 @@
 """
 Database engine, session factory, and declarative base for YuktiAI.
 Uses SQLite for the MVP — zero-config, file-based storage.
+
+SQLite is tuned for a multi-threaded server: WAL journaling (readers and
+the writer no longer block each other), synchronous=NORMAL (durable at
+every checkpoint, one fsync fewer per commit), a memory-mapped file, a
+larger page cache and a busy timeout, so a second writer waits for the
+lock instead of failing with "database is locked". The pool holds a
+connection for every threadpool slot rather than SQLAlchemy's default 5.
+
+Read-only endpoints depend on get_read_db instead of get_db. With SQLite
+that is a second pool of query_only connections, so reads never wait for
+a connection behind writers; elsewhere it uses DATABASE_READ_URL (e.g. a
+replica) when set, else the primary engine.
+
+An async driver in DATABASE_URL (sqlite+aiosqlite://, postgresql+asyncpg://)
+also creates async_engine / AsyncSessionLocal and switches the case,
+document and calendar routers to their async versions (routers/*_async.py),
+which never hold a threadpool thread while waiting on the database. The
+rest of the app (jobs, transcription, bulk import, migrations) keeps a
+sync engine on the same database through the matching sync driver.
+
+Env:
+    DATABASE_URL=sqlite:///./lawbot.db
+    DATABASE_READ_URL=               read-only endpoints' database (not SQLite)
+    LAWBOT_SQLITE_TUNED=1            0: stock SQLite settings (for comparison)
+    LAWBOT_SQLITE_MMAP_MB=256        memory-mapped I/O window
+    LAWBOT_SQLITE_CACHE_MB=16        page cache per connection
+    LAWBOT_SQLITE_BUSY_MS=5000       how long a writer waits for the lock
+    LAWBOT_DB_POOL_SIZE=40           connections per pool (Starlette runs 40 threads)
+    LAWBOT_DB_POOL_OVERFLOW=10       extra connections for job workers and bursts
 """
 import os
-from sqlalchemy import create_engine
+from typing import Optional, Tuple
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 
-DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./lawbot.db")
+# Async driver -> the sync driver used for the same database by the rest of the app
+ASYNC_DRIVERS = {"sqlite+aiosqlite": "sqlite", "postgresql+asyncpg": "postgresql"}
 
-# Fix for some cloud providers returning postgres:// instead of postgresql://
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
+def _split_url(url: str) -> Tuple[str, Optional[str]]:
+    """(sync URL, async URL or None) for a configured database URL."""
+    # Fix for some cloud providers returning postgres:// instead of postgresql://
+    if url.startswith("postgres://") or url.startswith("postgres+"):
+        url = "postgresql" + url[len("postgres"):]
+    parsed = make_url(url) if url else None
+    if parsed is None or parsed.drivername not in ASYNC_DRIVERS:
+        return url, None
+    sync_url = parsed.set(drivername=ASYNC_DRIVERS[parsed.drivername])
+    return sync_url.render_as_string(hide_password=False), url
+
+
+DATABASE_URL, ASYNC_DATABASE_URL = _split_url(os.environ.get("DATABASE_URL", "sqlite:///./lawbot.db"))
+DATABASE_READ_URL, ASYNC_DATABASE_READ_URL = _split_url(os.environ.get("DATABASE_READ_URL", ""))
+ASYNC_DB = ASYNC_DATABASE_URL is not None
+
+SQLITE_TUNED = os.environ.get("LAWBOT_SQLITE_TUNED", "1") == "1"
+SQLITE_MMAP_MB = int(os.environ.get("LAWBOT_SQLITE_MMAP_MB", "256"))
+SQLITE_CACHE_MB = int(os.environ.get("LAWBOT_SQLITE_CACHE_MB", "16"))
+SQLITE_BUSY_MS = int(os.environ.get("LAWBOT_SQLITE_BUSY_MS", "5000"))
+POOL_SIZE = int(os.environ.get("LAWBOT_DB_POOL_SIZE", "40"))
+POOL_OVERFLOW = int(os.environ.get("LAWBOT_DB_POOL_OVERFLOW", "10"))
+
+is_sqlite = DATABASE_URL.startswith("sqlite")
+# An in-memory database exists once per connection: no WAL, no second pool
+_sqlite_memory = is_sqlite and (
+    DATABASE_URL in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in DATABASE_URL
+)
+
+
+def _sqlite_pragmas(read_only: bool):
+    def on_connect(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        try:
+            # busy_timeout first: switching to WAL needs the lock briefly
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_MS}")
+            if not _sqlite_memory:
+                cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_MB * 1024 * 1024}")
+            cursor.execute(f"PRAGMA cache_size={-SQLITE_CACHE_MB * 1024}")  # negative: KiB
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+    return on_connect
+
+
+def _create_sqlite_engine(read_only: bool = False):
+    options = {}
+    if SQLITE_TUNED and not _sqlite_memory:
+        options.update(poolclass=QueuePool, pool_size=POOL_SIZE, max_overflow=POOL_OVERFLOW)
+    sqlite_engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},
         echo=False,
+        **options,
     )
+    if SQLITE_TUNED:
+        event.listen(sqlite_engine, "connect", _sqlite_pragmas(read_only))
+    return sqlite_engine
+
+
+if is_sqlite:
+    engine = _create_sqlite_engine()
+    read_engine = _create_sqlite_engine(read_only=True) if SQLITE_TUNED and not _sqlite_memory else engine
 else:
     # PostgreSQL configuration
     engine = create_engine(
@@ -25,8 +115,46 @@ else:
         echo=False,
         pool_pre_ping=True,  # Recommended for remote DBs
     )
+    read_engine = create_engine(DATABASE_READ_URL, echo=False, pool_pre_ping=True) if DATABASE_READ_URL else engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+async_engine = async_read_engine = None
+AsyncSessionLocal = AsyncReadSessionLocal = None
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    def _create_async_sqlite_engine(read_only: bool = False):
+        options = {}
+        if SQLITE_TUNED and not _sqlite_memory:
+            # SQLite takes one writer at a time, and an async writer holds the lock
+            # until the event loop gets back to its COMMIT: with a connection each,
+            # busy writers time out as "database is locked". One write connection
+            # makes them queue on the pool instead, without blocking the loop.
+            if read_only:
+                options.update(pool_size=POOL_SIZE, max_overflow=POOL_OVERFLOW)
+            else:
+                options.update(pool_size=1, max_overflow=0)
+        sqlite_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, **options)
+        if SQLITE_TUNED:
+            event.listen(sqlite_engine.sync_engine, "connect", _sqlite_pragmas(read_only))
+        return sqlite_engine
+
+    if is_sqlite:
+        async_engine = _create_async_sqlite_engine()
+        async_read_engine = (
+            _create_async_sqlite_engine(read_only=True) if SQLITE_TUNED and not _sqlite_memory else async_engine
+        )
+    else:
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, pool_pre_ping=True)
+        async_read_engine = (
+            create_async_engine(ASYNC_DATABASE_READ_URL, echo=False, pool_pre_ping=True)
+            if ASYNC_DATABASE_READ_URL else async_engine
+        )
+    # expire_on_commit=False: an expired attribute would need a lazy load, which async sessions cannot do
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -38,3 +166,30 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Like get_db, for endpoints that only read: a session on the read pool."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """get_db for the async routers (DATABASE_URL with an async driver)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """get_read_db for the async routers."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engines() -> None:
+    """Close the async pools (at shutdown), while the event loop still runs."""
+    for pool_engine in {async_engine, async_read_engine} - {None}:
+        await pool_engine.dispose()
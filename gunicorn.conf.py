@@ -0,0 +1,44 @@
+"""
+Production serving profile for the YuktiAI API:
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Runs LAWBOT_WORKERS (default: one per CPU) uvicorn workers. The app and its
+lazily loaded tools are imported once in the master before forking, so
+workers start instantly and share those pages copy-on-write. Result caches
+and conversation sessions go to SQLite files every worker shares (see
+bootstrap.configure_workers), so adding workers does not multiply upstream
+calls. Run `python migrate.py` before the first start.
+
+Env:
+    PORT=8000                  listen port (set by Render and similar hosts)
+    LAWBOT_WORKERS=            worker processes
+    LAWBOT_CACHE_DB            shared result cache (default ./lawbot_cache.db)
+    LAWBOT_SESSION_DB          shared sessions (default ./lawbot_sessions.db)
+"""
+import os
+
+from bootstrap import after_fork, configure_workers, load_env, preload, worker_count
+
+load_env()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = worker_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Requests are bounded by their time budget (LAWBOT_REQUEST_BUDGET_MAX_S);
+# a worker silent for longer than that plus headroom is stuck.
+timeout = int(float(os.environ.get("LAWBOT_REQUEST_BUDGET_MAX_S", "120"))) + 30
+graceful_timeout = 30
+keepalive = 5
+
+configure_workers(workers)
+
+
+def pre_fork(server, worker):
+    # Import the deferred tool modules and SDKs in the master, once
+    preload()
+
+
+def post_fork(server, worker):
+    after_fork()
@@ -0,0 +1,468 @@
+"""
+Durable background jobs on the application database.
+
+Work that can take minutes (transcribing a hearing, reviewing a long
+draft, a full query plan) is stored as a row in the jobs table and run by
+worker threads: a few inside each API process for development, and in
+production a separate `python jobs.py` process, so heavy work never takes
+capacity from interactive requests.
+
+    register(kind, handler)      declare a job kind (done by the module that owns the work)
+    enqueue(kind, payload, ...)  add a job; returns its id
+    schedule_periodic()          queue the next run of each kind registered with every_s
+    start_workers(n)             run n worker threads in this process
+    stop_workers()               stop them; running jobs are handed back to the queue
+
+Queue semantics:
+  * Higher ``priority`` first, then oldest first.
+  * A worker claims a job by taking a lease (lease_owner, lease_expires_at)
+    in one conditional UPDATE, so a job runs on exactly one worker. The
+    lease is renewed while the handler runs; if the worker dies it runs
+    out (the visibility timeout) and another worker picks the job up.
+  * A failed attempt is retried after an exponential backoff, up to the
+    kind's max_attempts. PermanentJobError fails the job at once.
+  * At most LAWBOT_JOB_CASE_LIMIT jobs of the same case run at a time.
+  * Handlers report progress with JobContext.progress(); clients follow it
+    through GET /api/jobs/{id} or the SSE stream GET /api/jobs/{id}/events.
+  * A periodic kind (every_s) keeps one job queued: workers queue it when
+    they start, and each run queues the next every_s after it finishes.
+
+Env:
+    LAWBOT_JOB_WORKERS=2            worker threads in `python jobs.py`
+    LAWBOT_JOB_INLINE_WORKERS=1     worker threads inside each API process (0 when a worker process runs)
+    LAWBOT_JOB_VISIBILITY_S=120     lease length; a job not renewed for this long goes to another worker
+    LAWBOT_JOB_CASE_LIMIT=2         jobs of one case running at once
+    LAWBOT_JOB_POLL_S=1             how often an idle worker looks for work
+"""
+import importlib
+import json
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from database import SessionLocal
+from models import Job, utcnow
+from telemetry import count, observe
+
+WORKERS = int(os.environ.get("LAWBOT_JOB_WORKERS", "2"))
+INLINE_WORKERS = int(os.environ.get("LAWBOT_JOB_INLINE_WORKERS", "1"))
+VISIBILITY_S = float(os.environ.get("LAWBOT_JOB_VISIBILITY_S", "120"))
+CASE_LIMIT = int(os.environ.get("LAWBOT_JOB_CASE_LIMIT", "2"))
+POLL_S = float(os.environ.get("LAWBOT_JOB_POLL_S", "1"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+# Modules that register job kinds; a standalone worker imports them all
+HANDLER_MODULES = ("transcription", "blob_store", "preview", "main")
+
+logger = logging.getLogger("lawbot.jobs")
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler to fail the job without further attempts."""
+    pass
+
+
+class JobInterrupted(Exception):
+    """The worker is stopping, lost its lease, or the job was cancelled."""
+    pass
+
+
+@dataclass(frozen=True)
+class JobKind:
+    name: str
+    handler: Callable[["JobContext", Dict[str, Any]], Any]
+    max_attempts: int = 3
+    retry_delay_s: float = 5.0
+    # Accepted by POST /api/jobs; other kinds are only enqueued by the API itself
+    public: bool = False
+    # Called with (payload, error) once the job has failed for good
+    on_failed: Optional[Callable[[Dict[str, Any], str], None]] = None
+    # Periodic: seconds between the end of one run and the start of the next
+    every_s: Optional[float] = None
+
+
+KINDS: Dict[str, JobKind] = {}
+
+
+def register(name: str, handler: Callable[["JobContext", Dict[str, Any]], Any], **options) -> JobKind:
+    """Add (or replace) a job kind."""
+    kind = KINDS[name] = JobKind(name, handler, **options)
+    return kind
+
+
+def _now() -> datetime:
+    # Naive UTC, the form the database hands timestamps back in
+    return utcnow().replace(tzinfo=None)
+
+
+def enqueue(
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    *,
+    priority: int = 0,
+    case_id: Optional[str] = None,
+    document_id: Optional[str] = None,
+    delay_s: float = 0.0,
+    db=None,
+) -> str:
+    """Store a new job (runnable after `delay_s`) and wake the local workers; returns the job id."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown job kind {kind!r}")
+    own = db is None
+    db = db or SessionLocal()
+    try:
+        now = _now()
+        job = Job(
+            kind=kind,
+            status=QUEUED,
+            priority=priority,
+            case_id=case_id,
+            document_id=document_id,
+            payload=json.dumps(payload or {}, default=str),
+            max_attempts=KINDS[kind].max_attempts,
+            run_after=now + timedelta(seconds=delay_s),
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(job)
+        db.commit()
+        job_id = job.id
+    finally:
+        if own:
+            db.close()
+    count("lawbot_jobs_total", kind=kind, event="enqueued")
+    _wake.set()
+    return job_id
+
+
+def schedule_periodic(kind: Optional[JobKind] = None) -> None:
+    """Queue the next run of `kind` (default: every periodic kind) unless one is already pending."""
+    for periodic in [kind] if kind is not None else [k for k in KINDS.values() if k.every_s]:
+        db = SessionLocal()
+        try:
+            pending = db.execute(
+                select(Job.id).where(Job.kind == periodic.name, Job.status.in_((QUEUED, RUNNING))).limit(1)
+            ).first()
+            if pending is None:
+                enqueue(periodic.name, delay_s=periodic.every_s, db=db)
+        finally:
+            db.close()
+
+
+def request_cancel(db, job: Job) -> None:
+    """Cancel a queued job now; a running one stops at its next progress report."""
+    if job.status == QUEUED:
+        job.status = CANCELLED
+        job.finished_at = _now()
+    elif job.status == RUNNING:
+        job.cancel_requested = True
+    db.commit()
+
+
+class JobContext:
+    """Handed to a handler: progress reporting and the stop signal."""
+
+    def __init__(self, job_id: str, worker_id: str, attempt: int, stopping: threading.Event):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.attempt = attempt
+        self._stopping = stopping
+        self._stopped = threading.Event()
+        self._stop_callbacks: List[Callable[[], None]] = []
+        self.cancelled = False
+
+    def progress(self, fraction: Optional[float] = None, message: Optional[str] = None) -> None:
+        """Record progress (and renew the lease); raises JobInterrupted if the job should stop."""
+        values: Dict[str, Any] = {}
+        if fraction is not None:
+            values["progress"] = max(0.0, min(1.0, fraction))
+        if message is not None:
+            values["message"] = message[:255]
+        self._renew(values)
+        self.check()
+
+    def should_stop(self) -> bool:
+        return self._stopped.is_set() or self._stopping.is_set()
+
+    def check(self) -> None:
+        if self.should_stop():
+            raise JobInterrupted("cancelled" if self.cancelled else "worker stopping")
+
+    def on_stop(self, callback: Callable[[], None]) -> None:
+        """Run `callback` (e.g. RequestBudget.cancel) when the job is told to stop."""
+        self._stop_callbacks.append(callback)
+        if self.should_stop():
+            callback()
+
+    def _stop(self) -> None:
+        if not self._stopped.is_set():
+            self._stopped.set()
+            for callback in self._stop_callbacks:
+                callback()
+
+    def _renew(self, values: Optional[Dict[str, Any]] = None) -> None:
+        now = _now()
+        db = SessionLocal()
+        try:
+            owned = db.execute(
+                update(Job)
+                .where(Job.id == self.job_id, Job.lease_owner == self.worker_id, Job.status == RUNNING)
+                .values(lease_expires_at=now + timedelta(seconds=VISIBILITY_S), updated_at=now, **(values or {}))
+                .execution_options(synchronize_session=False)
+            ).rowcount == 1
+            cancel = db.execute(select(Job.cancel_requested).where(Job.id == self.job_id)).scalar()
+            db.commit()
+        except SQLAlchemyError as e:
+            # A missed renewal is survivable; the next one extends the lease again
+            logger.warning("Could not renew lease on job %s: %s", self.job_id, e)
+            return
+        finally:
+            db.close()
+        if cancel:
+            self.cancelled = True
+        if not owned or cancel:
+            self._stop()
+
+
+def _claimable(now: datetime):
+    busy_cases = (
+        select(Job.case_id)
+        .where(Job.status == RUNNING, Job.lease_expires_at > now, Job.case_id.isnot(None))
+        .group_by(Job.case_id)
+        .having(func.count() >= CASE_LIMIT)
+    )
+    return and_(
+        or_(
+            and_(Job.status == QUEUED, Job.run_after <= now),
+            # Lease ran out: the worker died or hung
+            and_(Job.status == RUNNING, Job.lease_expires_at <= now),
+        ),
+        or_(Job.case_id.is_(None), Job.case_id.not_in(busy_cases)),
+    )
+
+
+def claim(worker_id: str) -> Optional[Job]:
+    """Lease the next runnable job to `worker_id`, or return None if there is none."""
+    db = SessionLocal()
+    try:
+        now = _now()
+        candidates = db.execute(
+            select(Job.id).where(_claimable(now)).order_by(Job.priority.desc(), Job.created_at).limit(8)
+        ).scalars().all()
+        for job_id in candidates:
+            # Re-checked in the UPDATE itself, so two workers cannot both win
+            won = db.execute(
+                update(Job)
+                .where(Job.id == job_id, _claimable(now))
+                .values(
+                    status=RUNNING,
+                    lease_owner=worker_id,
+                    lease_expires_at=now + timedelta(seconds=VISIBILITY_S),
+                    attempts=Job.attempts + 1,
+                    started_at=func.coalesce(Job.started_at, now),
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount == 1
+            db.commit()
+            if won:
+                job = db.get(Job, job_id)
+                db.expunge(job)
+                return job
+        return None
+    finally:
+        db.close()
+
+
+def _settle(job: Job, worker_id: str, **values) -> bool:
+    """Write the outcome of an attempt, unless another worker has taken the job over."""
+    now = _now()
+    db = SessionLocal()
+    try:
+        done = db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.lease_owner == worker_id, Job.status == RUNNING)
+            .values(lease_owner=None, lease_expires_at=None, updated_at=now, **values)
+            .execution_options(synchronize_session=False)
+        ).rowcount == 1
+        db.commit()
+        return done
+    finally:
+        db.close()
+
+
+def execute(job: Job, worker_id: str, stopping: threading.Event) -> None:
+    """Run one claimed job to an outcome: succeeded, retried, failed, cancelled or released."""
+    kind = KINDS.get(job.kind)
+    payload = json.loads(job.payload or "{}")
+    started = time.perf_counter()
+    labels = {"kind": job.kind}
+
+    def fail(error: str) -> None:
+        if _settle(job, worker_id, status=FAILED, error=error, finished_at=_now()):
+            count("lawbot_jobs_total", event="failed", **labels)
+            if kind is not None and kind.on_failed is not None:
+                try:
+                    kind.on_failed(payload, error)
+                except Exception:
+                    logger.exception("on_failed hook for job %s raised", job.id)
+
+    if kind is None:
+        fail(f"Unknown job kind {job.kind!r}")
+        return
+    if job.attempts > kind.max_attempts:
+        # Its worker died on the last allowed attempt
+        fail(job.error or "Worker lost while running the job")
+        return
+
+    ctx = JobContext(job.id, worker_id, job.attempts, stopping)
+    _active[job.id] = ctx
+    try:
+        result = kind.handler(ctx, payload)
+        if ctx.cancelled:
+            raise JobInterrupted("cancelled")
+        if _settle(job, worker_id, status=SUCCEEDED, progress=1.0, error=None,
+                   result=json.dumps(result, default=str, ensure_ascii=False), finished_at=_now()):
+            count("lawbot_jobs_total", event="succeeded", **labels)
+    except JobInterrupted:
+        if ctx.cancelled:
+            _settle(job, worker_id, status=CANCELLED, finished_at=_now())
+            count("lawbot_jobs_total", event="cancelled", **labels)
+        else:
+            # Not the job's fault: hand it back without spending an attempt
+            _settle(job, worker_id, status=QUEUED, attempts=Job.attempts - 1, run_after=_now())
+            count("lawbot_jobs_total", event="released", **labels)
+    except PermanentJobError as e:
+        fail(str(e))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        logger.warning("Job %s (%s) attempt %d failed: %s", job.id, job.kind, job.attempts, error)
+        if job.attempts < kind.max_attempts:
+            delay = kind.retry_delay_s * 2 ** (job.attempts - 1) * random.uniform(0.8, 1.2)
+            _settle(job, worker_id, status=QUEUED, error=error, run_after=_now() + timedelta(seconds=delay))
+            count("lawbot_jobs_total", event="retried", **labels)
+        else:
+            fail(error)
+    finally:
+        _active.pop(job.id, None)
+        observe("lawbot_job_seconds", time.perf_counter() - started, **labels)
+        if kind is not None and kind.every_s:
+            try:
+                schedule_periodic(kind)
+            except SQLAlchemyError as e:
+                logger.warning("Could not queue the next %s job: %s", kind.name, e)
+
+
+# ─── Workers ──────────────────────────────────────────────────
+
+_active: Dict[str, JobContext] = {}
+_wake = threading.Event()
+_stopping = threading.Event()
+_threads: List[threading.Thread] = []
+_threads_lock = threading.Lock()
+
+
+def _worker_loop(worker_id: str) -> None:
+    idle_s = 0.05
+    while not _stopping.is_set():
+        try:
+            job = claim(worker_id)
+        except SQLAlchemyError as e:
+            logger.warning("Job claim failed (is the database migrated?): %s", e)
+            job = None
+            idle_s = POLL_S
+        if job is None:
+            _wake.wait(idle_s)
+            _wake.clear()
+            idle_s = min(POLL_S, idle_s * 2)
+            continue
+        idle_s = 0.05
+        execute(job, worker_id, _stopping)
+
+
+def _lease_keeper() -> None:
+    # Handlers that do not report progress still keep their lease
+    while not _stopping.wait(VISIBILITY_S / 3):
+        for ctx in list(_active.values()):
+            ctx._renew()
+
+
+def start_workers(n: int) -> None:
+    """Start `n` worker threads (plus the lease keeper) in this process."""
+    if n <= 0:
+        return
+    with _threads_lock:
+        _stopping.clear()
+        base = f"{socket.gethostname()}:{os.getpid()}"
+        for i in range(n):
+            thread = threading.Thread(target=_worker_loop, args=(f"{base}:{len(_threads)}",),
+                                      name=f"job-worker-{len(_threads)}", daemon=True)
+            thread.start()
+            _threads.append(thread)
+        keeper = threading.Thread(target=_lease_keeper, name="job-lease-keeper", daemon=True)
+        keeper.start()
+        _threads.append(keeper)
+    try:
+        schedule_periodic()
+    except SQLAlchemyError as e:
+        logger.warning("Could not queue periodic jobs (is the database migrated?): %s", e)
+
+
+def stop_workers(timeout_s: float = 10.0) -> None:
+    """Stop the workers; jobs still running are released back to the queue."""
+    _stopping.set()
+    _wake.set()
+    for ctx in list(_active.values()):
+        ctx._stop()
+    with _threads_lock:
+        deadline = time.monotonic() + timeout_s
+        for thread in _threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        _threads.clear()
+
+
+def load_handlers() -> None:
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+def main() -> int:
+    """`python jobs.py`: a dedicated worker process."""
+    from bootstrap import load_env
+
+    load_env()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    load_handlers()
+    shutdown = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: shutdown.set())
+    start_workers(WORKERS)
+    logger.info("Job worker started with %d threads (kinds: %s)", WORKERS, ", ".join(sorted(KINDS)))
+    try:
+        shutdown.wait()
+    except KeyboardInterrupt:
+        pass
+    logger.info("Stopping; running jobs go back to the queue")
+    stop_workers()
+    return 0
+
+
+if __name__ == "__main__":
+    # Run the copy handlers register with, not a second __main__ module
+    import jobs
+    raise SystemExit(jobs.main())
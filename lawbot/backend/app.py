@@ -1,9 +1,15 @@
+import asyncio
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from lawbot_runtime.tools import legal_search, doc_fragment, doc_meta, get_document
+from lawbot_runtime.tools import legal_search, doc_fragment, doc_meta, get_document, _strip_html
 from lawbot_runtime.tools.summarize_doc import summarize_doc
 from lawbot_runtime.tools.citation_checker import citation_checker
 
@@ -27,6 +33,14 @@ class SummarizeRequest(BaseModel):
     text: str
     max_sentences_per_section: int = 2
 
+class BatchSummarizeItem(BaseModel):
+    text: str | None = None
+    docid: str | None = None
+
+class BatchSummarizeRequest(BaseModel):
+    items: list[BatchSummarizeItem]
+    max_sentences_per_section: int = 2
+
 class SearchRequest(BaseModel):
     query: str
     pagenum: int = 0
@@ -129,4 +143,110 @@ def api_summarize(req: SummarizeRequest):
     try:
         return summarize_doc(req.text, max_sentences_per_section=req.max_sentences_per_section)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Summarize failed: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Summarize failed: {e}")
+
+
+# ─── Batch summarization ─────────────────────────────────────
+# summarize_doc is pure CPU work, so batches are fanned out to a process pool
+# (one per API process, created lazily) instead of the request threadpool.
+
+SUMMARIZE_WORKERS = int(os.environ.get("LAWBOT_SUMMARIZE_WORKERS", "0")) or None
+MAX_BATCH_ITEMS = int(os.environ.get("LAWBOT_SUMMARIZE_MAX_BATCH", "500"))
+
+_summarize_pool: ProcessPoolExecutor | None = None
+
+
+def _get_summarize_pool() -> ProcessPoolExecutor:
+    global _summarize_pool
+    if _summarize_pool is None:
+        _summarize_pool = ProcessPoolExecutor(max_workers=SUMMARIZE_WORKERS)
+    return _summarize_pool
+
+
+@app.on_event("shutdown")
+def _shutdown_summarize_pool():
+    global _summarize_pool
+    if _summarize_pool is not None:
+        _summarize_pool.shutdown(wait=False, cancel_futures=True)
+        _summarize_pool = None
+
+
+def _summarize_timed(text: str, max_sentences_per_section: int):
+    """Runs inside a pool worker; returns the summary and its CPU wall time."""
+    started = time.perf_counter()
+    result = summarize_doc(text, max_sentences_per_section=max_sentences_per_section)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def _fetch_doc_text(docid: str) -> str:
+    doc = get_document(docid)
+    return _strip_html(doc.get("doc", ""))
+
+
+async def _summarize_item(index: int, item: BatchSummarizeItem, max_sentences: int) -> dict:
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    record = {"index": index, "docid": item.docid}
+    timing = {"fetch_ms": 0.0, "summarize_ms": 0.0, "queue_ms": 0.0}
+    try:
+        if item.text is not None:
+            text = item.text
+        else:
+            fetch_started = time.perf_counter()
+            text = await loop.run_in_executor(None, _fetch_doc_text, item.docid)
+            timing["fetch_ms"] = round((time.perf_counter() - fetch_started) * 1000, 2)
+
+        submitted = time.perf_counter()
+        result, cpu_ms = await loop.run_in_executor(
+            _get_summarize_pool(), _summarize_timed, text, max_sentences
+        )
+        pool_ms = (time.perf_counter() - submitted) * 1000
+        timing["summarize_ms"] = round(cpu_ms, 2)
+        timing["queue_ms"] = round(max(pool_ms - cpu_ms, 0.0), 2)
+        record["result"] = result
+    except Exception as e:
+        record["error"] = str(e)
+    timing["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    record["timing"] = timing
+    return record
+
+
+@app.post("/api/summarize/batch")
+async def api_summarize_batch(req: BatchSummarizeRequest):
+    """
+    Summarize many texts and/or Indian Kanoon docids in parallel.
+    Streams NDJSON: one line per item in completion order (with its request
+    index), followed by a final {"done": true, ...} line.
+    """
+    if not req.items:
+        raise HTTPException(status_code=400, detail="items cannot be empty.")
+    if len(req.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ITEMS} items per batch.")
+    for i, item in enumerate(req.items):
+        if (item.text is None) == (item.docid is None):
+            raise HTTPException(status_code=400, detail=f"Item {i}: provide exactly one of 'text' or 'docid'.")
+
+    async def stream():
+        started = time.perf_counter()
+        tasks = [
+            asyncio.ensure_future(_summarize_item(i, item, req.max_sentences_per_section))
+            for i, item in enumerate(req.items)
+        ]
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                record = await next_done
+                if "error" in record:
+                    failed += 1
+                yield json.dumps(record) + "\n"
+        finally:
+            for t in tasks:
+                t.cancel()
+        yield json.dumps({
+            "done": True,
+            "count": len(tasks),
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,192 @@
+"""Batch mode for the LawBOT runtime.
+
+Reads a JSONL stream of jobs, one per line::
+
+    {"id": "optional key", "agent": "research_agent", "skill": "legal-research", "args": {"query": "..."}}
+
+and executes up to ``parallel`` of them at once in a single process, so
+the interpreter, dotenv and agent workspaces are loaded once for the
+whole run.  Results are written as JSONL in completion order; each line
+carries the job's input position (``seq``) and its ``id`` if given, so
+callers can restore input order or join results back to their jobs::
+
+    {"seq": 0, "id": "...", "agent": "...", "skill": "...", "ok": true, "result": ..., "ms": 12.3}
+
+Progress lines and a final summary (throughput, latency percentiles,
+failures per skill) go to stderr so stdout stays machine-readable.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, List, Mapping, Optional
+
+try:
+    from .agent import Agent
+    from .dispatch import run_skill
+except ImportError:  # run as a script from lawbot_runtime/
+    from agent import Agent
+    from dispatch import run_skill
+
+
+class BatchStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.done = 0
+        self.failed = 0
+        self.latencies_ms: List[float] = []
+        self.failures_by_skill: Counter = Counter()
+
+    def add(self, outcome: Mapping[str, Any]) -> None:
+        self.done += 1
+        if "ms" in outcome:
+            self.latencies_ms.append(outcome["ms"])
+        if not outcome.get("ok"):
+            self.failed += 1
+            self.failures_by_skill[outcome.get("skill") or "<none>"] += 1
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def progress_line(self) -> str:
+        elapsed = self.elapsed()
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        return f"[batch] {self.done} done ({self.failed} failed) in {elapsed:.1f}s, {rate:.1f} jobs/s"
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = self.elapsed()
+        lat = sorted(self.latencies_ms)
+
+        def pct(p: float) -> Optional[float]:
+            return lat[min(len(lat) - 1, int(p * len(lat)))] if lat else None
+
+        return {
+            "jobs": self.done,
+            "ok": self.done - self.failed,
+            "failed": self.failed,
+            "elapsed_s": round(elapsed, 3),
+            "jobs_per_s": round(self.done / elapsed, 2) if elapsed > 0 else None,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": lat[-1] if lat else None,
+            "failures_by_skill": dict(self.failures_by_skill),
+        }
+
+
+async def run_batch(
+    source: IO[str],
+    sink: IO[str],
+    make_agent: Callable[[str], Agent],
+    parallel: int = 8,
+    progress: Optional[IO[str]] = sys.stderr,
+    progress_every_s: float = 2.0,
+) -> BatchStats:
+    """Execute every job in `source`, writing one result line per job to `sink`."""
+    loop = asyncio.get_running_loop()
+    stats = BatchStats()
+    slots = asyncio.Semaphore(parallel)
+    agents: Dict[str, Any] = {}
+    # One thread per in-flight job, so IO-bound skills really run `parallel` wide
+    io_pool = ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="batch-io")
+    last_progress = time.monotonic()
+
+    def emit(outcome: Dict[str, Any]) -> None:
+        nonlocal last_progress
+        sink.write(json.dumps(outcome, default=str, ensure_ascii=False) + "\n")
+        sink.flush()
+        stats.add(outcome)
+        if progress is not None and time.monotonic() - last_progress >= progress_every_s:
+            last_progress = time.monotonic()
+            print(stats.progress_line(), file=progress, flush=True)
+
+    def agent_for(name: str) -> Agent:
+        if name not in agents:
+            try:
+                agents[name] = make_agent(name)
+            except Exception as e:
+                # Remember the failure so every job for that agent reports it without retrying the load
+                agents[name] = e
+        if isinstance(agents[name], Exception):
+            raise agents[name]
+        return agents[name]
+
+    async def run(seq: int, job: Dict[str, Any]) -> None:
+        try:
+            head = {"seq": seq, "id": job.get("id"), "agent": job.get("agent"), "skill": job.get("skill")}
+            try:
+                agent = agent_for(str(job.get("agent")))
+            except Exception as e:
+                emit({**head, "ok": False, "error": f"{type(e).__name__}: {e}"})
+                return
+            args = job.get("args") or {}
+            if not isinstance(args, dict):
+                emit({**head, "ok": False, "error": "args must be an object"})
+                return
+            outcome = await run_skill(agent.tools, str(job.get("skill", "")), args, io_executor=io_pool)
+            emit({**head, **outcome})
+        finally:
+            slots.release()
+
+    tasks = set()
+    seq = 0
+    try:
+        while True:
+            line = await loop.run_in_executor(None, source.readline)
+            if not line:
+                break
+            if not line.strip():
+                continue
+            await slots.acquire()
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("job must be a JSON object")
+            except ValueError as e:
+                slots.release()
+                emit({"seq": seq, "id": None, "ok": False, "error": f"Invalid job line: {e}"})
+                seq += 1
+                continue
+            task = asyncio.create_task(run(seq, job))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            seq += 1
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        io_pool.shutdown(wait=False, cancel_futures=True)
+    return stats
+
+
+def batch(argv: List[str], make_agent: Callable[[str], Agent]) -> int:
+    """``main.py batch`` entry point; exits non-zero if any job failed."""
+    parser = argparse.ArgumentParser(description="Run a JSONL stream of LawBOT skill jobs")
+    parser.add_argument("--input", "-i", default="-", help="JSONL job file ('-' for stdin)")
+    parser.add_argument("--output", "-o", default="-", help="JSONL result file ('-' for stdout)")
+    parser.add_argument("--parallel", "-p", type=int, default=8, help="Jobs in flight at once")
+    parser.add_argument("--progress-every", type=float, default=2.0, help="Seconds between progress lines")
+    parser.add_argument("--quiet", "-q", action="store_true", help="No progress lines, only the summary")
+    args = parser.parse_args(argv)
+    if args.parallel < 1:
+        parser.error("--parallel must be at least 1")
+
+    source = sys.stdin if args.input == "-" else Path(args.input).open("r", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else Path(args.output).open("w", encoding="utf-8")
+    try:
+        stats = asyncio.run(run_batch(
+            source, sink, make_agent,
+            parallel=args.parallel,
+            progress=None if args.quiet else sys.stderr,
+            progress_every_s=args.progress_every,
+        ))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(json.dumps({"summary": stats.summary()}), file=sys.stderr)
+    return 1 if stats.failed else 0
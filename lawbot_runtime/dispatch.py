@@ -0,0 +1,238 @@
+"""Skill dispatch table for LawBOT agents.
+
+Every skill the runtime can execute is declared once in :data:`SKILLS`
+as a :class:`SkillSpec`: the tool it calls, the arguments it takes and
+whether the work is IO-bound (network calls such as ``legal_search``) or
+CPU-bound (local text processing such as ``summarize_doc``).  The agent
+and the CLI both dispatch through this table, so adding a skill means
+adding one entry here rather than another branch in each caller.
+
+:func:`run_many` executes independent skill calls concurrently: IO-bound
+skills on a thread pool driven by asyncio, CPU-bound skills on a process
+pool so they do not contend for the GIL.
+
+Env:
+    LAWBOT_SKILL_IO_WORKERS=16    threads for IO-bound skills
+    LAWBOT_SKILL_CPU_WORKERS=     processes for CPU-bound skills (default: CPU count)
+"""
+
+import asyncio
+import atexit
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+IO_WORKERS = int(os.environ.get("LAWBOT_SKILL_IO_WORKERS", "16"))
+CPU_WORKERS = int(os.environ.get("LAWBOT_SKILL_CPU_WORKERS", "0")) or (os.cpu_count() or 1)
+
+IO = "io"
+CPU = "cpu"
+
+
+class SkillError(Exception):
+    """Base exception for skill dispatch errors."""
+    pass
+
+
+class UnknownSkill(SkillError):
+    pass
+
+
+class SkillArgumentError(SkillError):
+    def __init__(self, skill: str, arg: str, message: str):
+        super().__init__(f"{skill}: {message}")
+        self.skill = skill
+        self.arg = arg
+
+
+@dataclass(frozen=True)
+class Arg:
+    name: str
+    types: Tuple[type, ...]
+    required: bool = False
+    default: Any = None
+    # Maps the accepted value onto what the tool expects (e.g. list -> "a; b")
+    convert: Optional[Callable[[Any], Any]] = None
+
+
+@dataclass(frozen=True)
+class SkillSpec:
+    name: str
+    tool: str
+    kind: str
+    args: Tuple[Arg, ...]
+    # Tool arguments passed positionally, in order; the rest go by keyword
+    positional: Tuple[str, ...] = field(default_factory=tuple)
+
+    def bind(self, kwargs: Mapping[str, Any]) -> Tuple[tuple, Dict[str, Any]]:
+        """Validate skill arguments and return the tool's (args, kwargs)."""
+        known = {a.name for a in self.args}
+        unexpected = sorted(set(kwargs) - known)
+        if unexpected:
+            raise SkillArgumentError(self.name, unexpected[0], f"unexpected argument {unexpected[0]!r}")
+        values: Dict[str, Any] = {}
+        for arg in self.args:
+            value = kwargs.get(arg.name)
+            if value is None:
+                if arg.required:
+                    raise SkillArgumentError(self.name, arg.name, f"{arg.name!r} is required")
+                if arg.default is None:
+                    continue
+                value = arg.default() if callable(arg.default) else arg.default
+            elif not isinstance(value, arg.types):
+                expected = " or ".join(t.__name__ for t in arg.types)
+                raise SkillArgumentError(self.name, arg.name, f"{arg.name!r} must be {expected}")
+            values[arg.name] = arg.convert(value) if arg.convert else value
+        positional = tuple(values.pop(name) for name in self.positional if name in values)
+        return positional, values
+
+
+def _join_citations(value: Any) -> str:
+    # citation_checker splits a single string on ';' and newlines
+    if isinstance(value, str):
+        return value
+    return "; ".join(str(c).strip() for c in value if str(c).strip())
+
+
+SKILLS: Dict[str, SkillSpec] = {}
+
+
+def register(spec: SkillSpec) -> SkillSpec:
+    """Add (or replace) a skill in the dispatch table."""
+    if spec.kind not in (IO, CPU):
+        raise ValueError(f"Skill kind must be {IO!r} or {CPU!r}, got {spec.kind!r}")
+    SKILLS[spec.name] = spec
+    return spec
+
+
+register(SkillSpec(
+    "legal-research", "legal_search", IO,
+    (
+        Arg("query", (str,), required=True),
+        Arg("pagenum", (int,)),
+        Arg("doctypes", (str,)),
+        Arg("fromdate", (str,)),
+        Arg("todate", (str,)),
+        Arg("max_results", (int,)),
+    ),
+    positional=("query",),
+))
+register(SkillSpec(
+    "summarize_case", "summarize_doc", CPU,
+    (Arg("text", (str,), required=True), Arg("max_sentences_per_section", (int,))),
+    positional=("text",),
+))
+register(SkillSpec(
+    "drafting", "document_fill", CPU,
+    (Arg("template", (str,), required=True), Arg("variables", (dict,), default=dict)),
+    positional=("template", "variables"),
+))
+register(SkillSpec(
+    "citation_checker", "citation_checker", CPU,
+    (Arg("citations", (str, list, tuple), required=True, convert=_join_citations),),
+    positional=("citations",),
+))
+register(SkillSpec(
+    # CTranslate2 releases the GIL, and threads share one loaded Whisper model
+    "meeting-intelligence", "transcribe_audio", IO,
+    (Arg("path", (str,), required=True), Arg("language", (str,))),
+    positional=("path",),
+))
+# "case-management" -> case_status is registered once a court status source exists
+
+
+def get_spec(skill: str) -> SkillSpec:
+    try:
+        return SKILLS[skill]
+    except KeyError:
+        raise UnknownSkill(f"Skill {skill} not implemented") from None
+
+
+def _invoke(fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+    return fn(*args, **kwargs)
+
+
+_pools: Dict[str, Executor] = {}
+_pools_lock = threading.Lock()
+_picklable: Dict[int, bool] = {}
+
+
+def _pool(kind: str) -> Executor:
+    with _pools_lock:
+        if kind not in _pools:
+            if kind == CPU:
+                _pools[kind] = ProcessPoolExecutor(max_workers=CPU_WORKERS)
+            else:
+                _pools[kind] = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="skill-io")
+        return _pools[kind]
+
+
+@atexit.register
+def shutdown() -> None:
+    """Stop the worker pools (also run at interpreter exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _can_ship(fn: Callable[..., Any]) -> bool:
+    # Tools passed in as lambdas or closures cannot cross into a worker process
+    key = id(fn)
+    if key not in _picklable:
+        try:
+            pickle.dumps(fn)
+            _picklable[key] = True
+        except Exception:
+            _picklable[key] = False
+    return _picklable[key]
+
+
+def executor_for(spec: SkillSpec, fn: Callable[..., Any], io_executor: Optional[Executor] = None) -> Executor:
+    if spec.kind == CPU and CPU_WORKERS > 1 and _can_ship(fn):
+        return _pool(CPU)
+    return io_executor or _pool(IO)
+
+
+async def run_skill(
+    tools: Mapping[str, Callable[..., Any]],
+    skill: str,
+    args: Optional[Mapping[str, Any]] = None,
+    io_executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """
+    Run one skill call off the event loop and return its outcome,
+    ``{"skill", "ok", "result" | "error", "ms"}``; errors are captured,
+    not raised.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    outcome: Dict[str, Any] = {"skill": skill}
+    try:
+        spec = get_spec(skill)
+        tool_args, tool_kwargs = spec.bind(args or {})
+        fn = tools[spec.tool]
+        executor = executor_for(spec, fn, io_executor)
+        result = await loop.run_in_executor(executor, _invoke, fn, tool_args, tool_kwargs)
+        outcome.update(ok=True, result=result)
+    except Exception as e:
+        outcome.update(ok=False, error=f"{type(e).__name__}: {e}")
+    outcome["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return outcome
+
+
+async def run_many(
+    tools: Mapping[str, Callable[..., Any]],
+    calls: Sequence[Mapping[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Run independent skill calls (``{"skill": ..., "args": {...}}``)
+    concurrently and return one outcome per call, in input order.  A
+    failing call does not affect the others.
+    """
+    return list(await asyncio.gather(*(run_skill(tools, c.get("skill", ""), c.get("args")) for c in calls)))
@@ -23,6 +23,28 @@ Skills and required options:
 Example:
     python main.py research_agent legal-research --query "habeas corpus" 
 
+Skills are looked up in the dispatch table (``dispatch.py``), which
+declares each skill's tool and arguments.
+
+Batch mode:
+    python main.py batch [--input jobs.jsonl] [--output results.jsonl] [--parallel 8] [--quiet]
+
+    Runs a JSONL stream of ``{"id": ..., "agent": ..., "skill": ...,
+    "args": {...}}`` jobs (stdin by default) in one process.  Results are
+    written as JSONL in completion order, keyed by input position
+    (``seq``) and ``id``; progress and a throughput/failure summary go to
+    stderr.  The exit status is 1 if any job failed.
+
+Server mode:
+    python main.py serve [--host 127.0.0.1] [--port 8765]
+
+    Keeps the agents loaded in one long-running process and accepts
+    ``POST /run`` with ``{"agent": ..., "skill": ..., "args": {...}}``;
+    ``POST /run_many`` with ``{"agent": ..., "calls": [{"skill": ...,
+    "args": {...}}, ...]}`` runs independent skills concurrently;
+    ``GET /agents`` lists workspaces and their skills.  Workspace files
+    are watched and reloaded when they change.
+
 This code is intentionally minimal and synchronous.  A production
 orchestrator could implement asynchronous calls, message routing and
 context assembly according to the OpenClaw architecture.
@@ -31,6 +53,7 @@ context assembly according to the OpenClaw architecture.
 import argparse
 import json
 import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Dict, Any, List
 
@@ -43,13 +66,15 @@ except Exception:
     pass
 
 from agent import Agent  # local module
+from batch import batch
+from dispatch import SkillArgumentError, SkillSpec, UnknownSkill, get_spec
+from workspace import registry_for
 from tools import (
     legal_search,
     summarize_doc,
     citation_checker,
     document_fill,
     transcribe_audio,
-    case_status,
 )
 
 
@@ -63,7 +88,149 @@ def load_text_file(path: str) -> str:
         return f.read()
 
 
+WORKSPACE_ROOT = Path(__file__).resolve().parent.parent / "lawbot"
+
+
+def build_tools() -> Dict[str, Any]:
+    """Map tool names to the functions agents dispatch skills to."""
+    return {
+        "legal_search": legal_search,
+        "summarize_doc": summarize_doc,
+        "citation_checker": citation_checker,
+        "document_fill": document_fill,
+        "transcribe_audio": transcribe_audio,
+    }
+
+
+# Skill argument -> the CLI option that supplies it
+CLI_OPTIONS = {
+    "query": "--query",
+    "text": "--file",
+    "template": "--template",
+    "variables": "--vars",
+    "citations": "--citations",
+}
+
+
+class CliArgumentError(Exception):
+    pass
+
+
+def cli_skill_args(spec: SkillSpec, args: argparse.Namespace) -> Dict[str, Any]:
+    """Collect the arguments a skill declares from the parsed CLI options."""
+    out: Dict[str, Any] = {}
+    wanted = {a.name for a in spec.args}
+    if "query" in wanted and args.query:
+        out["query"] = args.query
+    if "text" in wanted and args.file:
+        try:
+            out["text"] = load_text_file(args.file)
+        except FileNotFoundError:
+            raise CliArgumentError(f"File {args.file} not found")
+    if "template" in wanted and args.template:
+        try:
+            out["template"] = load_text_file(args.template)
+        except FileNotFoundError:
+            raise CliArgumentError(f"Template file {args.template} not found")
+    if "variables" in wanted and args.vars:
+        try:
+            out["variables"] = json.loads(args.vars)
+        except json.JSONDecodeError:
+            raise CliArgumentError("--vars must be valid JSON")
+    if "citations" in wanted and args.citations:
+        out["citations"] = args.citations
+    return out
+
+
+def serve(argv: List[str]) -> int:
+    """Long-running mode: agents stay loaded and skill calls arrive over HTTP."""
+    parser = argparse.ArgumentParser(description="Serve LawBOT skills over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    registry = registry_for(WORKSPACE_ROOT)
+    registry.start_watching()
+    tools = build_tools()
+    agents = {name: Agent(str(WORKSPACE_ROOT / name), tools) for name in registry.names()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, body: Any) -> None:
+            data = json.dumps(body, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, {"status": "ok", "reloads": registry.reloads})
+            elif self.path == "/agents":
+                self._reply(200, {
+                    name: {"skills": sorted(agent.skills), "user_profile": dict(agent.user_profile)}
+                    for name, agent in agents.items()
+                })
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path not in ("/run", "/run_many"):
+                self._reply(404, {"error": "not found"})
+                return
+            try:
+                job = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            except json.JSONDecodeError:
+                self._reply(400, {"error": "body must be JSON"})
+                return
+            agent = agents.get(job.get("agent"))
+            if agent is None:
+                self._reply(404, {"error": f"Unknown agent: {job.get('agent')}"})
+                return
+            if self.path == "/run_many":
+                calls = job.get("calls")
+                if not isinstance(calls, list):
+                    self._reply(400, {"error": "calls must be a list"})
+                    return
+                self._reply(200, {"results": agent.execute_many(calls)})
+                return
+            try:
+                result = agent.execute_skill(job.get("skill", ""), **(job.get("args") or {}))
+            except SkillArgumentError as e:
+                self._reply(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+            self._reply(200, {"result": result})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"LawBOT runtime serving {sorted(agents)} on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        registry.stop_watching()
+    return 0
+
+
+def make_agent(name: str) -> Agent:
+    """An agent for a workspace under WORKSPACE_ROOT; KeyError if there is none."""
+    registry_for(WORKSPACE_ROOT).get(name)
+    return Agent(str(WORKSPACE_ROOT / name), build_tools())
+
+
 def main(argv: List[str]) -> int:
+    if argv and argv[0] == "serve":
+        return serve(argv[1:])
+    if argv and argv[0] == "batch":
+        return batch(argv[1:], make_agent)
+
     parser = argparse.ArgumentParser(description="Run a LawBOT skill via a specified agent")
     parser.add_argument("agent", choices=["research_agent", "drafting_agent", "case_agent"], help="Which agent to use")
     parser.add_argument("skill", help="Skill name (e.g. legal-research, summarize_case, drafting, citation_checker)")
@@ -74,77 +241,33 @@ def main(argv: List[str]) -> int:
     parser.add_argument("--citations", dest="citations", help="Semicolon separated list of citations to check")
     args = parser.parse_args(argv)
 
-    # Construct the tools dictionary mapping tool names to functions
-    tools: Dict[str, Any] = {
-        "legal_search": legal_search,
-        "summarize_doc": summarize_doc,
-        "citation_checker": citation_checker,
-        "document_fill": document_fill,
-        "transcribe_audio": transcribe_audio,
-        "case_status": case_status,
-    }
+    tools = build_tools()
 
     # Determine the workspace directory for the selected agent
-    workspace_root = Path(__file__).resolve().parent.parent / "lawbot"
-    workspace_dir = workspace_root / args.agent
+    workspace_dir = WORKSPACE_ROOT / args.agent
     if not workspace_dir.exists():
         print(f"Workspace for agent {args.agent} does not exist at {workspace_dir}", file=sys.stderr)
         return 1
     # Instantiate the agent
     agent = Agent(str(workspace_dir), tools)
 
-    # Dispatch based on skill
-    skill = args.skill
-    if skill == "legal-research":
-        if not args.query:
-            print("--query is required for legal-research", file=sys.stderr)
-            return 1
-        result = agent.execute_skill("legal-research", query=args.query)
-        print(json.dumps(result, indent=2))
-        return 0
-    elif skill == "summarize_case":
-        if not args.file:
-            print("--file is required for summarize_case", file=sys.stderr)
-            return 1
-        try:
-            text = load_text_file(args.file)
-        except FileNotFoundError:
-            print(f"File {args.file} not found", file=sys.stderr)
-            return 1
-        result = agent.execute_skill("summarize_case", text=text)
-        print(json.dumps(result, indent=2))
-        return 0
-    elif skill == "drafting":
-        if not args.template:
-            print("--template is required for drafting", file=sys.stderr)
-            return 1
-        try:
-            template_text = load_text_file(args.template)
-        except FileNotFoundError:
-            print(f"Template file {args.template} not found", file=sys.stderr)
-            return 1
-        variables: Dict[str, Any] = {}
-        if args.vars:
-            try:
-                variables = json.loads(args.vars)
-            except json.JSONDecodeError:
-                print("--vars must be valid JSON", file=sys.stderr)
-                return 1
-        result = agent.execute_skill("drafting", template=template_text, variables=variables)
-        print(result)
-        return 0
-    elif skill == "citation_checker":
-        if not args.citations:
-            print("--citations is required for citation_checker", file=sys.stderr)
-            return 1
-        citations_list = [c.strip() for c in args.citations.split(";") if c.strip()]
-        result = agent.execute_skill("citation_checker", citations=citations_list)
-        print(json.dumps(result, indent=2))
-        return 0
-    else:
-        print(f"Unknown skill: {skill}", file=sys.stderr)
+    try:
+        spec = get_spec(args.skill)
+    except UnknownSkill:
+        print(f"Unknown skill: {args.skill}", file=sys.stderr)
         return 1
-
+    try:
+        skill_args = cli_skill_args(spec, args)
+        result = agent.execute_skill(spec.name, **skill_args)
+    except CliArgumentError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    except SkillArgumentError as e:
+        option = CLI_OPTIONS.get(e.arg, e.arg)
+        print(f"{option} is required for {spec.name}" if e.arg not in skill_args else str(e), file=sys.stderr)
+        return 1
+    print(result if isinstance(result, str) else json.dumps(result, indent=2))
+    return 0
 
 if __name__ == "__main__":
     sys.exit(main(sys.argv[1:]))
\ No newline at end of file
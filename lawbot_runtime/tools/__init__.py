@@ -29,11 +29,14 @@ Tools implemented:
 * ``document_fill`` – fill in a template string using Python
   ``str.format`` style with variables supplied in a dictionary.
 
-* ``transcribe_audio`` – placeholder for speech‑to‑text; it returns
-  ``NotImplementedError`` to avoid hallucinating transcription output.
+* ``transcribe_audio`` – local speech‑to‑text with a CPU Whisper model
+  (faster‑whisper) over ffmpeg‑decoded chunks.  Returns timestamped
+  segments; raises ``TranscriptionUnavailable`` if no backend is
+  installed rather than inventing a transcript.
 
-* ``case_status`` – placeholder for court status lookup; returns
-  ``NotImplementedError``.
+* ``case_status`` – court status lookup.  No e‑court status source is
+  configured yet, so it raises ``CaseStatusUnavailable``; the
+  case-management skill is not dispatchable until one is.
 
 These tools prioritise correctness over creativity.  They should
 return plain data or raise clear errors rather than fabricate
@@ -42,14 +45,22 @@ responses.
 
 """
 
+import contextlib
 import os
 import re
 import json
 from typing import List, Dict, Any, Optional
 
-import requests
 import html
 
+try:
+    from request_budget import upstream_timeout
+    from circuit_breaker import breaker
+except ImportError:  # lawbot_runtime run standalone, without the API package on sys.path
+    def upstream_timeout(cap: float) -> float:
+        return cap
+    breaker = None
+
 _TAG_RE = re.compile(r"<[^>]+>")
 
 def _strip_html(s: str) -> str:
@@ -72,6 +83,7 @@ __all__ = [
     "document_fill",
     "transcribe_audio",
     "case_status",
+    "CaseStatusUnavailable",
 ]
 
 
@@ -96,14 +108,24 @@ def _ik_headers() -> Dict[str, str]:
     }
 
 
+def _ik_url(path: str) -> str:
+    """Build an API URL; INDIAN_KANOON_BASE_URL lets tests point at a local stand-in."""
+    base = os.environ.get("INDIAN_KANOON_BASE_URL", "https://api.indiankanoon.org").rstrip("/")
+    return f"{base}{path}"
+
+
 def _ik_post(url: str, data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Internal helper to call Indian Kanoon API using POST (GET may return 405).
     - data: sent as application/x-www-form-urlencoded (requests does this by default for dict)
     - params: querystring params
     """
-    resp = requests.post(url, headers=_ik_headers(), data=data or {}, params=params or {}, timeout=30)
-    resp.raise_for_status()
+    import requests  # deferred: only API calls need it, not the local summarise/citation tools
+
+    guard = breaker("kanoon").guard() if breaker else contextlib.nullcontext()
+    with guard:
+        resp = requests.post(url, headers=_ik_headers(), data=data or {}, params=params or {}, timeout=upstream_timeout(30))
+        resp.raise_for_status()
     return resp.json()
 
 
@@ -161,7 +183,7 @@ def legal_search(
     if maxcites is not None:
         params["maxcites"] = int(maxcites)
 
-    url = "https://api.indiankanoon.org/search/"
+    url = _ik_url("/search/")
 
     try:
         data_json = _ik_post(url, data=data, params=params)
@@ -196,7 +218,7 @@ def get_document(docid: str, *, maxcites: Optional[int] = None, maxcitedby: Opti
     if maxcitedby is not None:
         params["maxcitedby"] = int(maxcitedby)
 
-    url = f"https://api.indiankanoon.org/doc/{docid}/"
+    url = _ik_url(f"/doc/{docid}/")
     return _ik_post(url, data={}, params=params)
 
 
@@ -204,7 +226,7 @@ def get_origdoc(docid: str) -> Dict[str, Any]:
     """
     Fetch original/court-copy from /origdoc/<docid>/ using POST.
     """
-    url = f"https://api.indiankanoon.org/origdoc/{docid}/"
+    url = _ik_url(f"/origdoc/{docid}/")
     return _ik_post(url, data={}, params={})
 
 
@@ -212,7 +234,7 @@ def doc_fragment(docid: str, query: str) -> Dict[str, Any]:
     """
     Fetch document fragments matching query from /docfragment/<docid>/ using POST.
     """
-    url = f"https://api.indiankanoon.org/docfragment/{docid}/"
+    url = _ik_url(f"/docfragment/{docid}/")
     # docfragment expects formInput
     data = {"formInput": query}
     return _ik_post(url, data=data, params={})
@@ -222,5 +244,28 @@ def doc_meta(docid: str) -> Dict[str, Any]:
     """
     Fetch document metadata from /docmeta/<docid>/ using POST.
     """
-    url = f"https://api.indiankanoon.org/docmeta/{docid}/"
-    return _ik_post(url, data={}, params={})
\ No newline at end of file
+    url = _ik_url(f"/docmeta/{docid}/")
+    return _ik_post(url, data={}, params={})
+
+from .summarize_doc import summarize_doc  # noqa: E402
+from .citation_checker import citation_checker  # noqa: E402
+from .transcribe_audio import transcribe_audio  # noqa: E402
+
+
+def document_fill(template: str, variables: Dict[str, Any]) -> str:
+    """
+    Fill a template using ``str.format`` style placeholders.
+    Raises KeyError naming the first placeholder with no value, rather than
+    leaving it blank.
+    """
+    return template.format(**(variables or {}))
+
+
+class CaseStatusUnavailable(RuntimeError):
+    """No court status source is configured."""
+    pass
+
+
+def case_status(case_number: str, court: Optional[str] = None) -> Dict[str, Any]:
+    """Court status of a case; raises CaseStatusUnavailable until a court status source exists."""
+    raise CaseStatusUnavailable(f"No court status source is configured; cannot look up {case_number}.")
@@ -0,0 +1,141 @@
+"""
+Small previews of uploaded files, for document listings.
+
+    pdf       the first page, as a JPEG (pdftoppm, from poppler-utils)
+    image     the image scaled down, as a JPEG (ffmpeg)
+    video     a representative frame from the opening seconds, as a JPEG (ffmpeg)
+    audio     a waveform summary: peak levels over the recording, as JSON
+
+Every function here runs in a worker process (see preview.py) and only
+reads its input and writes `dest`, so it can be pickled by name and has
+no application state.
+
+Requires ``ffmpeg`` and, for PDFs, ``pdftoppm`` on PATH.
+
+Env:
+    LAWBOT_PREVIEW_SIZE=320          longest side of a preview image, in pixels
+    LAWBOT_PREVIEW_PEAKS=200         points in a waveform summary
+    LAWBOT_PREVIEW_TIMEOUT_S=120     longest a renderer may run
+"""
+import json
+import os
+import shutil
+import subprocess
+import time
+from typing import List, Optional
+
+from lawbot_runtime.tools.transcribe_audio import SAMPLE_RATE, decode_chunks
+
+SIZE = int(os.environ.get("LAWBOT_PREVIEW_SIZE", "320"))
+PEAKS = int(os.environ.get("LAWBOT_PREVIEW_PEAKS", "200"))
+TIMEOUT_S = float(os.environ.get("LAWBOT_PREVIEW_TIMEOUT_S", "120"))
+BLOCK_S = 0.1  # waveform resolution before it is reduced to PEAKS points
+
+PDF, IMAGE, VIDEO, AUDIO = "pdf", "image", "video", "audio"
+
+# File type -> renderer
+KINDS = {
+    "pdf": PDF,
+    "png": IMAGE, "jpg": IMAGE, "jpeg": IMAGE, "webp": IMAGE, "gif": IMAGE,
+    "mp4": VIDEO, "mov": VIDEO, "avi": VIDEO, "mkv": VIDEO, "webm": VIDEO,
+    "mp3": AUDIO, "wav": AUDIO, "m4a": AUDIO, "aac": AUDIO,
+}
+# Renderer -> (suffix of the stored preview, media type)
+OUTPUTS = {
+    PDF: ("preview.jpg", "image/jpeg"),
+    IMAGE: ("preview.jpg", "image/jpeg"),
+    VIDEO: ("preview.jpg", "image/jpeg"),
+    AUDIO: ("waveform.json", "application/json"),
+}
+
+
+class PreviewUnavailable(RuntimeError):
+    """The tool a renderer needs is not installed."""
+    pass
+
+
+def backend_problem(kind: str) -> Optional[str]:
+    """Why previews of `kind` cannot be rendered here, or None if they can."""
+    binary = "pdftoppm" if kind == PDF else "ffmpeg"
+    if shutil.which(binary) is None:
+        return f"{binary} is not installed or not on PATH."
+    return None
+
+
+def _run(cmd: List[str], what: str) -> None:
+    proc = subprocess.run(cmd, capture_output=True, timeout=TIMEOUT_S, check=False)
+    if proc.returncode != 0:
+        stderr = proc.stderr.decode(errors="ignore").strip()
+        raise RuntimeError(f"{cmd[0]} could not render {what}: {stderr[-500:]}")
+
+
+def _scale() -> str:
+    # Never upscale; keep the aspect ratio; even sides for the JPEG encoder
+    return (f"scale='min({SIZE},iw)':'min({SIZE},ih)':force_original_aspect_ratio=decrease,"
+            "scale=trunc(iw/2)*2:trunc(ih/2)*2")
+
+
+def render_pdf(source: str, dest: str) -> None:
+    base, _ = os.path.splitext(dest)
+    _run(["pdftoppm", "-f", "1", "-l", "1", "-singlefile", "-scale-to", str(SIZE), "-jpeg", source, base],
+         "the first page")
+    if base + ".jpg" != dest:
+        os.replace(base + ".jpg", dest)
+
+
+def render_image(source: str, dest: str) -> None:
+    _run(["ffmpeg", "-nostdin", "-v", "error", "-y", "-i", source, "-frames:v", "1",
+          "-vf", _scale(), "-q:v", "4", "-f", "image2", dest], "the image")
+
+
+def render_video(source: str, dest: str) -> None:
+    # thumbnail picks the most typical of the first 50 frames: not a fade-in or a black frame
+    _run(["ffmpeg", "-nostdin", "-v", "error", "-y", "-i", source, "-frames:v", "1",
+          "-vf", f"thumbnail=50,{_scale()}", "-q:v", "4", "-f", "image2", dest], "a poster frame")
+
+
+def render_audio(source: str, dest: str) -> None:
+    import numpy as np
+
+    block = int(BLOCK_S * SAMPLE_RATE)
+    levels: List[float] = []
+    carry = np.zeros(0, dtype=np.float32)
+    samples_seen = 0
+    # decode_chunks streams from ffmpeg without a timeout of its own
+    deadline = time.monotonic() + TIMEOUT_S
+    chunks = decode_chunks(source)
+    try:
+        for _, samples in chunks:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"ffmpeg could not render a waveform within {TIMEOUT_S:g}s")
+            samples_seen += len(samples)
+            samples = np.concatenate([carry, np.abs(samples)])
+            whole = len(samples) - len(samples) % block
+            if whole:
+                levels += samples[:whole].reshape(-1, block).max(axis=1).tolist()
+            carry = samples[whole:]
+    finally:
+        # Kills ffmpeg if it is still decoding
+        chunks.close()
+    if len(carry):
+        levels.append(float(carry.max()))
+    peaks = [float(part.max()) if len(part) else 0.0 for part in np.array_split(np.array(levels), min(PEAKS, len(levels)) or 1)]
+    top = max(peaks) or 1.0
+    with open(dest, "w") as out:
+        json.dump({
+            "duration_s": round(samples_seen / SAMPLE_RATE, 2),
+            "peaks": [round(p / top, 3) for p in peaks],
+        }, out)
+
+
+RENDERERS = {PDF: render_pdf, IMAGE: render_image, VIDEO: render_video, AUDIO: render_audio}
+
+
+def render_preview(kind: str, source: str, dest: str) -> None:
+    """Write the preview of `source` (a file of renderer `kind`) to `dest`."""
+    problem = backend_problem(kind)
+    if problem:
+        raise PreviewUnavailable(problem)
+    RENDERERS[kind](source, dest)
+    if not os.path.isfile(dest) or not os.path.getsize(dest):
+        raise RuntimeError(f"No {kind} preview was produced.")
@@ -0,0 +1,199 @@
+"""
+Local speech-to-text for audio and video files.
+
+Media is decoded by ffmpeg into 16 kHz mono PCM and read in chunks, so a
+multi-hour hearing recording never has to fit in memory, and each chunk
+is transcribed by a CPU Whisper model (faster-whisper / CTranslate2, int8).
+Segments are yielded as soon as their chunk is done, with timestamps in
+seconds from the start of the file.
+
+Words cut by a chunk boundary would be mangled, so the last few seconds
+of every chunk are carried over and transcribed again with the next one;
+only segments that end before that tail are emitted.
+
+Requires the ``faster-whisper`` package and ``ffmpeg``/``ffprobe`` on PATH.
+
+Env:
+    LAWBOT_ASR_MODEL=base        Whisper model size or a local model directory
+    LAWBOT_ASR_COMPUTE=int8      CTranslate2 compute type
+    LAWBOT_ASR_THREADS=0         CPU threads per transcription (0: CTranslate2 default)
+    LAWBOT_ASR_LANGUAGE=         force a language code (default: detect from the first chunk)
+    LAWBOT_ASR_CHUNK_S=30        seconds of audio decoded and transcribed at a time
+"""
+import os
+import shutil
+import subprocess
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2  # s16le
+
+ASR_MODEL = os.environ.get("LAWBOT_ASR_MODEL", "base")
+ASR_COMPUTE = os.environ.get("LAWBOT_ASR_COMPUTE", "int8")
+ASR_THREADS = int(os.environ.get("LAWBOT_ASR_THREADS", "0"))
+ASR_LANGUAGE = os.environ.get("LAWBOT_ASR_LANGUAGE") or None
+CHUNK_S = float(os.environ.get("LAWBOT_ASR_CHUNK_S", "30"))
+CARRY_S = 3.0
+
+
+class TranscriptionUnavailable(RuntimeError):
+    """No local speech-to-text backend is installed."""
+    pass
+
+
+def backend_problem() -> Optional[str]:
+    """Why transcription cannot run here, or None if it can."""
+    for binary in ("ffmpeg", "ffprobe"):
+        if shutil.which(binary) is None:
+            return f"{binary} is not installed or not on PATH."
+    try:
+        import faster_whisper  # noqa: F401
+    except ImportError:
+        return "faster-whisper is not installed (pip install faster-whisper)."
+    return None
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def _load_model():
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                problem = backend_problem()
+                if problem:
+                    raise TranscriptionUnavailable(problem)
+                from faster_whisper import WhisperModel
+                _model = WhisperModel(ASR_MODEL, device="cpu", compute_type=ASR_COMPUTE, cpu_threads=ASR_THREADS)
+    return _model
+
+
+def probe_duration(path: str) -> Optional[float]:
+    """Media duration in seconds according to ffprobe, or None if unknown."""
+    proc = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", path],
+        capture_output=True, text=True, check=False,
+    )
+    try:
+        return float(proc.stdout.strip())
+    except ValueError:
+        return None
+
+
+def decode_chunks(path: str, start_s: float = 0.0, chunk_s: float = CHUNK_S) -> Iterator[Tuple[float, Any]]:
+    """
+    Yield (offset_s, samples) for consecutive chunks of the file's audio
+    track, starting at `start_s`: float32 numpy arrays of 16 kHz mono audio.
+    """
+    import numpy as np
+
+    cmd = ["ffmpeg", "-nostdin", "-v", "error"]
+    if start_s > 0:
+        cmd += ["-ss", f"{start_s:.3f}"]
+    cmd += ["-i", path, "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    chunk_bytes = int(chunk_s * SAMPLE_RATE) * BYTES_PER_SAMPLE
+    offset = start_s
+    try:
+        while True:
+            raw = proc.stdout.read(chunk_bytes)
+            if len(raw) < BYTES_PER_SAMPLE:
+                break
+            raw = raw[: len(raw) - len(raw) % BYTES_PER_SAMPLE]
+            samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+            yield offset, samples
+            offset += len(samples) / SAMPLE_RATE
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        stderr = proc.stderr.read().decode(errors="ignore").strip()
+        proc.stderr.close()
+    if proc.returncode != 0 and offset == start_s:
+        raise RuntimeError(f"ffmpeg could not decode {os.path.basename(path)}: {stderr[-500:]}")
+
+
+def transcribe_chunks(
+    path: str,
+    start_s: float = 0.0,
+    language: Optional[str] = ASR_LANGUAGE,
+) -> Iterator[Tuple[float, List[Dict[str, Any]]]]:
+    """
+    Transcribe `path` from `start_s` on, yielding (position_s, segments)
+    after every chunk: how far into the file the transcript is final, and
+    the segments (``{"start", "end", "text"}``, in seconds) completed since
+    the previous yield. Stop iterating to abandon the transcription.
+    """
+    import numpy as np
+
+    model = _load_model()
+    buffer = np.zeros(0, dtype=np.float32)
+    buffer_start = start_s
+    chunks = decode_chunks(path, start_s)
+    exhausted = False
+    while not exhausted:
+        try:
+            _, samples = next(chunks)
+            buffer = np.concatenate([buffer, samples])
+        except StopIteration:
+            exhausted = True
+        if not len(buffer):
+            break
+        buffer_s = len(buffer) / SAMPLE_RATE
+        if not exhausted and buffer_s < CHUNK_S:
+            continue
+
+        found, info = model.transcribe(buffer, language=language, beam_size=1, vad_filter=True)
+        # Detect the language once, not per chunk
+        language = language or info.language
+        # Segments touching the tail may be cut mid-word; redo them with the next chunk
+        cutoff = buffer_s if exhausted else buffer_s - CARRY_S
+        done: List[Dict[str, Any]] = []
+        committed_s = 0.0
+        pending_s = None
+        for seg in found:
+            # A segment spanning nearly the whole buffer is taken as is; it would never fit
+            if seg.end > cutoff and (committed_s or seg.start > 1.0):
+                pending_s = seg.start
+                break
+            text = seg.text.strip()
+            if text:
+                done.append({
+                    "start": round(buffer_start + seg.start, 2),
+                    "end": round(buffer_start + seg.end, 2),
+                    "text": text,
+                })
+            committed_s = seg.end
+        if not exhausted and committed_s == 0.0:
+            # Nothing finished in the chunk: keep only the segment still in progress, if any
+            committed_s = pending_s or cutoff
+        if exhausted:
+            committed_s = buffer_s
+        keep_from = int(committed_s * SAMPLE_RATE)
+        buffer = buffer[keep_from:]
+        buffer_start += keep_from / SAMPLE_RATE
+        yield buffer_start, done
+
+
+def format_timestamp(seconds: float) -> str:
+    total = int(seconds)
+    return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+
+
+def transcribe_audio(path: str, language: Optional[str] = ASR_LANGUAGE) -> Dict[str, Any]:
+    """Transcribe a whole audio/video file and return its segments and text."""
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+    segments: List[Dict[str, Any]] = []
+    for _, done in transcribe_chunks(path, language=language):
+        segments.extend(done)
+    return {
+        "path": path,
+        "duration_s": probe_duration(path),
+        "segments": segments,
+        "text": "\n".join(f"[{format_timestamp(s['start'])}] {s['text']}" for s in segments),
+    }
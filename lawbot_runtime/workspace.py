@@ -0,0 +1,245 @@
+"""Workspace registry for LawBOT agents.
+
+Each agent workspace under ``lawbot/`` (``USER.md``, ``SOUL.md``,
+``MEMORY.md`` and ``skills/*/SKILL.md``) is parsed once into an
+immutable :class:`Workspace`.  The registry hands out the cached object
+and only re-stats the workspace files when the last check is older than
+``check_interval_s``; a workspace whose file fingerprint (mtime and size
+of every file) changed is re-parsed and swapped in atomically.  In
+long-running mode, :meth:`WorkspaceRegistry.start_watching` does those
+checks on a background thread so requests never touch the filesystem.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+DEFAULT_ROOT = Path(os.environ.get("LAWBOT_WORKSPACES", Path(__file__).resolve().parent.parent / "lawbot"))
+CHECK_INTERVAL_S = float(os.environ.get("LAWBOT_WORKSPACE_CHECK_S", "2"))
+
+_PROFILE_FIELDS = {
+    "**Name:**": "name",
+    "**Jurisdiction:**": "jurisdiction",
+    "**Practice Areas:**": "practice_areas",
+    "**Timezone:**": "timezone",
+}
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass(frozen=True)
+class Skill:
+    name: str
+    description: str
+    requires: Tuple[str, ...]
+    path: Path
+    instructions: str
+
+
+@dataclass(frozen=True)
+class Workspace:
+    name: str
+    path: Path
+    user_profile: Mapping[str, str]
+    soul: str
+    memory: str
+    skills: Mapping[str, Skill]
+    fingerprint: Fingerprint
+    loaded_at: float
+
+
+def parse_front_matter(content: str) -> Dict[str, object]:
+    """Parse the ``---`` delimited front matter of a SKILL.md.
+
+    Handles the subset of YAML the skill files use: ``key: value``,
+    folded ``key: >`` blocks and ``key:`` followed by ``- item`` lists.
+    """
+    lines = content.splitlines()
+    if not lines or lines[0].strip() != "---":
+        return {}
+    meta: Dict[str, object] = {}
+    key: Optional[str] = None
+    for line in lines[1:]:
+        if line.strip() == "---":
+            break
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if not line[0].isspace() and ":" in line:
+            key, value = (part.strip() for part in line.split(":", 1))
+            if value in (">", "|", ">-", "|-"):
+                meta[key] = ""
+            elif value:
+                meta[key] = value.strip("'\"")
+            else:
+                meta[key] = []
+        elif key is not None and stripped.startswith("- ") and isinstance(meta.get(key), list):
+            meta[key].append(stripped[2:].strip().strip("'\""))
+        elif key is not None and isinstance(meta.get(key), str):
+            meta[key] = f"{meta[key]} {stripped}".strip()
+    return meta
+
+
+def parse_user_profile(text: str) -> Dict[str, str]:
+    profile: Dict[str, str] = {}
+    for line in text.splitlines():
+        for marker, field in _PROFILE_FIELDS.items():
+            if line.startswith(marker):
+                profile[field] = line.split(marker)[-1].strip()
+    return profile
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ""
+
+
+def fingerprint(workspace_dir: Path) -> Fingerprint:
+    """(path, mtime_ns, size) of every file the workspace is parsed from."""
+    paths = [workspace_dir / name for name in ("USER.md", "SOUL.md", "MEMORY.md")]
+    skills_dir = workspace_dir / "skills"
+    if skills_dir.is_dir():
+        paths.extend(sorted(p / "SKILL.md" for p in skills_dir.iterdir() if p.is_dir()))
+    out = []
+    for p in paths:
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        out.append((str(p), st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def load_workspace(workspace_dir: Path) -> Workspace:
+    """Parse a workspace directory into an immutable Workspace."""
+    workspace_dir = Path(workspace_dir)
+    # Fingerprint first: an edit racing the parse is then picked up by the next check
+    fp = fingerprint(workspace_dir)
+    skills: Dict[str, Skill] = {}
+    skills_dir = workspace_dir / "skills"
+    if skills_dir.is_dir():
+        for skill_dir in sorted(p for p in skills_dir.iterdir() if p.is_dir()):
+            content = _read(skill_dir / "SKILL.md")
+            meta = parse_front_matter(content)
+            name = meta.get("name")
+            if not content or not isinstance(name, str) or not name:
+                continue
+            requires = meta.get("requires") or []
+            skills[name] = Skill(
+                name=name,
+                description=str(meta.get("description", "")),
+                requires=tuple(requires) if isinstance(requires, list) else (str(requires),),
+                path=skill_dir,
+                instructions=content,
+            )
+    return Workspace(
+        name=workspace_dir.name,
+        path=workspace_dir,
+        user_profile=MappingProxyType(parse_user_profile(_read(workspace_dir / "USER.md"))),
+        soul=_read(workspace_dir / "SOUL.md"),
+        memory=_read(workspace_dir / "MEMORY.md"),
+        skills=MappingProxyType(skills),
+        fingerprint=fp,
+        loaded_at=time.time(),
+    )
+
+
+class WorkspaceRegistry:
+    """Process-wide cache of parsed workspaces with mtime-based hot reload."""
+
+    def __init__(self, root: Path = DEFAULT_ROOT, check_interval_s: float = CHECK_INTERVAL_S):
+        self.root = Path(root)
+        self.check_interval_s = check_interval_s
+        self._lock = threading.Lock()
+        self._workspaces: Dict[str, Workspace] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.reloads = 0
+
+    def names(self) -> List[str]:
+        """Agent workspaces under the root (directories with a USER.md or skills/)."""
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            p.name for p in self.root.iterdir()
+            if p.is_dir() and ((p / "USER.md").exists() or (p / "skills").is_dir())
+        )
+
+    def get(self, name: str) -> Workspace:
+        """The parsed workspace, re-checked at most once per check interval.
+
+        Raises KeyError if there is no such workspace.
+        """
+        now = time.monotonic()
+        ws = self._workspaces.get(name)
+        if ws is not None and (self._watching() or now - self._checked_at.get(name, 0.0) < self.check_interval_s):
+            return ws
+        return self._refresh(name)
+
+    def _watching(self) -> bool:
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def _refresh(self, name: str) -> Workspace:
+        path = self.root / name
+        if not path.is_dir():
+            with self._lock:
+                self._workspaces.pop(name, None)
+            raise KeyError(f"Workspace {name!r} does not exist at {path}")
+        with self._lock:
+            ws = self._workspaces.get(name)
+            if ws is None or fingerprint(path) != ws.fingerprint:
+                if ws is not None:
+                    self.reloads += 1
+                ws = load_workspace(path)
+                self._workspaces[name] = ws
+            self._checked_at[name] = time.monotonic()
+            return ws
+
+    def refresh_all(self) -> None:
+        for name in self.names():
+            self._refresh(name)
+
+    def start_watching(self, interval_s: Optional[float] = None) -> None:
+        """Poll every workspace in the background so get() never stats files."""
+        if self._watching():
+            return
+        interval = interval_s or self.check_interval_s
+        self.refresh_all()
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh_all()
+                except (OSError, KeyError):
+                    # A workspace mid-edit (e.g. a skill dir being renamed); retry next tick
+                    continue
+
+        self._watcher = threading.Thread(target=loop, name="workspace-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+
+_registries: Dict[Path, WorkspaceRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def registry_for(root: Path = DEFAULT_ROOT) -> WorkspaceRegistry:
+    """The shared registry for a workspace root."""
+    root = Path(root).resolve()
+    with _registries_lock:
+        if root not in _registries:
+            _registries[root] = WorkspaceRegistry(root)
+        return _registries[root]
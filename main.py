@@ -1,45 +1,86 @@
 import os
-from dotenv import load_dotenv
+import json
+import time
+import asyncio
+import math
+import contextvars
+from bootstrap import load_env, lazy_function, preload_in_background, configure_workers
 
-# Load all environment variables at the very beginning of the application lifecycle
-load_dotenv(override=True)
+# Load all environment variables at the very beginning of the application lifecycle.
+load_env()
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
-import uvicorn
 
 # Import router and tools
-from navigation.router import map_intent_to_tool
-from tools.legal_search import legal_search
-from tools.web_search import web_search
-from tools.adversarial_engine import analyze_draft
-from tools.procedural_navigator import get_procedural_timeline
-from tools.document_processor import process_legal_document
-from tools.general_chat import general_chat
-from tools.drafting_agent import generate_draft
-
-# Import new routers and database
-from database import engine
-from models import Base
-from routers.cases import router as cases_router
-from routers.documents import router as documents_router
-from routers.calendar import router as calendar_router
+from navigation.router import map_intent_to_tool, plan_tool_calls, MAX_PLAN_STEPS
+from navigation.planner import execute_plan
+from navigation.speculation import start_speculation, run_search
+
+# Tool modules (and the OpenAI SDK behind them) load on first use, keeping
+# them off the cold-start path; see bootstrap.py.
+legal_search = lazy_function("tools.legal_search", "legal_search")
+web_search = lazy_function("tools.web_search", "web_search")
+analyze_draft = lazy_function("tools.adversarial_engine", "analyze_draft")
+get_procedural_timeline = lazy_function("tools.procedural_navigator", "get_procedural_timeline")
+process_legal_document = lazy_function("tools.document_processor", "process_legal_document")
+general_chat = lazy_function("tools.general_chat", "general_chat")
+generate_draft = lazy_function("tools.drafting_agent", "generate_draft")
+
+from telemetry import span, count, observe, log_event, new_trace_id, render_prometheus, registry
+from request_budget import RequestBudget, BudgetExceeded, current_budget, MAX_BUDGET_S
+from circuit_breaker import CircuitOpen
+from session_store import store as session_store, describe_response
+import jobs
+import transcription  # noqa: F401  (registers the "transcribe" job kind)
+
+from database import ASYNC_DB, dispose_async_engines
+
+# Import new routers
+if ASYNC_DB:
+    # DATABASE_URL names an async driver: these three run on an AsyncSession
+    from routers.cases_async import router as cases_router
+    from routers.documents_async import router as documents_router
+    from routers.calendar_async import router as calendar_router
+else:
+    from routers.cases import router as cases_router
+    from routers.documents import router as documents_router
+    from routers.calendar import router as calendar_router
+from routers.deadlines import router as deadlines_router
+from routers.jobs import router as jobs_router
+from routers.bulk import router as bulk_router
+from routers.sync import router as sync_router
+from routers.previews import router as previews_router
 
 app = FastAPI(title="YuktiAI API", description="Backend for the Lawbot Assistant")
 
 # Added Custom Security Headers Middleware
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        if "server" in response.headers:
-            del response.headers["server"]
-        return response
+# Plain ASGI rather than BaseHTTPMiddleware: the latter hides client
+# disconnects from endpoints, which /api/query relies on for cancellation.
+class SecurityHeadersMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Content-Type-Options"] = "nosniff"
+                headers["X-Frame-Options"] = "DENY"
+                headers["X-XSS-Protection"] = "1; mode=block"
+                if "server" in headers:
+                    del headers["server"]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 app.add_middleware(SecurityHeadersMiddleware)
 
@@ -60,67 +101,240 @@ app.add_middleware(
 app.include_router(cases_router)
 app.include_router(documents_router)
 app.include_router(calendar_router)
+app.include_router(deadlines_router)
+app.include_router(jobs_router)
+app.include_router(bulk_router)
+app.include_router(sync_router)
+app.include_router(previews_router)
 
 
 @app.on_event("startup")
 def on_startup():
-    """Create all database tables on server startup."""
-    try:
-        Base.metadata.create_all(bind=engine)
-        print("Database tables created successfully.")
-    except Exception as e:
-        print(f"Failed to create database tables (this is normal if using an external DB without the correct IP configuration): {e}")
+    """
+    Schema creation is an explicit step (`python migrate.py`), not part of
+    every boot. LAWBOT_AUTO_MIGRATE=1 restores it for local development;
+    LAWBOT_PRELOAD=1 imports the lazily loaded tools in the background so
+    long-running servers do not pay for them on the first query.
+    LAWBOT_JOB_INLINE_WORKERS job workers run in this process; set it to 0
+    when a separate `python jobs.py` worker serves the queue.
+    """
+    if os.environ.get("LAWBOT_AUTO_MIGRATE", "0") == "1":
+        from migrate import migrate
+        migrate()
+    if os.environ.get("LAWBOT_PRELOAD", "0") == "1":
+        preload_in_background()
+    jobs.start_workers(jobs.INLINE_WORKERS)
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """Running jobs stop at their next progress report and go back to the queue."""
+    jobs.stop_workers()
+
+
+@app.on_event("shutdown")
+async def close_async_database():
+    if ASYNC_DB:
+        await dispose_async_engines()
 
 
 class QueryRequest(BaseModel):
     query: str
     document_type: str = None  # Optional context for adversarial engine
     jurisdiction: str = None   # Optional context for adversarial engine
+    mode: str = "single"       # "single" (one tool) | "plan" (multi-tool fan-out)
+    timeout_s: float = None    # Time budget for the whole request (default LAWBOT_REQUEST_BUDGET_S)
+    session_id: str = None     # Conversation to continue (web session id, or "wa:<sender>" for WhatsApp)
+    background: bool = False   # Queue as a job and answer 202 with its id (see /api/jobs)
+
+# How often a running query checks whether its client is still connected, and
+# how long past its budget a query may run before the response is abandoned.
+DISCONNECT_POLL_S = 0.25
+BUDGET_GRACE_S = 1.0
 
 @app.get("/")
 def read_root():
     return {"status": "online", "message": "YuktiAI API is running."}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics(format: str = "prometheus"):
+    """Prometheus exposition of span timings, per-route latency and upstream counters."""
+    if format == "json":
+        return PlainTextResponse(json.dumps(registry.snapshot()), media_type="application/json")
+    return render_prometheus()
+
 @app.post("/api/query")
-def process_query(request: QueryRequest):
+async def process_query(request: QueryRequest, http_request: Request):
     """
     Main endpoint to process a natural language query.
     Routes the query to the appropriate tool using the Navigation Router.
+
+    Every upstream call made for the query takes its timeout from one request
+    budget; the response's "budget" field shows how it was spent. If the client
+    disconnects, the budget is cancelled and no further upstream calls start.
     """
     raw_query = request.query
     if not raw_query:
         raise HTTPException(status_code=400, detail="Query cannot be empty.")
+    if request.background:
+        job_id = jobs.enqueue("query", request.model_dump(exclude={"background"}), priority=QUERY_JOB_PRIORITY)
+        return JSONResponse(status_code=202, content={
+            "job_id": job_id,
+            "status": jobs.QUEUED,
+            "status_url": f"/api/jobs/{job_id}",
+            "events_url": f"/api/jobs/{job_id}/events",
+            "result_url": f"/api/jobs/{job_id}/result",
+        })
 
+    budget = RequestBudget(request.timeout_s)
+    watcher = asyncio.create_task(_cancel_on_disconnect(http_request, budget))
+    # Tool calls are blocking; run them off the event loop with the request context
+    work = asyncio.get_running_loop().run_in_executor(
+        None, contextvars.copy_context().run, _process_query, request, raw_query, budget
+    )
+    try:
+        done, _ = await asyncio.wait({work}, timeout=budget.total_s + BUDGET_GRACE_S)
+        if not done:
+            # Each upstream call is bounded by the budget, so this only trips on
+            # local overrun; the worker finishes in the background and is dropped.
+            budget.cancel()
+            raise HTTPException(status_code=504, detail={
+                "message": "The request exceeded its time budget.", "budget": budget.report()
+            })
+        return work.result()
+    finally:
+        watcher.cancel()
+
+
+async def _cancel_on_disconnect(http_request: Request, budget: RequestBudget):
+    while not budget.cancelled:
+        if await http_request.is_disconnected():
+            budget.cancel()
+            count("lawbot_request_cancelled_total", reason="client_disconnect")
+            return
+        await asyncio.sleep(DISCONNECT_POLL_S)
+
+
+def _process_query(request: QueryRequest, raw_query: str, budget: RequestBudget):
+    current_budget.set(budget)
+    new_trace_id()
+    started = time.perf_counter()
+    response = None
+    # Follow-ups carry the compacted conversation, not the whole history
+    session = session_store.get(request.session_id) if request.session_id else None
+    context = session.context() if session is not None else None
+    try:
+        if request.mode == "plan":
+            response = _run_plan(request, raw_query, context)
+        else:
+            response = _run_query(request, raw_query, context)
+        if session is not None:
+            session_store.record_turn(session.key, raw_query, describe_response(response))
+            response["session_id"] = session.key
+        response["budget"] = budget.report()
+        if budget.fallbacks:
+            # An upstream was unavailable and part of the answer came from a fallback
+            response["degraded"] = budget.fallbacks
+        return response
+    except BudgetExceeded as e:
+        raise HTTPException(status_code=504, detail={"message": str(e), "budget": budget.report()})
+    except CircuitOpen as e:
+        raise HTTPException(status_code=503, detail=str(e),
+                            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))})
+    finally:
+        route = response.get("route", "unknown") if isinstance(response, dict) else "error"
+        observe("lawbot_query_duration_seconds", time.perf_counter() - started, route=route)
+
+
+def _run_plan(request: QueryRequest, raw_query: str, context: str = None):
+    """Plan-and-execute: the router returns a small DAG of tool calls, run concurrently and merged."""
+    try:
+        with span("router", mode="plan"):
+            plan = plan_tool_calls(raw_query, context)
+        steps = plan.get("steps", [])
+        log_event("plan", tools=[s.get("tool") for s in steps], reasoning=plan.get("reasoning", ""))
+        outcomes = execute_plan(steps, _plan_tools(request, raw_query, context), max_steps=MAX_PLAN_STEPS)
+    except (BudgetExceeded, CircuitOpen):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred while processing the request: {str(e)}")
+
+    return {
+        "route": "multi_tool",
+        "reasoning": plan.get("reasoning", ""),
+        "plan": [{"id": s["id"], "tool": s["tool"], "depends_on": s.get("depends_on") or []} for s in steps],
+        "results": outcomes,
+        "partial": any(o["status"] != "ok" for o in outcomes.values()),
+    }
+
+
+def _plan_tools(request: QueryRequest, raw_query: str, context: str = None):
+    """Adapters from plan steps to the tool functions used by the single-route path."""
+    def text(step):
+        return step.get("query") or raw_query
+
+    def with_context(step):
+        if step.get("context"):
+            return f"{text(step)}\n\nContext from earlier steps:\n{step['context']}"
+        return text(step)
+
+    def procedural(step):
+        if not step.get("case_stage") or not step.get("law_code"):
+            raise ValueError("Could not extract case stage or law code from the query. Please be more specific.")
+        return get_procedural_timeline(step["case_stage"], step["law_code"])
+
+    return {
+        "legal_search": lambda step: legal_search(text(step)),
+        "web_search": lambda step: web_search(text(step)),
+        "general_chat": lambda step: general_chat(with_context(step), context),
+        "adversarial_engine": lambda step: analyze_draft(
+            text(step), request.document_type or "Legal Document", request.jurisdiction or "Indian Court"
+        ),
+        "procedural_navigator": procedural,
+        "document_processor": lambda step: process_legal_document(text(step), request.document_type or "legal_document"),
+        "drafting_agent": lambda step: generate_draft(with_context(step)),
+    }
+
+
+def _run_query(request: QueryRequest, raw_query: str, context: str = None):
+    # Search routes are often as slow as the router itself, so a likely
+    # Kanoon/web search starts now and is kept only if the router agrees.
+    speculation = start_speculation(raw_query, {"legal_search": legal_search, "web_search": web_search})
     try:
         # Step 1: Map Intent
-        route_info = map_intent_to_tool(raw_query)
+        with span("router"):
+            route_info = map_intent_to_tool(raw_query, context)
         target_tool = route_info.get("target_tool")
         kwargs = route_info.get("extracted_kwargs", {})
         reasoning = route_info.get("reasoning", "")
         
-        print(f"DEBUG: Route={target_tool} | Reasoning={reasoning}")
+        log_event("route", tool=target_tool, reasoning=reasoning)
 
         # Step 2: Execute Corresponding Tool
         if target_tool == "legal_search":
             search_term = kwargs.get("query", raw_query)
-            print(f"DEBUG: Kanoon Search Term -> {search_term}")
-            result = legal_search(search_term)
+            log_event("search_term", tool="legal_search", term=search_term)
+            with span("tool", tool="legal_search"):
+                search_term, result = run_search(speculation, "legal_search", search_term, legal_search)
             return {"route": "legal_search", "search_term_used": search_term, "result": result}
             
         elif target_tool == "general_chat":
-            result = general_chat(raw_query)
+            with span("tool", tool="general_chat"):
+                result = general_chat(raw_query, context)
             return {"route": "general_chat", "result": result}
             
         elif target_tool == "web_search":
             search_term = kwargs.get("query", raw_query)
-            result = web_search(search_term)
+            with span("tool", tool="web_search"):
+                search_term, result = run_search(speculation, "web_search", search_term, web_search)
             return {"route": "web_search", "result": result}
             
         elif target_tool == "adversarial_engine":
             draft_text = kwargs.get("query", raw_query)
             doc_type = request.document_type or "Legal Document"
             jurisdiction = request.jurisdiction or "Indian Court"
-            result = analyze_draft(draft_text, doc_type, jurisdiction)
+            with span("tool", tool="adversarial_engine"):
+                result = analyze_draft(draft_text, doc_type, jurisdiction)
             return {"route": "adversarial_engine", "result": result}
             
         elif target_tool == "procedural_navigator":
@@ -128,18 +342,21 @@ def process_query(request: QueryRequest):
             code = kwargs.get("law_code")
             if not stage or not code:
                  return {"route": "procedural_navigator", "error": "Could not extract case stage or law code from the query. Please be more specific."}
-            result = get_procedural_timeline(stage, code)
+            with span("tool", tool="procedural_navigator"):
+                result = get_procedural_timeline(stage, code)
             return {"route": "procedural_navigator", "result": result}
             
         elif target_tool == "document_processor":
             document_text = kwargs.get("query", raw_query)
             doc_type = request.document_type or "legal_document"
-            result = process_legal_document(document_text, doc_type)
+            with span("tool", tool="document_processor"):
+                result = process_legal_document(document_text, doc_type)
             return {"route": "document_processor", "result": result}
             
         elif target_tool == "drafting_agent":
             draft_prompt = kwargs.get("query", raw_query)
-            result = generate_draft(draft_prompt)
+            with span("tool", tool="drafting_agent"):
+                result = generate_draft(draft_prompt)
             return {"route": "drafting_agent", "result": result}
             
         elif target_tool == "unknown":
@@ -148,10 +365,85 @@ def process_query(request: QueryRequest):
         else:
             raise HTTPException(status_code=500, detail=f"Unrecognized routing logic target: {target_tool}")
 
+    except (BudgetExceeded, CircuitOpen):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred while processing the request: {str(e)}")
+    finally:
+        if speculation is not None:
+            speculation.discard()
+
+# ─── Background jobs ──────────────────────────────────────────
+# Slow work submitted through /api/jobs (or /api/query with background=true)
+# runs on the job workers with the longest allowed time budget.
+
+QUERY_JOB_PRIORITY = 10
+
+
+def _job_budget(ctx: jobs.JobContext, timeout_s: float = None) -> RequestBudget:
+    budget = RequestBudget(MAX_BUDGET_S if timeout_s is None else timeout_s)
+    ctx.on_stop(budget.cancel)
+    current_budget.set(budget)
+    return budget
+
+
+def _job_text(payload: dict) -> str:
+    text = (payload.get("text") or "").strip()
+    if not text:
+        raise jobs.PermanentJobError("payload.text is required.")
+    return text
+
+
+def _query_job(ctx: jobs.JobContext, payload: dict):
+    request = QueryRequest(**payload)
+    budget = _job_budget(ctx, request.timeout_s)
+    try:
+        return _process_query(request, request.query, budget)
+    except HTTPException as e:
+        ctx.check()
+        if e.status_code in (503, 504):
+            # Upstream unavailable or too slow: worth another attempt later
+            raise RuntimeError(f"{e.status_code}: {e.detail}") from e
+        raise jobs.PermanentJobError(f"{e.status_code}: {e.detail}") from e
+
+
+def _document_analysis_job(ctx: jobs.JobContext, payload: dict):
+    text = _job_text(payload)
+    _job_budget(ctx)
+    ctx.progress(0.0, "Analyzing document")
+    return process_legal_document(text, payload.get("document_type") or "legal_document")
+
+
+def _adversarial_review_job(ctx: jobs.JobContext, payload: dict):
+    text = _job_text(payload)
+    _job_budget(ctx)
+    ctx.progress(0.0, "Reviewing draft")
+    return analyze_draft(
+        text, payload.get("document_type") or "Legal Document", payload.get("jurisdiction") or "Indian Court"
+    )
+
+
+jobs.register("query", _query_job, public=True)
+jobs.register("document_analysis", _document_analysis_job, public=True)
+jobs.register("adversarial_review", _adversarial_review_job, public=True)
+
+
+@app.delete("/api/sessions/{session_id}", status_code=204)
+def delete_session(session_id: str):
+    """Forget a conversation (e.g. when the user starts over)."""
+    session_store.delete(session_id)
+
 
 if __name__ == "__main__":
-    print("Starting YuktiAI API Server...")
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    import uvicorn
+
+    # LAWBOT_WORKERS=N serves with N processes (no reload); gunicorn.conf.py
+    # is the full production profile.
+    workers = int(os.environ.get("LAWBOT_WORKERS", "1"))
+    configure_workers(workers)
+    print(f"Starting YuktiAI API Server ({workers} worker{'s' if workers > 1 else ''})...")
+    if workers > 1:
+        uvicorn.run("main:app", host="0.0.0.0", port=int(os.environ.get("PORT", "8000")), workers=workers)
+    else:
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
 
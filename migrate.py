@@ -0,0 +1,31 @@
+"""
+Create the database schema. Run once per deployment (and after pulling
+model changes) before starting the API:
+
+    python migrate.py
+
+The API no longer does this on every boot; set LAWBOT_AUTO_MIGRATE=1 to
+have it run at start-up anyway (handy for local development). Creating
+tables is idempotent: existing tables are left as they are, so column
+changes still need their own migrate_*.py script.
+"""
+from bootstrap import load_env
+
+load_env()
+
+from database import engine  # noqa: E402
+from models import Base  # noqa: E402
+
+
+def migrate() -> bool:
+    try:
+        Base.metadata.create_all(bind=engine)
+        print(f"Database tables created successfully ({engine.url.render_as_string(hide_password=True)}).")
+        return True
+    except Exception as e:
+        print(f"Failed to create database tables (this is normal if using an external DB without the correct IP configuration): {e}")
+        return False
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if migrate() else 1)
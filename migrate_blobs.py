@@ -0,0 +1,63 @@
+import argparse
+import os
+import sqlite3
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "lawbot.db")
+
+# Content-addressed file storage (blob_store.py). The blobs table is new and
+# is created by `python migrate.py`; --import-files then moves the files of
+# existing documents out of uploads/{case_id}/ into the store.
+COLUMNS = [
+    ("blob_sha256", "VARCHAR(64)"),
+]
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    for name, sql_type in COLUMNS:
+        try:
+            cursor.execute(f"ALTER TABLE documents ADD COLUMN {name} {sql_type}")
+            print(f"Added {name} column successfully.")
+        except sqlite3.OperationalError as e:
+            print(f"{name} column might already exist: {e}")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_documents_blob_sha256 ON documents (blob_sha256)")
+
+    conn.commit()
+    conn.close()
+
+def import_files():
+    import blob_store
+    from database import SessionLocal
+    from models import Document
+
+    db = SessionLocal()
+    moved = missing = 0
+    try:
+        legacy = db.query(Document).filter(~Document.file_path.startswith(blob_store.PREFIX)).all()
+        for doc in legacy:
+            old_path = blob_store.legacy_path(doc.file_path)
+            if old_path is None or not os.path.isfile(old_path):
+                missing += 1
+                continue
+            with open(old_path, "rb") as source, \
+                    blob_store.stage(source, os.path.splitext(old_path)[1]) as staged:
+                key = blob_store.reserve(db, staged)
+                doc.file_path = blob_store.PREFIX + key
+                doc.blob_sha256 = staged.sha256
+                db.flush()
+                blob_store.ensure(key, staged)
+                db.commit()
+            os.remove(old_path)
+            moved += 1
+    finally:
+        db.close()
+    print(f"Moved {moved} files into the blob store ({missing} documents had no file under uploads/).")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add blob store columns; optionally move existing uploads into it.")
+    parser.add_argument("--import-files", action="store_true", help="move files under uploads/ into the blob store")
+    args = parser.parse_args()
+    migrate()
+    if args.import_files:
+        import_files()
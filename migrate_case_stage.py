@@ -0,0 +1,25 @@
+import sqlite3
+import os
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "lawbot.db")
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    for column, ddl in [
+        ("current_stage", "ALTER TABLE cases ADD COLUMN current_stage VARCHAR(255)"),
+        ("law_code", "ALTER TABLE cases ADD COLUMN law_code VARCHAR(50)"),
+        ("stage_date", "ALTER TABLE cases ADD COLUMN stage_date DATETIME"),
+    ]:
+        try:
+            cursor.execute(ddl)
+            print(f"Added {column} column successfully.")
+        except sqlite3.OperationalError as e:
+            print(f"{column} column might already exist: {e}")
+
+    conn.commit()
+    conn.close()
+
+if __name__ == "__main__":
+    migrate()
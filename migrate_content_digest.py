@@ -0,0 +1,41 @@
+import sqlite3
+import os
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "lawbot.db")
+
+# Stored length and opening characters of each document's transcript and
+# summary, which listings show instead of the text (models.py). Existing
+# rows are filled in once here; the application keeps them up to date.
+PREVIEW_CHARS = 200
+COLUMNS = [
+    ("transcript_chars", "INTEGER NOT NULL DEFAULT 0"),
+    ("summary_chars", "INTEGER NOT NULL DEFAULT 0"),
+    ("transcript_preview", f"VARCHAR({PREVIEW_CHARS})"),
+    ("summary_preview", f"VARCHAR({PREVIEW_CHARS})"),
+]
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    for name, sql_type in COLUMNS:
+        try:
+            cursor.execute(f"ALTER TABLE documents ADD COLUMN {name} {sql_type}")
+            print(f"Added {name} column successfully.")
+        except sqlite3.OperationalError as e:
+            print(f"{name} column might already exist: {e}")
+
+    cursor.execute(f"""
+        UPDATE documents SET
+            transcript_chars = COALESCE(length(transcript), 0),
+            summary_chars = COALESCE(length(summary), 0),
+            transcript_preview = NULLIF(substr(transcript, 1, {PREVIEW_CHARS}), ''),
+            summary_preview = NULLIF(substr(summary, 1, {PREVIEW_CHARS}), '')
+    """)
+    print(f"Filled in {cursor.rowcount} documents.")
+
+    conn.commit()
+    conn.close()
+
+if __name__ == "__main__":
+    migrate()
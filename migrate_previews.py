@@ -0,0 +1,53 @@
+import argparse
+import os
+import sqlite3
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "lawbot.db")
+
+# Rendered previews of stored content (preview.py). --backfill then queues
+# previews for content uploaded before, and retries failed ones; the jobs
+# run on the job workers (`python jobs.py`).
+COLUMNS = [
+    ("preview", "VARCHAR(100)"),
+    ("preview_status", "VARCHAR(20)"),
+]
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    for name, sql_type in COLUMNS:
+        try:
+            cursor.execute(f"ALTER TABLE blobs ADD COLUMN {name} {sql_type}")
+            print(f"Added {name} column successfully.")
+        except sqlite3.OperationalError as e:
+            print(f"{name} column might already exist: {e}")
+
+    conn.commit()
+    conn.close()
+
+def backfill():
+    import preview
+    from database import SessionLocal
+    from models import Blob, Document
+
+    db = SessionLocal()
+    queued = 0
+    try:
+        db.query(Blob).filter(Blob.preview_status == preview.FAILED).update({"preview_status": None})
+        db.commit()
+        pending = db.query(Document).join(Blob, Blob.sha256 == Document.blob_sha256).filter(Blob.preview_status.is_(None))
+        for doc in pending.all():
+            if preview.request(db, doc):
+                queued += 1
+    finally:
+        db.close()
+    print(f"Queued {queued} previews.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add preview columns; optionally queue previews of existing files.")
+    parser.add_argument("--backfill", action="store_true", help="queue previews for files stored without one")
+    args = parser.parse_args()
+    migrate()
+    if args.backfill:
+        backfill()
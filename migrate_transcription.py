@@ -0,0 +1,31 @@
+import sqlite3
+import os
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "lawbot.db")
+
+# Job state for background transcription (transcription.py). The
+# transcript_segments table is new and is created by `python migrate.py`.
+COLUMNS = [
+    ("transcript_status", "VARCHAR(20)"),
+    ("transcript_progress", "FLOAT"),
+    ("transcript_error", "TEXT"),
+    ("transcript_updated_at", "DATETIME"),
+    ("media_duration_s", "FLOAT"),
+]
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    for name, sql_type in COLUMNS:
+        try:
+            cursor.execute(f"ALTER TABLE documents ADD COLUMN {name} {sql_type}")
+            print(f"Added {name} column successfully.")
+        except sqlite3.OperationalError as e:
+            print(f"{name} column might already exist: {e}")
+
+    conn.commit()
+    conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -7,9 +7,9 @@ from datetime import datetime, timezone
 
 from sqlalchemy import (
     Column, String, Text, Integer, Float, DateTime,
-    ForeignKey, Boolean, Enum as SAEnum
+    ForeignKey, Boolean, Enum as SAEnum, Index, event, select
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred, column_property
 
 from database import Base
 
@@ -22,6 +22,10 @@ def utcnow():
     return datetime.now(timezone.utc)
 
 
+# Characters of a transcript or summary that document listings carry
+PREVIEW_CHARS = 200
+
+
 class Case(Base):
     __tablename__ = "cases"
 
@@ -32,6 +36,9 @@ class Case(Base):
     court = Column(String(255), nullable=True)
     status = Column(String(20), default="active")  # active | closed | pending
     description = Column(Text, nullable=True)
+    current_stage = Column(String(255), nullable=True)  # e.g. "Summons received"
+    law_code = Column(String(50), nullable=True)        # CPC | CrPC | BNSS | ...
+    stage_date = Column(DateTime, nullable=True)        # when the current stage began
     created_at = Column(DateTime, default=utcnow)
     updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
 
@@ -50,20 +57,153 @@ class Document(Base):
     case_id = Column(String, ForeignKey("cases.id", ondelete="CASCADE"), nullable=True)
     filename = Column(String(255), nullable=False)        # UUID-based stored name
     original_filename = Column(String(255), nullable=False)  # User's original filename
-    file_path = Column(String(500), nullable=False)
+    file_path = Column(String(500), nullable=False)       # blob:<key> in the blob store, or a path on disk
+    blob_sha256 = Column(String(64), nullable=True, index=True)  # content hash; one reference on blobs
     file_type = Column(String(50), nullable=True)         # pdf, docx, png, etc.
     file_size = Column(Integer, nullable=True)             # bytes
     uploaded_at = Column(DateTime, default=utcnow)
-    transcript = Column(Text, nullable=True)               # Generated transcript
-    summary = Column(Text, nullable=True)                  # Generated summary
+    # Transcripts of long recordings run to megabytes: both columns are only
+    # loaded on access (or with undefer_group("content")), never by listings.
+    transcript = deferred(Column(Text, nullable=True), group="content")  # Generated transcript
+    summary = deferred(Column(Text, nullable=True), group="content")     # Generated summary
+    # What listings show of the two instead: kept in step by _store_digest below
+    transcript_chars = Column(Integer, nullable=False, default=0)
+    summary_chars = Column(Integer, nullable=False, default=0)
+    transcript_preview = Column(String(PREVIEW_CHARS), nullable=True)
+    summary_preview = Column(String(PREVIEW_CHARS), nullable=True)
+    transcript_status = Column(String(20), nullable=True)  # queued | running | done | failed
+    transcript_progress = Column(Float, nullable=True)     # 0..1 of the media transcribed
+    transcript_error = Column(Text, nullable=True)
+    transcript_updated_at = Column(DateTime, nullable=True)  # heartbeat of the running job
+    media_duration_s = Column(Float, nullable=True)
 
     # Relationships
     case = relationship("Case", back_populates="documents")
+    transcript_segments = relationship(
+        "TranscriptSegment", back_populates="document", cascade="all, delete-orphan",
+        order_by="TranscriptSegment.idx",
+    )
+
+    @property
+    def preview_url(self):
+        """Where the rendered preview of the file is served (preview.py), once there is one."""
+        return f"/api/previews/{self.preview_key}" if self.preview_key else None
 
     def __repr__(self):
         return f"<Document(id={self.id}, original_filename={self.original_filename})>"
 
 
+class TranscriptSegment(Base):
+    """One timestamped stretch of a document's transcript, written as transcription progresses."""
+    __tablename__ = "transcript_segments"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(String, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
+    idx = Column(Integer, nullable=False)      # order within the document
+    start_s = Column(Float, nullable=False)
+    end_s = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
+
+    document = relationship("Document", back_populates="transcript_segments")
+
+    def __repr__(self):
+        return f"<TranscriptSegment(document_id={self.document_id}, idx={self.idx}, start_s={self.start_s})>"
+
+
+class Job(Base):
+    """A unit of background work; see jobs.py for the queue semantics."""
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    kind = Column(String(50), nullable=False)            # transcribe | query | document_analysis | ...
+    status = Column(String(20), default="queued", nullable=False)  # queued | running | succeeded | failed | cancelled
+    priority = Column(Integer, default=0, nullable=False)  # higher runs first
+    case_id = Column(String, ForeignKey("cases.id", ondelete="SET NULL"), nullable=True, index=True)
+    document_id = Column(String, ForeignKey("documents.id", ondelete="SET NULL"), nullable=True, index=True)
+    payload = Column(Text, nullable=True)                 # JSON arguments for the handler
+    result = deferred(Column(Text, nullable=True))        # JSON result once succeeded
+    error = Column(Text, nullable=True)
+    progress = Column(Float, nullable=True)               # 0..1, reported by the handler
+    message = Column(String(255), nullable=True)          # latest progress note
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    run_after = Column(DateTime, default=utcnow, nullable=False)  # not before (retry backoff)
+    lease_owner = Column(String(100), nullable=True)      # worker holding the job
+    lease_expires_at = Column(DateTime, nullable=True)    # visibility timeout
+    created_at = Column(DateTime, default=utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+
+    __table_args__ = (Index("ix_jobs_claim", "status", "priority", "created_at"),)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
+
+
+class Blob(Base):
+    """Stored file content, shared by every document with the same bytes (blob_store.py)."""
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)                # bytes as uploaded
+    stored_size = Column(Integer, nullable=False)         # bytes in the backend
+    encoding = Column(String(10), nullable=False, default="identity")  # identity | gzip
+    tier = Column(String(10), nullable=False, default="hot")  # hot | cold (tiered backend)
+    ref_count = Column(Integer, nullable=False, default=0)  # documents pointing here
+    created_at = Column(DateTime, default=utcnow)
+    released_at = Column(DateTime, nullable=True, index=True)  # when ref_count last fell to 0
+    accessed_at = Column(DateTime, nullable=True)         # last download, to the day
+    preview = Column(String(100), nullable=True)          # key of the rendered preview (preview.py)
+    preview_status = Column(String(20), nullable=True)    # queued | done | none | failed
+
+    def __repr__(self):
+        return f"<Blob(sha256={self.sha256}, size={self.size}, ref_count={self.ref_count})>"
+
+
+class Change(Base):
+    """One write to a case, document or event, for the sync feed (change_feed.py)."""
+    __tablename__ = "changes"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # the sync token: only grows
+    entity = Column(String(20), nullable=False)           # case | document | event
+    entity_id = Column(String, nullable=False)
+    op = Column(String(10), nullable=False)               # upsert | delete
+    changed_at = Column(DateTime, default=utcnow, nullable=False, index=True)
+
+    # AUTOINCREMENT: SQLite would otherwise reuse the id of a pruned newest row
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    def __repr__(self):
+        return f"<Change(id={self.id}, entity={self.entity}, entity_id={self.entity_id}, op={self.op})>"
+
+
+def text_digest(text):
+    """(length, first PREVIEW_CHARS characters) of a transcript or summary."""
+    return (len(text), text[:PREVIEW_CHARS]) if text else (0, None)
+
+
+# Listings describe a transcript from its stored digest: computing one with
+# length()/substr() would read the whole value from disk for every row.
+# Core inserts (routers/bulk.py) fill the digest columns themselves.
+def _store_digest(field):
+    @event.listens_for(getattr(Document, field), "set")
+    def _on_set(target, value, oldvalue, initiator):
+        chars, preview = text_digest(value)
+        setattr(target, f"{field}_chars", chars)
+        setattr(target, f"{field}_preview", preview)
+
+
+_store_digest("transcript")
+_store_digest("summary")
+
+# The preview belongs to the content, so documents sharing a blob share it
+Document.preview_key = column_property(
+    select(Blob.preview).where(Blob.sha256 == Document.__table__.c.blob_sha256).scalar_subquery()
+)
+
+
 class CalendarEvent(Base):
     __tablename__ = "calendar_events"
 
@@ -0,0 +1,169 @@
+"""
+Plan executor for multi-tool queries.
+
+Runs the DAG returned by navigation.router.plan_tool_calls: steps whose
+dependencies are satisfied start immediately on a shared thread pool, every
+step has its own timeout, and the whole plan shares one deadline. A step that
+fails or times out is reported as such without holding back the others;
+dependants still run, with whatever context their finished dependencies
+produced.
+"""
+import contextvars
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional
+
+from telemetry import span
+from request_budget import current_budget
+
+PLAN_DEADLINE_S = float(os.getenv("LAWBOT_PLAN_DEADLINE_S", "45"))
+BRANCH_TIMEOUT_S = float(os.getenv("LAWBOT_PLAN_BRANCH_TIMEOUT_S", "30"))
+CONTEXT_CHARS = 2000
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LAWBOT_PLAN_WORKERS", "16")),
+    thread_name_prefix="plan",
+)
+
+
+class PlanError(Exception):
+    """Raised when a plan is structurally invalid (unknown tool, cycle, bad reference)."""
+    pass
+
+
+def validate_plan(steps: List[Dict[str, Any]], tools: Dict[str, Any], max_steps: int) -> List[Dict[str, Any]]:
+    """Check ids, tools and dependencies; returns the steps in a runnable (topological) order."""
+    if not steps:
+        raise PlanError("Plan has no steps.")
+    if len(steps) > max_steps:
+        raise PlanError(f"Plan has {len(steps)} steps; at most {max_steps} allowed.")
+
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for step in steps:
+        step_id = step.get("id")
+        if not step_id or step_id in by_id:
+            raise PlanError(f"Missing or duplicate step id: {step_id!r}")
+        if step.get("tool") not in tools:
+            raise PlanError(f"Step {step_id} uses unknown tool {step.get('tool')!r}")
+        by_id[step_id] = step
+
+    ordered: List[Dict[str, Any]] = []
+    state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(step_id: str) -> None:
+        if state.get(step_id) == 2:
+            return
+        if state.get(step_id) == 1:
+            raise PlanError(f"Plan has a dependency cycle through {step_id}")
+        state[step_id] = 1
+        for dep in by_id[step_id].get("depends_on") or []:
+            if dep not in by_id:
+                raise PlanError(f"Step {step_id} depends on unknown step {dep!r}")
+            visit(dep)
+        state[step_id] = 2
+        ordered.append(by_id[step_id])
+
+    for step_id in by_id:
+        visit(step_id)
+    return ordered
+
+
+def _context_from(deps: List[str], outcomes: Dict[str, Dict[str, Any]]) -> str:
+    parts = []
+    for dep in deps:
+        outcome = outcomes.get(dep)
+        if outcome and outcome["status"] == "ok":
+            parts.append(f"[{dep} · {outcome['tool']}] {json.dumps(outcome['result'], ensure_ascii=False)}")
+    return "\n".join(parts)[:CONTEXT_CHARS]
+
+
+def execute_plan(
+    steps: List[Dict[str, Any]],
+    tools: Dict[str, Callable[[Dict[str, Any]], Any]],
+    *,
+    max_steps: int = 4,
+    deadline_s: Optional[float] = None,
+    branch_timeout_s: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Execute a validated plan.
+
+    Args:
+        steps: Plan steps ({'id', 'tool', 'depends_on', ...tool params}).
+        tools: tool name -> callable(step) returning the tool result. A step
+            with dependencies receives their results in step['context'].
+
+    Returns:
+        Dict: step id -> {'tool', 'status' (ok | error | timeout), 'result' or
+        'error', 'elapsed_ms'}.
+    """
+    ordered = validate_plan(steps, tools, max_steps)
+    deadline_s = PLAN_DEADLINE_S if deadline_s is None else deadline_s
+    budget = current_budget.get()
+    if budget is not None:
+        # The plan cannot outlive the request that asked for it
+        deadline_s = min(deadline_s, budget.remaining())
+    branch_timeout_s = BRANCH_TIMEOUT_S if branch_timeout_s is None else branch_timeout_s
+    started = time.monotonic()
+    deadline = started + deadline_s
+
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    running: Dict[Any, Dict[str, Any]] = {}  # future -> {"step", "started"}
+    waiting = list(ordered)
+
+    def finish(step, status, started_at, **extra):
+        outcomes[step["id"]] = {
+            "tool": step["tool"],
+            "status": status,
+            "elapsed_ms": round((time.monotonic() - started_at) * 1000, 1),
+            **extra,
+        }
+
+    def run_step(step):
+        with span("tool", tool=step["tool"], mode="plan"):
+            return tools[step["tool"]](step)
+
+    while waiting or running:
+        # Launch everything whose dependencies have resolved (successfully or not)
+        for step in list(waiting):
+            deps = step.get("depends_on") or []
+            if all(d in outcomes for d in deps):
+                waiting.remove(step)
+                call = dict(step)
+                if deps:
+                    call["context"] = _context_from(deps, outcomes)
+                future = _executor.submit(contextvars.copy_context().run, run_step, call)
+                running[future] = {"step": step, "started": time.monotonic()}
+
+        if not running:
+            break
+
+        now = time.monotonic()
+        next_expiry = min([deadline] + [r["started"] + branch_timeout_s for r in running.values()])
+        done, _ = wait(list(running), timeout=max(0.0, next_expiry - now), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            info = running.pop(future)
+            try:
+                finish(info["step"], "ok", info["started"], result=future.result())
+            except Exception as e:
+                finish(info["step"], "error", info["started"], error=str(e))
+
+        now = time.monotonic()
+        for future, info in list(running.items()):
+            if now >= deadline or now - info["started"] >= branch_timeout_s:
+                # The worker thread cannot be interrupted; its result is dropped.
+                future.cancel()
+                running.pop(future)
+                finish(info["step"], "timeout", info["started"],
+                       error=f"Step exceeded its time budget ({branch_timeout_s:g}s branch / {deadline_s:g}s plan).")
+
+        if now >= deadline:
+            for step in waiting:
+                outcomes[step["id"]] = {"tool": step["tool"], "status": "timeout", "elapsed_ms": 0.0,
+                                        "error": "Plan deadline passed before this step could start."}
+            waiting = []
+
+    return outcomes
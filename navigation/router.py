@@ -1,21 +1,99 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 import os
-from dotenv import load_dotenv
-from openai import OpenAI
 
-load_dotenv()
+from bootstrap import load_env, openai_client
+from telemetry import span
+from circuit_breaker import CircuitOpen, breaker, note_fallback
+from request_budget import BudgetExceeded
+from shared_cache import cached, normalize
+from navigation.speculation import guess_search_tool, speculative_term
+
+load_env()
 
 class RoutingError(Exception):
     pass
 
-def map_intent_to_tool(user_query: str) -> Dict[str, Any]:
+
+TOOL_NAMES = [
+    "legal_search",
+    "web_search",
+    "adversarial_engine",
+    "procedural_navigator",
+    "document_processor",
+    "general_chat",
+    "drafting_agent",
+]
+
+ROUTING_RULES = """ROUTING RULES (follow this decision tree strictly):
+
+    1. 'legal_search': ONLY when the user wants to FIND or SEARCH for specific case laws, 
+       judgments, or court orders from Indian Kanoon database. 
+       The 'query' MUST be a CONCISE boolean keyword string using only core legal concepts:
+       sections, acts, and legal issues. Example: Section 438 CrPC anticipatory bail economic offence.
+       NEVER include conversational words like find, explain, what is, judgments, views, recent.
+
+    2. 'general_chat': For ALL of these:
+       - Explaining a legal concept or section (e.g., "Explain Section 482 CrPC")
+       - Answering questions about limitation periods, legal rights, remedies
+       - Client-facing or simple-language explanations
+       - Questions about whether a section/case exists (hallucination detection)
+       - Tactical legal advice (e.g., "My client missed the appeal deadline, what remedy?")
+       - Interpreting or comparing legal principles
+       - Questions about fake or non-existent sections/cases
+       - Any question that needs an EXPLANATION rather than a database search
+       Set 'query' to the full original user question.
+
+    3. 'adversarial_engine': When the user provides a DOCUMENT, DRAFT, or DETAILED CASE FACTS 
+       and asks to stress-test, review, find weaknesses, generate opposing arguments, or 
+       identify procedural risks. Also use for criminal defense simulations.
+       Set 'query' to the full text/facts provided.
+
+    4. 'procedural_navigator': When asking about specific procedural TIMELINES, NEXT STEPS, 
+       or LIMITATION PERIODS tied to a specific stage in litigation. 
+       Extract 'case_stage' and 'law_code'.
+
+    5. 'web_search': ONLY for queries about recent legal NEWS, amendments, or developments 
+       that would not be on Indian Kanoon. Set 'query' to a search-engine-friendly string.
+
+    6. 'document_processor': When the user provides raw legal document TEXT and asks for 
+       summarization, translation, timeline extraction, or bullet-point extraction.
+       Set 'query' to the document text.
+
+    7. 'drafting_agent': When the user asks to write, draft, generate, or create a legal 
+       document, agreement, notice, petition, or complaint. 
+       Extract 'draft_type' if clearly specified (e.g., 'civil complaint', 'NDA', 'legal notice').
+       Set 'query' to the full user instructions.
+
+    8. 'unknown': ONLY if the query is completely unrelated to law (e.g., weather, sports).
+    
+    IMPORTANT: When in doubt between legal_search and general_chat, prefer general_chat.
+    legal_search is ONLY for finding specific cases in the Kanoon database.
+"""
+
+
+def _user_message(user_query: str, context: Optional[str]) -> str:
+    if not context:
+        return f"User query: '{user_query}'"
+    return (
+        f"Conversation so far (for resolving follow-ups only):\n{context}\n\n"
+        f"User query: '{user_query}'\n"
+        "If the query is a follow-up, set every extracted 'query' to a self-contained "
+        "version of it using the conversation above."
+    )
+
+
+# Follow-ups (with conversation context) are routed afresh every time
+@cached("route", key=lambda user_query, context=None: None if context else ["intent", normalize(user_query)])
+def map_intent_to_tool(user_query: str, context: Optional[str] = None) -> Dict[str, Any]:
     """
     Layer 2 Navigation Router: Maps a raw user query from WhatsApp or Web to the correct tool.
     Uses OpenAI to classify intent and extract required arguments reliably.
     
     Args:
         user_query (str): The raw text from the user.
+        context (str): Optional compacted conversation so far (session_store), used
+            to resolve follow-ups like "and what about anticipatory bail?".
         
     Returns:
         Dict: Contains 'target_tool' and 'extracted_kwargs'.
@@ -24,7 +102,7 @@ def map_intent_to_tool(user_query: str) -> Dict[str, Any]:
     if not api_key:
         raise RoutingError("OPENAI_API_KEY is missing for Navigation Router.")
 
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
 
     response_format = {
         "type": "json_schema",
@@ -71,72 +149,152 @@ def map_intent_to_tool(user_query: str) -> Dict[str, Any]:
         }
     }
 
-    system_prompt = """
+    system_prompt = f"""
     You are the central Navigation Router for YuktiAI (an Indian Legal Assistant).
     Your job is to strictly classify the user's intent into one of the available tools 
     and extract the minimum necessary parameters.
     
-    ROUTING RULES (follow this decision tree strictly):
+    {ROUTING_RULES}
+    """
 
-    1. 'legal_search': ONLY when the user wants to FIND or SEARCH for specific case laws, 
-       judgments, or court orders from Indian Kanoon database. 
-       The 'query' MUST be a CONCISE boolean keyword string using only core legal concepts:
-       sections, acts, and legal issues. Example: Section 438 CrPC anticipatory bail economic offence.
-       NEVER include conversational words like find, explain, what is, judgments, views, recent.
+    try:
+        with breaker("openai").guard(), span("upstream", upstream="openai", op="router"):
+            response = client.chat.completions.create(
+                model="gpt-4o-2024-08-06",
+                temperature=0.0,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": _user_message(user_query, context)}
+                ],
+                response_format=response_format
+            )
+        
+        return json.loads(response.choices[0].message.content)
+        
+    except CircuitOpen:
+        return fallback_route(user_query)
+    except BudgetExceeded:
+        raise
+    except Exception as e:
+        raise RoutingError(f"Router LLM execution failed: {str(e)}")
 
-    2. 'general_chat': For ALL of these:
-       - Explaining a legal concept or section (e.g., "Explain Section 482 CrPC")
-       - Answering questions about limitation periods, legal rights, remedies
-       - Client-facing or simple-language explanations
-       - Questions about whether a section/case exists (hallucination detection)
-       - Tactical legal advice (e.g., "My client missed the appeal deadline, what remedy?")
-       - Interpreting or comparing legal principles
-       - Questions about fake or non-existent sections/cases
-       - Any question that needs an EXPLANATION rather than a database search
-       Set 'query' to the full original user question.
 
-    3. 'adversarial_engine': When the user provides a DOCUMENT, DRAFT, or DETAILED CASE FACTS 
-       and asks to stress-test, review, find weaknesses, generate opposing arguments, or 
-       identify procedural risks. Also use for criminal defense simulations.
-       Set 'query' to the full text/facts provided.
+def fallback_route(user_query: str) -> Dict[str, Any]:
+    """
+    Keyword routing used while the router LLM is unavailable. Only the search
+    routes can be served without the LLM, so anything else re-raises CircuitOpen.
+    """
+    tool = guess_search_tool(user_query)
+    if tool is None:
+        raise CircuitOpen("openai", breaker("openai").retry_after())
+    note_fallback("openai", "keyword_route")
+    return {
+        "target_tool": tool,
+        "extracted_kwargs": {"query": speculative_term(user_query, tool), "case_stage": "", "law_code": "", "draft_type": ""},
+        "reasoning": "Routed by keyword match; the AI router is temporarily unavailable.",
+    }
 
-    4. 'procedural_navigator': When asking about specific procedural TIMELINES, NEXT STEPS, 
-       or LIMITATION PERIODS tied to a specific stage in litigation. 
-       Extract 'case_stage' and 'law_code'.
 
-    5. 'web_search': ONLY for queries about recent legal NEWS, amendments, or developments 
-       that would not be on Indian Kanoon. Set 'query' to a search-engine-friendly string.
+MAX_PLAN_STEPS = 4
 
-    6. 'document_processor': When the user provides raw legal document TEXT and asks for 
-       summarization, translation, timeline extraction, or bullet-point extraction.
-       Set 'query' to the document text.
 
-    7. 'drafting_agent': When the user asks to write, draft, generate, or create a legal 
-       document, agreement, notice, petition, or complaint. 
-       Extract 'draft_type' if clearly specified (e.g., 'civil complaint', 'NDA', 'legal notice').
-       Set 'query' to the full user instructions.
+@cached("route", key=lambda user_query, context=None: None if context else ["plan", normalize(user_query)])
+def plan_tool_calls(user_query: str, context: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Plan-and-execute variant of the router: breaks a compound query into a
+    small DAG of tool calls (e.g. explain a section AND find recent judgments).
+    `context` is as for map_intent_to_tool.
 
-    8. 'unknown': ONLY if the query is completely unrelated to law (e.g., weather, sports).
-    
-    IMPORTANT: When in doubt between legal_search and general_chat, prefer general_chat.
-    legal_search is ONLY for finding specific cases in the Kanoon database.
+    Returns:
+        Dict: {'steps': [{'id', 'tool', 'query', 'case_stage', 'law_code',
+               'draft_type', 'depends_on'}], 'reasoning'}.
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RoutingError("OPENAI_API_KEY is missing for Navigation Router.")
+
+    client = openai_client(api_key)
+
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "tool_plan",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "steps": {
+                        "type": "array",
+                        "description": f"Between 1 and {MAX_PLAN_STEPS} tool calls.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "string", "description": "Short unique step id, e.g. 's1'."},
+                                "tool": {"type": "string", "enum": TOOL_NAMES},
+                                "query": {"type": "string"},
+                                "case_stage": {"type": "string"},
+                                "law_code": {"type": "string"},
+                                "draft_type": {"type": "string"},
+                                "depends_on": {
+                                    "type": "array",
+                                    "description": "Ids of steps whose results this step needs as context. Usually empty.",
+                                    "items": {"type": "string"}
+                                }
+                            },
+                            "required": ["id", "tool", "query", "case_stage", "law_code", "draft_type", "depends_on"],
+                            "additionalProperties": False
+                        }
+                    },
+                    "reasoning": {
+                        "type": "string",
+                        "description": "Brief explanation of the plan."
+                    }
+                },
+                "required": ["steps", "reasoning"],
+                "additionalProperties": False
+            },
+            "strict": True
+        }
+    }
+
+    system_prompt = f"""
+    You are the planning Navigation Router for YuktiAI (an Indian Legal Assistant).
+    The user's query may need MORE THAN ONE tool. Break it into the smallest set of
+    tool calls (at most {MAX_PLAN_STEPS}) that together answer it fully, applying the
+    routing rules below to EACH part and extracting that part's parameters.
+
+    {ROUTING_RULES}
+
+    PLANNING RULES:
+    - Use one step if one tool answers the whole query. Never add steps "just in case".
+    - Never use 'unknown' as a step; if nothing is legal, return a single 'general_chat' step.
+    - Steps run in parallel. Only set 'depends_on' when a step genuinely needs another
+      step's output (e.g. drafting a notice that must cite the judgments found).
+    - Leave parameters that do not apply to a step as empty strings.
     """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            temperature=0.0,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"User query: '{user_query}'"}
-            ],
-            response_format=response_format
-        )
-        
+        with breaker("openai").guard(), span("upstream", upstream="openai", op="planner"):
+            response = client.chat.completions.create(
+                model="gpt-4o-2024-08-06",
+                temperature=0.0,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": _user_message(user_query, context)}
+                ],
+                response_format=response_format
+            )
+
         return json.loads(response.choices[0].message.content)
-        
+
+    except CircuitOpen:
+        route = fallback_route(user_query)
+        step = dict(route["extracted_kwargs"], id="s1", tool=route["target_tool"], depends_on=[])
+        return {"steps": [step], "reasoning": route["reasoning"]}
+    except BudgetExceeded:
+        raise
     except Exception as e:
-        raise RoutingError(f"Router LLM execution failed: {str(e)}")
+        raise RoutingError(f"Planner LLM execution failed: {str(e)}")
+
 
 if __name__ == "__main__":
     test_queries = [
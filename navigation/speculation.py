@@ -0,0 +1,135 @@
+"""
+Speculative execution for search routes.
+
+While the Navigation Router LLM call is in flight, a cheap keyword heuristic
+guesses whether the query is a Kanoon or web search and starts that search on
+a locally cleaned-up version of the query. If the router then picks the same
+tool with an equivalent search term, the already-running result is used;
+otherwise it is discarded (cancelled if it has not started yet — an HTTP call
+already on the wire is simply left to finish and its result dropped).
+
+Only idempotent, read-only tools are ever speculated.
+"""
+import contextvars
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from telemetry import count
+
+SPECULATION_ENABLED = os.getenv("LAWBOT_SPECULATIVE_ROUTING", "1") == "1"
+# Jaccard overlap between the speculative and the router's search terms
+# required to reuse the speculative result.
+MIN_TERM_OVERLAP = float(os.getenv("LAWBOT_SPECULATION_MIN_OVERLAP", "0.75"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LAWBOT_SPECULATION_WORKERS", "8")),
+    thread_name_prefix="speculate",
+)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Words the router is told to drop from Kanoon queries, plus glue words.
+_STOPWORDS = frozenset("""
+    a an and any about are as at by can could do does for from get give i in is it latest
+    list me my of on or please recent regarding related search show tell the to under
+    what which with find fetch look up explain judgments judgment judgements judgement
+    case cases law laws views rulings decisions news updates some all
+""".split())
+
+_SEARCH_HINTS = {
+    "web_search": ("news", "latest", "amendment", "amendments", "recent development", "notification", "this week"),
+    "legal_search": ("find", "judgment", "judgement", "case law", "precedent", "rulings", "decided cases"),
+}
+
+
+def _tokens(text: str) -> frozenset:
+    return frozenset(w for w in _WORD_RE.findall((text or "").lower()) if w not in _STOPWORDS)
+
+
+def guess_search_tool(query: str) -> Optional[str]:
+    """Cheap local guess at a search route; None when the query doesn't look like a search."""
+    lowered = (query or "").lower()
+    # News wins over case search: "latest judgments" is still a news query for the router.
+    for tool in ("web_search", "legal_search"):
+        if any(hint in lowered for hint in _SEARCH_HINTS[tool]):
+            return tool
+    return None
+
+
+def speculative_term(query: str, tool: str = "legal_search") -> str:
+    """
+    Approximate the router's search term. Kanoon wants bare legal keywords,
+    so conversational words are dropped; Google copes with the query as typed.
+    """
+    if tool == "web_search":
+        return (query or "").strip()
+    words = [w for w in _WORD_RE.findall((query or "").lower()) if w not in _STOPWORDS]
+    return " ".join(words) or query
+
+
+def terms_equivalent(a: str, b: str) -> bool:
+    ta, tb = _tokens(a), _tokens(b)
+    if not ta or not tb:
+        return False
+    return len(ta & tb) / len(ta | tb) >= MIN_TERM_OVERLAP
+
+
+class Speculation:
+    """A search started ahead of the router's decision."""
+
+    def __init__(self, tool: str, term: str, future: Future):
+        self.tool = tool
+        self.term = term
+        self._future = future
+        self._claimed = False
+
+    def claim(self, tool: str, router_term: str) -> Tuple[bool, Any]:
+        """
+        Returns (True, result) if the speculation matches the router's decision
+        and succeeded; (False, None) otherwise, in which case it is discarded.
+        """
+        if tool != self.tool:
+            self.discard("miss_tool")
+            return False, None
+        if not terms_equivalent(self.term, router_term):
+            self.discard("miss_term")
+            return False, None
+        self._claimed = True
+        try:
+            result = self._future.result()
+        except Exception:
+            count("lawbot_speculation_total", tool=self.tool, outcome="error")
+            return False, None
+        count("lawbot_speculation_total", tool=self.tool, outcome="hit")
+        return True, result
+
+    def discard(self, outcome: str = "unused") -> None:
+        if self._claimed:
+            return
+        self._claimed = True
+        self._future.cancel()
+        count("lawbot_speculation_total", tool=self.tool, outcome=outcome)
+
+
+def start_speculation(query: str, tools: Dict[str, Callable[[str], Any]]) -> Optional[Speculation]:
+    """Kick off the guessed search tool in the background, if any."""
+    if not SPECULATION_ENABLED:
+        return None
+    tool = guess_search_tool(query)
+    if tool is None or tool not in tools:
+        return None
+    term = speculative_term(query, tool)
+    # copy_context keeps the request's trace id on the background span
+    future = _executor.submit(contextvars.copy_context().run, tools[tool], term)
+    return Speculation(tool, term, future)
+
+
+def run_search(spec: Optional[Speculation], tool: str, term: str, fn: Callable[[str], Any]) -> Tuple[str, Any]:
+    """Use the speculative result when it matches, else run `fn(term)`. Returns (term_used, result)."""
+    if spec is not None:
+        hit, result = spec.claim(tool, term)
+        if hit:
+            return spec.term, result
+    return term, fn(term)
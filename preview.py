@@ -0,0 +1,200 @@
+"""
+Background previews of uploaded PDFs, images, video and audio.
+
+An upload queues a "preview" job (see jobs.py) for its content, and a job
+worker hands the rendering to a pool of processes, so ffmpeg, pdftoppm
+and the waveform arithmetic never hold the GIL of an API or worker
+process (renderers: lawbot_runtime/tools/render_preview.py):
+
+    PDF      the first page, as a JPEG
+    image    the image scaled down, as a JPEG
+    video    a poster frame, as a JPEG
+    audio    a waveform summary, as JSON
+
+A preview belongs to the content, not the document: it is stored beside
+the blob as <sha256>.preview.jpg or <sha256>.waveform.json (blob_store.py),
+rendered once however many documents share the bytes, and deleted with
+the blob. Documents expose it as `preview_url`, served by
+GET /api/previews/{key}. The key names one rendering of one content, so
+the response never changes and is cached by the browser for a year.
+
+blobs.preview_status records the outcome: queued, done, none (no
+preview for this file type) or failed; `python migrate_previews.py
+--backfill` retries failed ones and queues the content uploaded before.
+
+Env:
+    LAWBOT_PREVIEWS=1                0: no previews are queued
+    LAWBOT_PREVIEW_PROCESSES=2       rendering processes per worker process
+"""
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+import blob_store
+import change_feed
+import jobs
+import view_cache
+from database import SessionLocal
+from models import Blob, Document
+from telemetry import count, observe
+from lawbot_runtime.tools import render_preview
+from lawbot_runtime.tools.render_preview import PreviewUnavailable
+
+ENABLED = os.environ.get("LAWBOT_PREVIEWS", "1") != "0"
+PROCESSES = int(os.environ.get("LAWBOT_PREVIEW_PROCESSES", "2"))
+
+QUEUED = "queued"
+DONE = "done"
+NONE = "none"
+FAILED = "failed"
+
+# Below transcription (jobs.py priorities: higher first)
+PRIORITY = -1
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}\.(preview\.jpg|waveform\.json)$")
+MEDIA_TYPES = {suffix: media_type for suffix, media_type in render_preview.OUTPUTS.values()}
+
+logger = logging.getLogger("lawbot.preview")
+
+_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> concurrent.futures.ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking a process that runs threads and holds database connections is unsafe
+                _pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=PROCESSES, mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _reset_executor() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def request(db: Session, doc: Document) -> Optional[str]:
+    """
+    Queue a preview of `doc`'s content unless it has one or one is on the
+    way (an identical earlier upload); returns the job id if one was queued.
+    """
+    if not ENABLED or not doc.blob_sha256 or (doc.file_type or "") not in render_preview.KINDS:
+        return None
+    claimed = db.execute(
+        update(Blob)
+        .where(Blob.sha256 == doc.blob_sha256, Blob.preview_status.is_(None))
+        .values(preview_status=QUEUED)
+    ).rowcount == 1
+    if not claimed:
+        db.rollback()
+        return None
+    # No case_id: a case with hundreds of uploads must not hold back its other jobs
+    return jobs.enqueue(
+        "preview", {"document_id": doc.id, "sha256": doc.blob_sha256},
+        priority=PRIORITY, document_id=doc.id, db=db,
+    )
+
+
+def serve(key: str) -> Response:
+    """The stored preview `key`; raises FileNotFoundError when there is none."""
+    if not KEY_PATTERN.match(key):
+        raise FileNotFoundError(key)
+    media_type = MEDIA_TYPES[key[65:]]
+    return blob_store.object_response(key, media_type, {"Cache-Control": CACHE_CONTROL})
+
+
+# ─── Job ──────────────────────────────────────────────────────
+
+def _finish(db: Session, sha256: str, key: Optional[str], status: Optional[str]) -> None:
+    """Record the outcome; documents showing the new preview go out to sync clients and cached views."""
+    stored = db.execute(
+        update(Blob).where(Blob.sha256 == sha256).values(preview=key, preview_status=status)
+    ).rowcount == 1
+    if stored and key:
+        docs = db.execute(select(Document.id, Document.case_id).where(Document.blob_sha256 == sha256)).all()
+        change_feed.record(db, "document", [doc_id for doc_id, _ in docs])
+        view_cache.touch(db, [case_id for _, case_id in docs])
+    db.commit()
+
+
+def _render(ctx: "jobs.JobContext", kind: str, source: str, dest: str) -> None:
+    future = _executor().submit(render_preview.render_preview, kind, source, dest)
+    while True:
+        try:
+            return future.result(timeout=1.0)
+        except concurrent.futures.TimeoutError:
+            # Each renderer gives up after LAWBOT_PREVIEW_TIMEOUT_S (render_preview.py)
+            ctx.check()
+        except BrokenProcessPool:
+            _reset_executor()
+            raise
+
+
+def run_job(ctx: "jobs.JobContext", payload: Dict[str, Any]) -> Dict[str, Any]:
+    sha256 = payload["sha256"]
+    db = SessionLocal()
+    try:
+        # Any document with the content will do if the one uploaded is gone
+        doc = db.get(Document, payload["document_id"])
+        if doc is None or doc.blob_sha256 != sha256:
+            doc = db.query(Document).filter(Document.blob_sha256 == sha256).first()
+        if doc is None:
+            # Nothing to show it on; a later upload of the same content queues it again
+            _finish(db, sha256, None, None)
+            return {"sha256": sha256, "preview": None}
+        kind = render_preview.KINDS.get(doc.file_type or "")
+        if kind is None:
+            _finish(db, sha256, None, NONE)
+            return {"sha256": sha256, "preview": None}
+        # Hold no transaction while rendering
+        db.expunge(doc)
+        db.commit()
+
+        suffix, _ = render_preview.OUTPUTS[kind]
+        key = f"{sha256}.{suffix}"
+        started = time.perf_counter()
+        with blob_store.local_path(doc) as source, blob_store.scratch(f".{suffix}") as dest:
+            try:
+                _render(ctx, kind, source, dest)
+            except PreviewUnavailable as e:
+                raise jobs.PermanentJobError(f"Previews are not available on this server: {e}") from e
+            blob_store.backend().put(key, dest)
+        _finish(db, sha256, key, DONE)
+        observe("lawbot_preview_seconds", time.perf_counter() - started, kind=kind)
+        count("lawbot_previews_total", kind=kind, result="done")
+        return {"sha256": sha256, "preview": key}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _on_failed(payload: Dict[str, Any], error: str) -> None:
+    db = SessionLocal()
+    try:
+        _finish(db, payload["sha256"], None, FAILED)
+    finally:
+        db.close()
+    count("lawbot_previews_total", result="failed")
+    logger.warning("Preview of document %s failed: %s", payload.get("document_id"), error)
+
+
+jobs.register("preview", run_job, max_attempts=2, retry_delay_s=30.0, on_failed=_on_failed)
@@ -0,0 +1,136 @@
+"""
+Per-request time budget for YuktiAI.
+
+A RequestBudget is installed in a context variable at the start of a request;
+every upstream call derives its timeout from what is left of it instead of a
+hardcoded constant, and checks it first so that an exhausted or cancelled
+request (client disconnected) stops issuing new upstream calls. Spans
+recorded while a budget is active are added to its stage breakdown, which is
+returned to the client.
+"""
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+DEFAULT_BUDGET_S = float(os.environ.get("LAWBOT_REQUEST_BUDGET_S", "30"))
+MAX_BUDGET_S = float(os.environ.get("LAWBOT_REQUEST_BUDGET_MAX_S", "120"))
+# Default per-call cap for LLM requests when no budget is active.
+LLM_TIMEOUT_S = float(os.environ.get("LAWBOT_LLM_TIMEOUT_S", "60"))
+# Below this many seconds an upstream call is not worth starting.
+MIN_CALL_S = 0.25
+
+
+class BudgetExceeded(Exception):
+    """Raised when a request has no time left for further upstream calls."""
+    pass
+
+
+class RequestCancelled(BudgetExceeded):
+    """Raised when the client went away and the request should stop."""
+    pass
+
+
+class RequestBudget:
+    def __init__(self, total_s: Optional[float] = None):
+        total = DEFAULT_BUDGET_S if total_s is None else total_s
+        self.total_s = max(0.0, min(float(total), MAX_BUDGET_S))
+        self.started = time.monotonic()
+        self.deadline = self.started + self.total_s
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._stages: List[Dict[str, object]] = []
+        self._fallbacks: List[Dict[str, str]] = []
+
+    # ── time accounting ──
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self) -> float:
+        """Raise if the request is cancelled or out of time; else return seconds left."""
+        if self.cancelled:
+            raise RequestCancelled("Client disconnected; request cancelled.")
+        left = self.remaining()
+        if left < MIN_CALL_S:
+            raise BudgetExceeded(f"Request time budget of {self.total_s:g}s exhausted.")
+        return left
+
+    def timeout(self, cap: float) -> float:
+        """Timeout for one upstream call: the smaller of its own cap and the time left."""
+        return min(cap, self.check())
+
+    # ── stage breakdown ──
+    def record(self, stage: str, seconds: float, error: Optional[str] = None) -> None:
+        # Offset of the stage's start from the start of the request
+        at = time.monotonic() - self.started - seconds
+        entry = {"stage": stage, "at_ms": round(max(0.0, at) * 1000, 1), "ms": round(seconds * 1000, 1)}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            self._stages.append(entry)
+
+    def note_fallback(self, upstream: str, kind: str) -> None:
+        with self._lock:
+            self._fallbacks.append({"upstream": upstream, "kind": kind})
+
+    @property
+    def fallbacks(self) -> List[Dict[str, str]]:
+        with self._lock:
+            return list(self._fallbacks)
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            stages = list(self._stages)
+        return {
+            "total_ms": round(self.total_s * 1000, 1),
+            "spent_ms": round(self.elapsed() * 1000, 1),
+            "remaining_ms": round(self.remaining() * 1000, 1),
+            "cancelled": self.cancelled,
+            "stages": stages,
+        }
+
+
+current_budget: ContextVar[Optional[RequestBudget]] = ContextVar("lawbot_request_budget", default=None)
+
+
+def upstream_timeout(cap: float) -> float:
+    """Timeout for an upstream call; `cap` unchanged when no budget is active."""
+    budget = current_budget.get()
+    return cap if budget is None else budget.timeout(cap)
+
+
+def upstream_retries(default: int) -> int:
+    """
+    SDK-level retries for an upstream client. Inside a budget retries are
+    disabled so one call cannot multiply its timeout; callers that retry on
+    their own check the budget before each attempt.
+    """
+    return default if current_budget.get() is None else 0
+
+
+def budget_allows(seconds: float) -> bool:
+    """Whether the active budget (if any) can afford waiting `seconds` and still make a call."""
+    budget = current_budget.get()
+    return budget is None or (not budget.cancelled and budget.remaining() >= seconds + MIN_CALL_S)
+
+
+def check_budget() -> None:
+    budget = current_budget.get()
+    if budget is not None:
+        budget.check()
+
+
+def openai_options() -> Dict[str, float]:
+    """Keyword arguments for OpenAI(...) derived from the active budget."""
+    return {"timeout": upstream_timeout(LLM_TIMEOUT_S), "max_retries": upstream_retries(2)}
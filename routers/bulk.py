@@ -0,0 +1,477 @@
+"""
+Bulk API Router — import and export cases, calendar events and document
+records as NDJSON or CSV, for onboarding a firm's existing matters.
+
+Both directions stream. An import is parsed line by line as the request
+body arrives and written IMPORT_BATCH records at a time, one executemany
+INSERT per record type and one transaction per batch; the next batch is
+not read until the previous one is written. An export reads with
+yield_per and writes rows out as it goes. Neither holds the data set in
+memory.
+
+Import:  POST /api/bulk/import[?format=ndjson|csv][&type=case|event|document][&dry_run=true]
+    NDJSON: one JSON object per line, with a "type" and the fields of
+            CaseImport / CalendarEventImport / DocumentImport (schemas.py).
+    CSV:    a header row, then one record per row; empty cells are left
+            unset. The type comes from a "type" column or ?type=.
+    The format follows ?format=, else the Content-Type (text/csv or NDJSON).
+
+    Records may keep their "id" (so an export imports back unchanged).
+    Cases may carry a "ref", the firm's own key; later events and documents
+    in the same upload link to it with "case_ref" instead of "case_id".
+    Invalid rows are skipped and reported by line; if a batch fails to
+    insert (e.g. a duplicate id), its rows are retried one at a time so
+    only the offending ones are dropped. A document's file_path must be
+    blob:<key> (as exported), naming content already in the blob store,
+    or a file under uploads/ stored before the blob store; any other path
+    is rejected, since downloads serve it and deletes remove it.
+
+Export:  GET /api/bulk/export[?format=ndjson|csv][&type=...][&case_id=...][&include_content=true]
+    NDJSON exports every type unless ?type= is given (cases first, so the
+    file imports back in order); CSV exports one type (default: case).
+    Document transcripts and summaries are only included on request.
+
+Env:
+    LAWBOT_IMPORT_BATCH=500          records per INSERT batch / transaction
+    LAWBOT_IMPORT_MAX_ERRORS=1000    row errors listed in the response (all are counted)
+"""
+import codecs
+import csv
+import io
+import json
+import os
+import time
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+import blob_store
+import change_feed
+import view_cache
+from database import ReadSessionLocal, SessionLocal
+from models import Blob, Case, CalendarEvent, Document, generate_uuid, text_digest, utcnow
+from schemas import BulkImportResult, CaseImport, CalendarEventImport, DocumentImport
+from telemetry import count, observe
+
+router = APIRouter(prefix="/api/bulk", tags=["Bulk"])
+
+IMPORT_BATCH = int(os.environ.get("LAWBOT_IMPORT_BATCH", "500"))
+MAX_ERRORS = int(os.environ.get("LAWBOT_IMPORT_MAX_ERRORS", "1000"))
+
+# Export: rows fetched per round trip, and bytes buffered before each write
+EXPORT_CHUNK = 1000
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+# Insert order within a batch: events and documents may point at cases in the same batch
+RECORD_TYPES = ("case", "event", "document")
+MODELS = {"case": Case, "event": CalendarEvent, "document": Document}
+SCHEMAS = {"case": CaseImport, "event": CalendarEventImport, "document": DocumentImport}
+
+EXPORT_COLUMNS = {
+    "case": [
+        Case.id, Case.title, Case.case_number, Case.client_name, Case.court, Case.status,
+        Case.description, Case.current_stage, Case.law_code, Case.stage_date,
+        Case.created_at, Case.updated_at,
+    ],
+    "event": [
+        CalendarEvent.id, CalendarEvent.case_id, CalendarEvent.title, CalendarEvent.event_type,
+        CalendarEvent.event_date, CalendarEvent.category, CalendarEvent.meeting_link,
+        CalendarEvent.description, CalendarEvent.location, CalendarEvent.is_reminder_sent,
+        CalendarEvent.created_at,
+    ],
+    "document": [
+        Document.id, Document.case_id, Document.filename, Document.original_filename,
+        Document.file_path, Document.file_type, Document.file_size, Document.uploaded_at,
+    ],
+}
+CONTENT_COLUMNS = [Document.transcript, Document.summary]
+EXPORT_ORDER = {
+    "case": (Case.created_at, Case.id),
+    "event": (CalendarEvent.event_date, CalendarEvent.id),
+    "document": (Document.uploaded_at, Document.id),
+}
+
+FORMAT_PATTERN = "^(ndjson|csv)$"
+TYPE_PATTERN = "^(case|event|document)$"
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+# ─── Import ───────────────────────────────────────────────────
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}" for err in exc.errors()
+    )
+
+
+class _Importer:
+    """Validates and writes batches of parsed records; keeps the tallies for the response."""
+
+    def __init__(self, default_type: Optional[str], dry_run: bool):
+        self.default_type = default_type
+        self.dry_run = dry_run
+        self.db = None
+        self.refs: Dict[str, str] = {}     # case ref -> case id
+        self.case_ids: Set[str] = set()    # cases written (or, in a dry run, accepted) so far
+        self.rows = 0
+        self.imported = {kind: 0 for kind in RECORD_TYPES}
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def reject(self, line: int, kind: Optional[str], message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"line": line, "type": kind, "error": message})
+
+    def _prepare(self, kind: str, record: Dict[str, Any]) -> Tuple[dict, Optional[str]]:
+        """Column values for one record, and the case it must link to (if not already known)."""
+        row = SCHEMAS[kind].model_validate(record)
+        values = row.model_dump(exclude={"ref", "case_ref"})
+        values["id"] = values["id"] or generate_uuid()
+        if kind == "case":
+            values["created_at"] = values["created_at"] or utcnow()
+            values["updated_at"] = values["created_at"]
+            return values, None
+
+        if row.case_ref is not None:
+            values["case_id"] = self.refs.get(row.case_ref)
+            if values["case_id"] is None:
+                raise ValueError(f"case_ref '{row.case_ref}' does not match a case earlier in this upload")
+        if kind == "event":
+            values["created_at"] = values["created_at"] or utcnow()
+        else:
+            values["filename"] = values["filename"] or os.path.basename(values["file_path"])
+            values["blob_sha256"] = None
+            if values["file_path"].startswith(blob_store.PREFIX):
+                values["blob_sha256"] = values["file_path"][len(blob_store.PREFIX):][:64]
+            elif blob_store.legacy_path(values["file_path"]) is None:
+                raise ValueError(
+                    f"file_path '{values['file_path']}' must be blob:<key> or a file under {blob_store.LEGACY_DIR}/"
+                )
+            if values["file_type"] is None:
+                values["file_type"] = os.path.splitext(values["original_filename"])[1].lower().lstrip(".") or None
+            values["uploaded_at"] = values["uploaded_at"] or utcnow()
+            for field in ("transcript", "summary"):
+                values[f"{field}_chars"], values[f"{field}_preview"] = text_digest(values[field])
+        case_id = values["case_id"]
+        return values, case_id if case_id and case_id not in self.case_ids else None
+
+    def write_batch(self, records: List[Tuple[int, Dict[str, Any]]]) -> None:
+        started = time.perf_counter()
+        if self.db is None:
+            self.db = SessionLocal()
+        prepared: Dict[str, List[Tuple[int, dict, Optional[str]]]] = {kind: [] for kind in RECORD_TYPES}
+        unresolved: List[Tuple[str, int, dict, str]] = []
+        for line, record in records:
+            self.rows += 1
+            kind = record.pop("type", None) or self.default_type
+            if kind not in MODELS:
+                self.reject(line, kind, "type must be one of case, event, document")
+                continue
+            try:
+                values, check_case = self._prepare(kind, record)
+            except ValidationError as e:
+                self.reject(line, kind, _describe(e))
+                continue
+            except ValueError as e:
+                self.reject(line, kind, str(e))
+                continue
+            ref = record.get("ref") if kind == "case" else None
+            if ref is not None:
+                if ref in self.refs:
+                    self.reject(line, kind, f"ref '{ref}' is used by another case in this upload")
+                    continue
+                self.refs[ref] = values["id"]
+            if kind == "case":
+                self.case_ids.add(values["id"])
+            if check_case:
+                unresolved.append((kind, line, values, check_case))
+            else:
+                prepared[kind].append((line, values, ref))
+
+        # case_ids from outside the upload must exist; one query for the whole batch
+        if unresolved:
+            wanted = {case_id for _, _, _, case_id in unresolved}
+            found = set(self.db.execute(select(Case.id).where(Case.id.in_(wanted))).scalars())
+            for kind, line, values, case_id in unresolved:
+                if case_id in found:
+                    prepared[kind].append((line, values, None))
+                else:
+                    self.reject(line, kind, f"case_id '{case_id}' not found")
+            for kind in ("event", "document"):
+                prepared[kind].sort(key=lambda item: item[0])
+
+        # A document exported as blob:<key> links to content that must already be stored,
+        # under exactly the key the blob is stored as
+        wanted = {values["blob_sha256"] for _, values, _ in prepared["document"] if values["blob_sha256"]}
+        if wanted:
+            found = {
+                sha256: blob_store.PREFIX + blob_store.key_for(sha256, encoding)
+                for sha256, encoding in self.db.execute(
+                    select(Blob.sha256, Blob.encoding).where(Blob.sha256.in_(wanted))
+                )
+            }
+            kept = []
+            for line, values, ref in prepared["document"]:
+                sha256 = values["blob_sha256"]
+                if sha256 is None or found.get(sha256) == values["file_path"]:
+                    kept.append((line, values, ref))
+                else:
+                    self.reject(line, "document", f"file_path '{values['file_path']}' is not in the blob store")
+            prepared["document"] = kept
+
+        try:
+            for kind in RECORD_TYPES:
+                if prepared[kind]:
+                    rows = [values for _, values, _ in prepared[kind]]
+                    self.db.execute(insert(MODELS[kind]), rows)
+                    self._touch(kind, rows)
+            self._end_transaction()
+        except SQLAlchemyError:
+            self.db.rollback()
+            self._write_rows(prepared)
+        else:
+            for kind in RECORD_TYPES:
+                self.imported[kind] += len(prepared[kind])
+        observe("lawbot_bulk_import_batch_seconds", time.perf_counter() - started)
+
+    def _write_rows(self, prepared: Dict[str, List[Tuple[int, dict, Optional[str]]]]) -> None:
+        """Fallback for a batch that failed as a whole: one transaction per row."""
+        lost_cases: Set[str] = set()
+        for kind in RECORD_TYPES:
+            if kind == "event" and lost_cases:
+                # A case rejected as a duplicate of one already stored can still be linked to
+                lost_cases -= set(self.db.execute(select(Case.id).where(Case.id.in_(lost_cases))).scalars())
+            for line, values, ref in prepared[kind]:
+                if kind != "case" and values["case_id"] in lost_cases:
+                    self.reject(line, kind, "the linked case could not be imported")
+                    continue
+                try:
+                    self.db.execute(insert(MODELS[kind]), [values])
+                    self._touch(kind, [values])
+                    self._end_transaction()
+                except SQLAlchemyError as e:
+                    self.db.rollback()
+                    self.reject(line, kind, str(getattr(e, "orig", None) or e).splitlines()[0])
+                    if kind == "case":
+                        lost_cases.add(values["id"])
+                        self.case_ids.discard(values["id"])
+                        if ref is not None:
+                            self.refs.pop(ref, None)
+                else:
+                    self.imported[kind] += 1
+
+    def _touch(self, kind: str, rows: List[dict]) -> None:
+        """
+        Log the rows for the sync feed, mark the cached views they change (a
+        new case has none yet) and count documents' references to stored blobs.
+        """
+        change_feed.record(self.db, kind, [v["id"] for v in rows], [v.get("case_id") for v in rows])
+        if kind == "document":
+            blob_store.add_references(self.db, [v["blob_sha256"] for v in rows])
+        if kind == "event":
+            view_cache.touch(self.db, [v["case_id"] for v in rows], [v["event_date"] for v in rows])
+        elif kind == "document":
+            view_cache.touch(self.db, [v["case_id"] for v in rows])
+
+    def _end_transaction(self) -> None:
+        if self.dry_run:
+            self.db.rollback()
+        else:
+            self.db.commit()
+
+    def close(self) -> None:
+        if self.db is not None:
+            self.db.close()
+        for kind in RECORD_TYPES:
+            count("lawbot_bulk_import_rows_total", self.imported[kind], type=kind, outcome="imported")
+        count("lawbot_bulk_import_rows_total", self.failed, outcome="failed")
+
+
+async def _lines(request: Request) -> AsyncIterator[str]:
+    """Decoded lines of the request body, as it arrives."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    at_start = True
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        if at_start and pending:
+            pending = pending.lstrip("\ufeff")  # BOM from spreadsheet exports
+            at_start = False
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _ndjson_records(request: Request) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    line_no = 0
+    async for line in _lines(request):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"invalid JSON: {e}"
+            continue
+        if isinstance(record, dict):
+            yield line_no, record, None
+        else:
+            yield line_no, None, "each line must be a JSON object"
+
+
+async def _csv_records(request: Request) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    header: Optional[List[str]] = None
+    line_no = start = quotes = 0
+    buffered: List[str] = []
+    async for line in _lines(request):
+        line_no += 1
+        if not buffered:
+            start = line_no
+        buffered.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue  # a quoted field runs on to the next line
+        text = "\n".join(buffered)
+        buffered, quotes = [], 0
+        if not text.strip():
+            continue
+        fields = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip().lower() for name in fields]
+            continue
+        if len(fields) > len(header):
+            yield start, None, f"{len(fields)} fields but the header has {len(header)} columns"
+            continue
+        yield start, {name: value for name, value in zip(header, fields) if value != ""}, None
+    if buffered:
+        yield start, None, "unterminated quoted field"
+
+
+@router.post("/import", response_model=BulkImportResult)
+async def import_records(
+    request: Request,
+    fmt: Optional[str] = Query(None, alias="format", pattern=FORMAT_PATTERN),
+    record_type: Optional[str] = Query(None, alias="type", pattern=TYPE_PATTERN),
+    dry_run: bool = False,
+):
+    """
+    Import cases, events and document records streamed in the request body.
+    Returns counts per type and the rows that were skipped, with why.
+    """
+    fmt = fmt or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    records = _csv_records(request) if fmt == "csv" else _ndjson_records(request)
+    importer = _Importer(record_type, dry_run)
+    batch: List[Tuple[int, dict]] = []
+    try:
+        async for line, record, problem in records:
+            if problem is not None:
+                importer.rows += 1
+                importer.reject(line, record_type, problem)
+                continue
+            batch.append((line, record))
+            if len(batch) >= IMPORT_BATCH:
+                await run_in_threadpool(importer.write_batch, batch)
+                batch = []
+        if batch:
+            await run_in_threadpool(importer.write_batch, batch)
+    finally:
+        await run_in_threadpool(importer.close)
+    return BulkImportResult(
+        format=fmt,
+        dry_run=dry_run,
+        rows=importer.rows,
+        imported=importer.imported,
+        failed=importer.failed,
+        errors=sorted(importer.errors, key=lambda err: err["line"]),
+        errors_truncated=importer.failed > len(importer.errors),
+    )
+
+
+# ─── Export ───────────────────────────────────────────────────
+
+def _export_rows(kinds: List[str], case_id: Optional[str], include_content: bool) -> Iterator[Tuple[str, dict]]:
+    db = ReadSessionLocal()
+    try:
+        for kind in kinds:
+            model = MODELS[kind]
+            columns = EXPORT_COLUMNS[kind] + (CONTENT_COLUMNS if kind == "document" and include_content else [])
+            query = select(*columns).order_by(*EXPORT_ORDER[kind])
+            if case_id:
+                query = query.where((model.id if kind == "case" else model.case_id) == case_id)
+            result = db.execute(query.execution_options(yield_per=EXPORT_CHUNK))
+            for row in result.mappings():
+                yield kind, dict(row)
+    finally:
+        db.close()
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_stream(rows: Iterator[Tuple[str, dict]]) -> Iterator[str]:
+    buffer: List[str] = []
+    size = 0
+    for kind, row in rows:
+        text = json.dumps({"type": kind, **row}, default=_plain, ensure_ascii=False) + "\n"
+        buffer.append(text)
+        size += len(text)
+        if size >= EXPORT_FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _csv_stream(kind: str, columns: List[str], rows: Iterator[Tuple[str, dict]]) -> Iterator[str]:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["type"] + columns)
+    for _, row in rows:
+        writer.writerow([kind] + [
+            "" if value is None else str(value).lower() if isinstance(value, bool) else _plain(value)
+            for value in (row[name] for name in columns)
+        ])
+        if out.tell() >= EXPORT_FLUSH_BYTES:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue()
+
+
+@router.get("/export")
+def export_records(
+    fmt: str = Query("ndjson", alias="format", pattern=FORMAT_PATTERN),
+    record_type: Optional[str] = Query(None, alias="type", pattern=TYPE_PATTERN),
+    case_id: Optional[str] = None,
+    include_content: bool = False,
+):
+    """Stream cases, events and document records in the format the import accepts."""
+    if fmt == "csv":
+        kind = record_type or "case"
+        columns = [c.key for c in EXPORT_COLUMNS[kind]]
+        if kind == "document" and include_content:
+            columns += [c.key for c in CONTENT_COLUMNS]
+        body = _csv_stream(kind, columns, _export_rows([kind], case_id, include_content))
+        filename = f"lawbot-{kind}s.csv"
+    else:
+        kinds = [record_type] if record_type else list(RECORD_TYPES)
+        body = _ndjson_stream(_export_rows(kinds, case_id, include_content))
+        filename = "lawbot-export.ndjson"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -3,15 +3,19 @@ Calendar Events API Router — CRUD operations for court dates, deadlines, and r
 """
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session, joinedload
 
-from database import get_db
+import view_cache
+from database import get_db, get_read_db
 from models import CalendarEvent, Case
 from schemas import CalendarEventCreate, CalendarEventUpdate, CalendarEventResponse
 
 router = APIRouter(prefix="/api/calendar/events", tags=["Calendar"])
 
+# Responses show the linked case's title: join it in rather than loading it per event
+EVENT_LOADS = (joinedload(CalendarEvent.case).load_only(Case.title),)
+
 
 @router.post("", response_model=CalendarEventResponse, status_code=status.HTTP_201_CREATED)
 def create_event(payload: CalendarEventCreate, db: Session = Depends(get_db)):
@@ -31,13 +35,22 @@ def create_event(payload: CalendarEventCreate, db: Session = Depends(get_db)):
 
 @router.get("", response_model=list[CalendarEventResponse])
 def list_events(
+    request: Request,
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     event_type: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    """List calendar events with optional date-range and type filters."""
-    query = db.query(CalendarEvent).order_by(CalendarEvent.event_date.asc())
+    """
+    List calendar events with optional date-range and type filters.
+    Served from the view cache with an ETag (view_cache.py).
+    """
+    etag, cached = view_cache.lookup(
+        request, "calendar", [start_date, end_date, event_type], view_cache.calendar_scopes(start_date, end_date)
+    )
+    if cached is not None:
+        return cached
+    query = db.query(CalendarEvent).options(*EVENT_LOADS).order_by(CalendarEvent.event_date.asc())
 
     if start_date:
         query = query.filter(CalendarEvent.event_date >= start_date)
@@ -47,7 +60,7 @@ def list_events(
         query = query.filter(CalendarEvent.event_type == event_type)
 
     events = query.all()
-    return [_to_event_response(e) for e in events]
+    return view_cache.store(etag, [_to_event_response(e) for e in events])
 
 
 @router.put("/{event_id}", response_model=CalendarEventResponse)
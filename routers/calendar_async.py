@@ -0,0 +1,105 @@
+"""
+Calendar Events API Router (async) — the routes of routers/calendar.py on
+an AsyncSession, used when DATABASE_URL names an async driver (database.py).
+"""
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import view_cache
+from database import get_async_db, get_async_read_db
+from models import CalendarEvent, Case
+from schemas import CalendarEventCreate, CalendarEventUpdate, CalendarEventResponse
+from routers.calendar import EVENT_LOADS, _to_event_response
+
+router = APIRouter(prefix="/api/calendar/events", tags=["Calendar"])
+
+
+async def _load_event(db: AsyncSession, event_id: str) -> Optional[CalendarEvent]:
+    """The event with its case joined in (refreshing an instance the session already holds)."""
+    return await db.scalar(
+        select(CalendarEvent)
+        .options(*EVENT_LOADS)
+        .where(CalendarEvent.id == event_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+async def _case_exists(db: AsyncSession, case_id: str) -> bool:
+    return await db.scalar(select(Case.id).where(Case.id == case_id)) is not None
+
+
+@router.post("", response_model=CalendarEventResponse, status_code=status.HTTP_201_CREATED)
+async def create_event(payload: CalendarEventCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new calendar event, optionally linked to a case."""
+    # Verify case exists (if provided)
+    if payload.case_id and not await _case_exists(db, payload.case_id):
+        raise HTTPException(status_code=404, detail="Linked case not found.")
+
+    event = CalendarEvent(**payload.model_dump())
+    db.add(event)
+    await db.commit()
+    return _to_event_response(await _load_event(db, event.id))
+
+
+@router.get("", response_model=list[CalendarEventResponse])
+async def list_events(
+    request: Request,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    event_type: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    List calendar events with optional date-range and type filters.
+    Served from the view cache with an ETag (view_cache.py).
+    """
+    etag, cached = await run_in_threadpool(
+        view_cache.lookup, request, "calendar", [start_date, end_date, event_type],
+        view_cache.calendar_scopes(start_date, end_date),
+    )
+    if cached is not None:
+        return cached
+    query = select(CalendarEvent).options(*EVENT_LOADS).order_by(CalendarEvent.event_date.asc())
+
+    if start_date:
+        query = query.where(CalendarEvent.event_date >= start_date)
+    if end_date:
+        query = query.where(CalendarEvent.event_date <= end_date)
+    if event_type:
+        query = query.where(CalendarEvent.event_type == event_type)
+
+    events = (await db.scalars(query)).all()
+    return await run_in_threadpool(view_cache.store, etag, [_to_event_response(e) for e in events])
+
+
+@router.put("/{event_id}", response_model=CalendarEventResponse)
+async def update_event(event_id: str, payload: CalendarEventUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update a calendar event."""
+    event = await db.scalar(select(CalendarEvent).where(CalendarEvent.id == event_id))
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found.")
+
+    # Verify new case_id if provided
+    update_data = payload.model_dump(exclude_unset=True)
+    if update_data.get("case_id") and not await _case_exists(db, update_data["case_id"]):
+        raise HTTPException(status_code=404, detail="Linked case not found.")
+
+    for field, value in update_data.items():
+        setattr(event, field, value)
+
+    await db.commit()
+    return _to_event_response(await _load_event(db, event_id))
+
+
+@router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_event(event_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Delete a calendar event."""
+    event = await db.scalar(select(CalendarEvent).where(CalendarEvent.id == event_id))
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found.")
+    await db.delete(event)
+    await db.commit()
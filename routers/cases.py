@@ -1,17 +1,22 @@
 """
 Cases API Router — CRUD operations for case management.
 """
-import os
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from database import get_db
-from models import Case
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+
+import blob_store
+import view_cache
+from database import get_db, get_read_db
+from models import Case, Document, CalendarEvent
 from schemas import CaseCreate, CaseUpdate, CaseResponse, CaseDetailResponse
 
 router = APIRouter(prefix="/api/cases", tags=["Cases"])
 
+# What the detail response reads, as two batched SELECTs instead of lazy loads
+CASE_DETAIL_LOADS = (selectinload(Case.documents), selectinload(Case.calendar_events))
+
 
 @router.post("", response_model=CaseResponse, status_code=status.HTTP_201_CREATED)
 def create_case(payload: CaseCreate, db: Session = Depends(get_db)):
@@ -26,23 +31,34 @@ def create_case(payload: CaseCreate, db: Session = Depends(get_db)):
 @router.get("", response_model=list[CaseResponse])
 def list_cases(
     status_filter: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """List all cases, optionally filtered by status."""
     query = db.query(Case).order_by(Case.updated_at.desc())
     if status_filter:
         query = query.filter(Case.status == status_filter)
     cases = query.all()
-    return [_to_case_response(c) for c in cases]
+    doc_counts = _counts(db, Document, [c.id for c in cases])
+    event_counts = _counts(db, CalendarEvent, [c.id for c in cases])
+    return [
+        _to_case_response(c, doc_counts.get(c.id, 0), event_counts.get(c.id, 0))
+        for c in cases
+    ]
 
 
 @router.get("/{case_id}", response_model=CaseDetailResponse)
-def get_case(case_id: str, db: Session = Depends(get_db)):
-    """Get full case details including documents and calendar events."""
-    case = db.query(Case).filter(Case.id == case_id).first()
+def get_case(case_id: str, request: Request, db: Session = Depends(get_read_db)):
+    """
+    Get full case details including documents and calendar events.
+    Served from the view cache with an ETag (view_cache.py).
+    """
+    etag, cached = view_cache.lookup(request, "case_detail", case_id, view_cache.case_scopes(case_id))
+    if cached is not None:
+        return cached
+    case = db.query(Case).options(*CASE_DETAIL_LOADS).filter(Case.id == case_id).first()
     if not case:
         raise HTTPException(status_code=404, detail="Case not found.")
-    return _to_case_detail_response(case)
+    return view_cache.store(etag, _to_case_detail_response(case))
 
 
 @router.put("/{case_id}", response_model=CaseResponse)
@@ -68,11 +84,10 @@ def delete_case(case_id: str, db: Session = Depends(get_db)):
     if not case:
         raise HTTPException(status_code=404, detail="Case not found.")
 
-    # Also remove uploaded files from disk
-    uploads_dir = os.path.join("uploads", case_id)
-    if os.path.isdir(uploads_dir):
-        import shutil
-        shutil.rmtree(uploads_dir)
+    # Stored blobs lose the documents' references (and are collected once
+    # unreferenced); files from before the blob store are removed from disk
+    for doc in case.documents:
+        blob_store.discard_legacy(doc)
 
     db.delete(case)
     db.commit()
@@ -80,7 +95,24 @@ def delete_case(case_id: str, db: Session = Depends(get_db)):
 
 # ─── Helpers ──────────────────────────────────────────────────
 
-def _to_case_response(case: Case) -> CaseResponse:
+def _counts(db: Session, model, case_ids: list[str]) -> dict[str, int]:
+    """Rows of `model` per case, counted in SQL rather than by loading them."""
+    if not case_ids:
+        return {}
+    rows = (
+        db.query(model.case_id, func.count(model.id))
+        .filter(model.case_id.in_(case_ids))
+        .group_by(model.case_id)
+        .all()
+    )
+    return dict(rows)
+
+
+def _to_case_response(
+    case: Case,
+    document_count: Optional[int] = None,
+    event_count: Optional[int] = None,
+) -> CaseResponse:
     return CaseResponse(
         id=case.id,
         title=case.title,
@@ -89,10 +121,13 @@ def _to_case_response(case: Case) -> CaseResponse:
         court=case.court,
         status=case.status,
         description=case.description,
+        current_stage=case.current_stage,
+        law_code=case.law_code,
+        stage_date=case.stage_date,
         created_at=case.created_at,
         updated_at=case.updated_at,
-        document_count=len(case.documents),
-        event_count=len(case.calendar_events),
+        document_count=len(case.documents) if document_count is None else document_count,
+        event_count=len(case.calendar_events) if event_count is None else event_count,
     )
 
 
@@ -105,6 +140,9 @@ def _to_case_detail_response(case: Case) -> CaseDetailResponse:
         court=case.court,
         status=case.status,
         description=case.description,
+        current_stage=case.current_stage,
+        law_code=case.law_code,
+        stage_date=case.stage_date,
         created_at=case.created_at,
         updated_at=case.updated_at,
         document_count=len(case.documents),
@@ -0,0 +1,118 @@
+"""
+Cases API Router (async) — the routes of routers/cases.py on an
+AsyncSession, used when DATABASE_URL names an async driver (database.py).
+Relationships are loaded up front, never lazily.
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+import blob_store
+import view_cache
+from database import get_async_db, get_async_read_db
+from models import Case, Document, CalendarEvent
+from schemas import CaseCreate, CaseUpdate, CaseResponse, CaseDetailResponse
+from routers.cases import CASE_DETAIL_LOADS, _to_case_detail_response, _to_case_response
+
+router = APIRouter(prefix="/api/cases", tags=["Cases"])
+
+
+@router.post("", response_model=CaseResponse, status_code=status.HTTP_201_CREATED)
+async def create_case(payload: CaseCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new case."""
+    new_case = Case(**payload.model_dump())
+    db.add(new_case)
+    await db.commit()
+    await db.refresh(new_case)
+    return _to_case_response(new_case, 0, 0)
+
+
+@router.get("", response_model=list[CaseResponse])
+async def list_cases(
+    status_filter: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """List all cases, optionally filtered by status."""
+    query = select(Case).order_by(Case.updated_at.desc())
+    if status_filter:
+        query = query.where(Case.status == status_filter)
+    cases = (await db.scalars(query)).all()
+    doc_counts = await _counts(db, Document, [c.id for c in cases])
+    event_counts = await _counts(db, CalendarEvent, [c.id for c in cases])
+    return [
+        _to_case_response(c, doc_counts.get(c.id, 0), event_counts.get(c.id, 0))
+        for c in cases
+    ]
+
+
+@router.get("/{case_id}", response_model=CaseDetailResponse)
+async def get_case(case_id: str, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Get full case details including documents and calendar events.
+    Served from the view cache with an ETag (view_cache.py).
+    """
+    etag, cached = await run_in_threadpool(
+        view_cache.lookup, request, "case_detail", case_id, view_cache.case_scopes(case_id)
+    )
+    if cached is not None:
+        return cached
+    case = await db.scalar(select(Case).options(*CASE_DETAIL_LOADS).where(Case.id == case_id))
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found.")
+    return await run_in_threadpool(view_cache.store, etag, _to_case_detail_response(case))
+
+
+@router.put("/{case_id}", response_model=CaseResponse)
+async def update_case(case_id: str, payload: CaseUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update case metadata."""
+    case = await db.scalar(select(Case).where(Case.id == case_id))
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found.")
+
+    update_data = payload.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(case, field, value)
+
+    await db.commit()
+    await db.refresh(case)
+    doc_counts = await _counts(db, Document, [case.id])
+    event_counts = await _counts(db, CalendarEvent, [case.id])
+    return _to_case_response(case, doc_counts.get(case.id, 0), event_counts.get(case.id, 0))
+
+
+@router.delete("/{case_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_case(case_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Delete a case and all associated documents and events."""
+    # The delete cascades to both collections; load them now rather than lazily
+    case = await db.scalar(
+        select(Case)
+        .options(selectinload(Case.documents).selectinload(Document.transcript_segments),
+                 selectinload(Case.calendar_events))
+        .where(Case.id == case_id)
+    )
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found.")
+
+    # Stored blobs lose the documents' references; files from before the blob store are removed from disk
+    for doc in case.documents:
+        await run_in_threadpool(blob_store.discard_legacy, doc)
+
+    await db.delete(case)
+    await db.commit()
+
+
+# ─── Helpers ──────────────────────────────────────────────────
+
+async def _counts(db: AsyncSession, model, case_ids: list[str]) -> dict[str, int]:
+    """Rows of `model` per case, counted in SQL rather than by loading them."""
+    if not case_ids:
+        return {}
+    rows = await db.execute(
+        select(model.case_id, func.count(model.id))
+        .where(model.case_id.in_(case_ids))
+        .group_by(model.case_id)
+    )
+    return dict(rows.all())
@@ -0,0 +1,151 @@
+"""
+Deadlines API Router — statutory deadlines across all active cases.
+Computed in bulk from each case's current stage via the procedural rules table.
+"""
+from datetime import datetime, date, time, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, load_only
+
+import change_feed
+import view_cache
+from database import get_db, get_read_db
+from models import Case, CalendarEvent, generate_uuid
+from schemas import CaseDeadline, DeadlineReport, DeadlineSyncResult
+
+router = APIRouter(prefix="/api/deadlines", tags=["Deadlines"])
+
+# Marks the calendar events this sync manages
+TITLE_PREFIX = "Deadline: "
+
+
+@router.get("", response_model=DeadlineReport)
+def list_upcoming_deadlines(
+    within_days: int = Query(14, ge=0, le=3650),
+    as_of: Optional[date] = Query(None),
+    include_overdue: bool = Query(False),
+    db: Session = Depends(get_read_db),
+):
+    """List statutory deadlines falling due in the next `within_days` days across all active cases."""
+    today = as_of or date.today()
+    cases, resolved, unresolved = _compute_active_deadlines(db)
+
+    horizon = today + timedelta(days=within_days)
+    deadlines = []
+    for item in resolved:
+        due = item["deadline"]
+        if due > horizon or (due < today and not include_overdue):
+            continue
+        case = cases[item["key"]]
+        deadlines.append(CaseDeadline(
+            case_id=case.id,
+            case_title=case.title,
+            current_stage=case.current_stage,
+            law_code=case.law_code,
+            stage_date=item["stage_date"],
+            next_procedural_step=item["next_procedural_step"],
+            statutory_reference=item["statutory_reference"],
+            deadline=due,
+            extended_deadline=item["extended_deadline"],
+            days_remaining=(due - today).days,
+        ))
+    deadlines.sort(key=lambda d: d.deadline)
+
+    return DeadlineReport(
+        as_of=today,
+        window_days=within_days,
+        cases_scanned=len(cases),
+        deadlines=deadlines,
+        unresolved_case_ids=unresolved,
+    )
+
+
+@router.post("/sync", response_model=DeadlineSyncResult)
+def sync_deadline_events(db: Session = Depends(get_db)):
+    """
+    Keep one 'deadline' calendar event per active case, in one transaction.
+    The event follows the case: a new stage updates its title and date, and
+    it is removed once the case is closed or no longer has a known stage.
+    Only events written by this sync (titled "Deadline: ...") are touched;
+    deadline events added by hand are left alone.
+    """
+    cases, resolved, unresolved = _compute_active_deadlines(db)
+
+    managed = {}
+    stale = []
+    for event in (
+        db.query(CalendarEvent)
+        .options(load_only(CalendarEvent.id, CalendarEvent.case_id, CalendarEvent.title,
+                           CalendarEvent.event_date, CalendarEvent.description))
+        .filter(CalendarEvent.event_type == "deadline", CalendarEvent.title.startswith(TITLE_PREFIX))
+        .order_by(CalendarEvent.created_at)
+    ):
+        if event.case_id in managed:
+            stale.append(event)  # one per case; extras come from stage changes before this rule
+        else:
+            managed[event.case_id] = event
+
+    to_insert = []
+    updated = unchanged = 0
+    for item in resolved:
+        title = _deadline_title(item)
+        due_at = datetime.combine(item["deadline"], time(hour=10))
+        description = f"{item['statutory_reference']}. Outer limit: {item['extended_deadline'].isoformat()}."
+        event = managed.pop(item["key"], None)
+        if event is None:
+            to_insert.append({
+                "id": generate_uuid(),  # known up front for the change feed
+                "case_id": item["key"],
+                "title": title,
+                "event_type": "deadline",
+                "event_date": due_at,
+                "category": "court",
+                "description": description,
+            })
+        elif (event.title, event.event_date, event.description) != (title, due_at, description):
+            event.title, event.event_date, event.description = title, due_at, description
+            updated += 1
+        else:
+            unchanged += 1
+
+    # What is left belongs to cases without a deadline now
+    stale += managed.values()
+    for event in stale:
+        db.delete(event)
+    if to_insert:
+        db.execute(insert(CalendarEvent), to_insert)
+        change_feed.record(db, "event", [row["id"] for row in to_insert], [row["case_id"] for row in to_insert])
+        view_cache.touch(db, [row["case_id"] for row in to_insert], [row["event_date"] for row in to_insert])
+    db.commit()
+
+    return DeadlineSyncResult(
+        cases_scanned=len(cases),
+        created=len(to_insert),
+        updated=updated,
+        unchanged=unchanged,
+        removed=len(stale),
+        unresolved_case_ids=unresolved,
+    )
+
+
+# ─── Helpers ──────────────────────────────────────────────────
+
+def _compute_active_deadlines(db: Session):
+    rows = (
+        db.query(Case)
+        .options(load_only(Case.id, Case.title, Case.current_stage, Case.law_code, Case.stage_date))
+        .filter(Case.status == "active", Case.current_stage.isnot(None))
+        .all()
+    )
+    cases = {c.id: c for c in rows}
+    # Deferred: the engine pulls in numpy, which only this endpoint needs
+    from tools.deadline_engine import compute_bulk_deadlines
+    resolved, unresolved = compute_bulk_deadlines(
+        [(c.id, c.current_stage, c.law_code, c.stage_date) for c in rows]
+    )
+    return cases, resolved, unresolved
+
+
+def _deadline_title(item) -> str:
+    return f"{TITLE_PREFIX}{item['next_procedural_step']}"[:255]
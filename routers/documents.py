@@ -1,17 +1,21 @@
 """
 Documents API Router — File upload, listing, download, and deletion.
-Files are stored in uploads/{case_id}/ with UUID-based filenames.
+File contents go to the content-addressed blob store (blob_store.py);
+documents uploaded before it keep their files in uploads/{case_id}/.
+Each upload queues a preview of its content (preview.py).
 """
 import os
 import uuid
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Form
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, status, Form, Query
+from sqlalchemy.orm import Session, undefer_group
 
-from database import get_db
+import blob_store
+import preview
+import transcription
+from database import get_db, get_read_db
 from models import Document, Case
-from schemas import DocumentResponse, DocumentUpdate
+from schemas import DocumentResponse, DocumentDetailResponse, DocumentUpdate, TranscriptionStatus
 
 UPLOADS_DIR = "uploads"
 ALLOWED_EXTENSIONS = {
@@ -29,9 +33,43 @@ ALLOWED_EXTENSIONS = {
 
 router = APIRouter(tags=["Documents"])
 
+
+def _extension(file: UploadFile) -> str:
+    _, ext = os.path.splitext(file.filename or "")
+    ext = ext.lower()
+    if ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type '{ext}' not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
+        )
+    return ext
+
+
+def _save_upload(db: Session, file: UploadFile, case_id: Optional[str]) -> Document:
+    ext = _extension(file)
+    with blob_store.stage(file.file, ext) as staged:
+        key = blob_store.reserve(db, staged)
+        doc = Document(
+            case_id=case_id,
+            filename=f"{uuid.uuid4()}{ext}",
+            original_filename=file.filename or "unknown",
+            file_path=blob_store.PREFIX + key,
+            blob_sha256=staged.sha256,
+            file_type=ext.lstrip("."),
+            file_size=staged.size,
+        )
+        db.add(doc)
+        db.flush()  # takes the blob reference
+        blob_store.ensure(key, staged)
+        db.commit()
+    preview.request(db, doc)
+    db.refresh(doc)
+    return doc
+
+
 @router.get("/api/documents", response_model=list[DocumentResponse])
-def list_all_documents(db: Session = Depends(get_db)):
-    """List all documents globally, newest first."""
+def list_all_documents(db: Session = Depends(get_read_db)):
+    """List all documents globally, newest first (without transcript/summary text)."""
     docs = db.query(Document).order_by(Document.uploaded_at.desc()).all()
     return docs
 
@@ -50,39 +88,22 @@ def upload_global_document(
         case = db.query(Case).filter(Case.id == case_id).first()
         if not case:
             raise HTTPException(status_code=404, detail="Case not found.")
-
-    _, ext = os.path.splitext(file.filename or "")
-    ext = ext.lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File type '{ext}' not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
-        )
-
-    folder_name = case_id if case_id else "global"
-    upload_dir = os.path.join(UPLOADS_DIR, folder_name)
-    os.makedirs(upload_dir, exist_ok=True)
-
-    stored_filename = f"{uuid.uuid4()}{ext}"
-    file_path = os.path.join(upload_dir, stored_filename)
-
-    contents = file.file.read()
-    with open(file_path, "wb") as f:
-        f.write(contents)
-
-    doc = Document(
-        case_id=case_id,
-        filename=stored_filename,
-        original_filename=file.filename or "unknown",
-        file_path=file_path,
-        file_type=ext.lstrip("."),
-        file_size=len(contents),
+    return _save_upload(db, file, case_id)
+
+@router.get("/api/documents/{document_id}", response_model=DocumentDetailResponse)
+def get_document(document_id: str, db: Session = Depends(get_read_db)):
+    """Get a document including its full transcript and summary."""
+    doc = (
+        db.query(Document)
+        .options(undefer_group("content"))
+        .filter(Document.id == document_id)
+        .first()
     )
-    db.add(doc)
-    db.commit()
-    db.refresh(doc)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found.")
     return doc
 
+
 @router.patch("/api/documents/{document_id}", response_model=DocumentResponse)
 def update_document(
     document_id: str,
@@ -99,6 +120,11 @@ def update_document(
         if not case:
             raise HTTPException(status_code=404, detail="Case not found.")
         doc.case_id = update_data.case_id
+    # Setting either also refreshes the chars and preview that listings show (models.py)
+    if update_data.transcript is not None:
+        doc.transcript = update_data.transcript
+    if update_data.summary is not None:
+        doc.summary = update_data.summary
 
     db.commit()
     db.refresh(doc)
@@ -120,115 +146,70 @@ def upload_document(
     case = db.query(Case).filter(Case.id == case_id).first()
     if not case:
         raise HTTPException(status_code=404, detail="Case not found.")
-
-    # Validate file extension
-    _, ext = os.path.splitext(file.filename or "")
-    ext = ext.lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File type '{ext}' not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
-        )
-
-    # Create the upload directory for this case
-    case_upload_dir = os.path.join(UPLOADS_DIR, case_id)
-    os.makedirs(case_upload_dir, exist_ok=True)
-
-    # Generate a unique filename
-    stored_filename = f"{uuid.uuid4()}{ext}"
-    file_path = os.path.join(case_upload_dir, stored_filename)
-
-    # Write file to disk
-    contents = file.file.read()
-    with open(file_path, "wb") as f:
-        f.write(contents)
-
-    # Save metadata to DB
-    doc = Document(
-        case_id=case_id,
-        filename=stored_filename,
-        original_filename=file.filename or "unknown",
-        file_path=file_path,
-        file_type=ext.lstrip("."),
-        file_size=len(contents),
-    )
-    db.add(doc)
-    db.commit()
-    db.refresh(doc)
-    return doc
+    return _save_upload(db, file, case_id)
 
 
 @router.get("/api/cases/{case_id}/documents", response_model=list[DocumentResponse])
-def list_documents(case_id: str, db: Session = Depends(get_db)):
-    """List all documents for a specific case."""
-    case = db.query(Case).filter(Case.id == case_id).first()
-    if not case:
+def list_documents(case_id: str, db: Session = Depends(get_read_db)):
+    """List all documents for a specific case (without transcript/summary text)."""
+    if db.query(Case.id).filter(Case.id == case_id).first() is None:
         raise HTTPException(status_code=404, detail="Case not found.")
-    return case.documents
+    return db.query(Document).filter(Document.case_id == case_id).all()
 
 
-@router.patch("/api/documents/{document_id}/analyze", response_model=DocumentResponse)
+@router.patch(
+    "/api/documents/{document_id}/analyze",
+    response_model=TranscriptionStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 def analyze_document(
     document_id: str,
     db: Session = Depends(get_db),
 ):
-    """(Simulated) Generate transcript and summary for audio/video documents."""
+    """
+    Queue transcription and summary of an audio/video document and return
+    at once; poll GET /api/documents/{id}/transcription for progress and
+    segments, or follow /api/jobs/{job_id}/events.
+    """
     doc = db.query(Document).filter(Document.id == document_id).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found.")
 
-    if not doc.file_type or doc.file_type not in ["mp3", "wav", "m4a", "aac", "mp4", "mov", "avi", "mkv", "webm"]:
+    if not doc.file_type or doc.file_type not in transcription.MEDIA_TYPES:
         raise HTTPException(status_code=400, detail="Document format not supported for transcription.")
 
-    # -------------------------------------------------------------
-    # TODO: In production, integrate Audio/Speech-to-text API here.
-    # e.g., OpenAI Whisper + GPT-4o for summary.
-    # -------------------------------------------------------------
-    
-    simulated_transcript = '''[00:00:00] Speaker 1: "Okay, let's start the meeting. Can everyone hear me?"
-[00:00:05] Speaker 2: "Yes, loud and clear."
-[00:00:08] Speaker 1: "Great. So the purpose of this call is to review the recent case filings and discuss our strategy moving forward."
-[00:00:15] Speaker 2: "I've reviewed the documents, and I think we have a strong precedent to cite regarding the discovery requests. However, we need to file a motion to compel by next Friday."
-[00:00:25] Speaker 1: "Agreed. I'll draft the motion and send it to you for review by Wednesday."
-[00:00:30] Speaker 2: "Perfect. We also need to coordinate with the witnesses. I have their contact info here."
-[00:00:35] Speaker 1: "Okay, let's schedule out time to prep them on Monday."
-'''
-
-    simulated_summary = '''**Meeting Summary**
-- **Date:** {timestamp}
-- **Type:** Strategic Review Call
-
-**Key Discussion Points:**
-1. **Case Filings Review:** The team discussed recent case filings and concluded there is a strong precedent concerning discovery requests.
-2. **Motion to Compel:** A motion to compel must be filed by next Friday. Speaker 1 will prepare the initial draft by Wednesday for Speaker 2’s review.
-3. **Witness Preparation:** The team agreed to schedule witness preparation sessions for the upcoming Monday.
-
-**Action Items:**
-- [ ] Speaker 1: Draft Motion to Compel by Wednesday.
-- [ ] Speaker 2: Review Motion to Compel draft upon receipt.
-- [ ] Joint: Schedule and conduct witness preparation on Monday.
-'''.format(timestamp=doc.uploaded_at.strftime("%Y-%m-%d %H:%M:%S"))
-
-    doc.transcript = simulated_transcript
-    doc.summary = simulated_summary
-    
-    db.commit()
-    db.refresh(doc)
-    return doc
+    problem = transcription.backend_problem()
+    if problem:
+        raise HTTPException(status_code=503, detail=f"Transcription is not available on this server: {problem}")
+
+    transcription.request(db, doc)
+    return transcription.status(db, doc)
+
+
+@router.get("/api/documents/{document_id}/transcription", response_model=TranscriptionStatus)
+def get_transcription(
+    document_id: str,
+    after: int = -1,
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_read_db),
+):
+    """Transcription progress plus the segments after index `after` (for incremental polling)."""
+    doc = db.query(Document).filter(Document.id == document_id).first()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found.")
+    return transcription.status(db, doc, after=after, limit=limit)
+
 
 @router.get("/api/documents/{document_id}/download")
-def download_document(document_id: str, db: Session = Depends(get_db)):
+def download_document(document_id: str, request: Request, db: Session = Depends(get_read_db)):
     """Download a document by its ID."""
     doc = db.query(Document).filter(Document.id == document_id).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found.")
-    if not os.path.isfile(doc.file_path):
-        raise HTTPException(status_code=404, detail="File not found on disk.")
-    return FileResponse(
-        path=doc.file_path,
-        filename=doc.original_filename,
-        media_type="application/octet-stream",
-    )
+    try:
+        return blob_store.download(doc, request.headers.get("accept-encoding", ""))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found in storage.")
 
 
 @router.delete("/api/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -238,9 +219,9 @@ def delete_document(document_id: str, db: Session = Depends(get_db)):
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found.")
 
-    # Remove from disk
-    if os.path.isfile(doc.file_path):
-        os.remove(doc.file_path)
+    # A stored blob loses a reference (and is collected once unreferenced);
+    # a file from before the blob store is removed from disk
+    blob_store.discard_legacy(doc)
 
     db.delete(doc)
     db.commit()
@@ -0,0 +1,203 @@
+"""
+Documents API Router (async) — the routes of routers/documents.py on an
+AsyncSession, used when DATABASE_URL names an async driver (database.py).
+Blob store I/O runs in the threadpool; the blob bookkeeping and
+transcription, which are written against a sync Session, run through
+AsyncSession.run_sync.
+"""
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, status, Form, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, undefer_group
+
+import blob_store
+import preview
+import transcription
+from database import get_async_db, get_async_read_db
+from models import Document, Case
+from schemas import DocumentResponse, DocumentDetailResponse, DocumentUpdate, TranscriptionStatus
+from routers.documents import _extension
+
+router = APIRouter(tags=["Documents"])
+
+
+async def _case_exists(db: AsyncSession, case_id: str) -> bool:
+    return await db.scalar(select(Case.id).where(Case.id == case_id)) is not None
+
+
+async def _get_document(db: AsyncSession, document_id: str, *options) -> Document:
+    doc = await db.scalar(select(Document).options(*options).where(Document.id == document_id))
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found.")
+    return doc
+
+
+async def _save_upload(db: AsyncSession, file: UploadFile, case_id: Optional[str]) -> Document:
+    ext = _extension(file)
+    staging = blob_store.stage(file.file, ext)
+    staged = await run_in_threadpool(staging.__enter__)
+    try:
+        key = await db.run_sync(lambda session: blob_store.reserve(session, staged))
+        doc = Document(
+            case_id=case_id,
+            filename=f"{uuid.uuid4()}{ext}",
+            original_filename=file.filename or "unknown",
+            file_path=blob_store.PREFIX + key,
+            blob_sha256=staged.sha256,
+            file_type=ext.lstrip("."),
+            file_size=staged.size,
+        )
+        db.add(doc)
+        await db.flush()  # takes the blob reference
+        await run_in_threadpool(blob_store.ensure, key, staged)
+        await db.commit()
+    finally:
+        await run_in_threadpool(staging.__exit__, None, None, None)
+    await db.run_sync(lambda session: preview.request(session, doc))
+    await db.refresh(doc)
+    return doc
+
+
+@router.get("/api/documents", response_model=list[DocumentResponse])
+async def list_all_documents(db: AsyncSession = Depends(get_async_read_db)):
+    """List all documents globally, newest first (without transcript/summary text)."""
+    return (await db.scalars(select(Document).order_by(Document.uploaded_at.desc()))).all()
+
+
+@router.post(
+    "/api/documents",
+    response_model=DocumentResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_global_document(
+    file: UploadFile = File(...),
+    case_id: Optional[str] = Form(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Upload a document globally, optionally attaching it to a case."""
+    if case_id and not await _case_exists(db, case_id):
+        raise HTTPException(status_code=404, detail="Case not found.")
+    return await _save_upload(db, file, case_id)
+
+
+@router.get("/api/documents/{document_id}", response_model=DocumentDetailResponse)
+async def get_document(document_id: str, db: AsyncSession = Depends(get_async_read_db)):
+    """Get a document including its full transcript and summary."""
+    return await _get_document(db, document_id, undefer_group("content"))
+
+
+@router.patch("/api/documents/{document_id}", response_model=DocumentResponse)
+async def update_document(
+    document_id: str,
+    update_data: DocumentUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Update a document's metadata (e.g., case_id)."""
+    doc = await _get_document(db, document_id)
+
+    if update_data.case_id is not None:
+        if not await _case_exists(db, update_data.case_id):
+            raise HTTPException(status_code=404, detail="Case not found.")
+        doc.case_id = update_data.case_id
+    # Setting either also refreshes the chars and preview that listings show (models.py)
+    if update_data.transcript is not None:
+        doc.transcript = update_data.transcript
+    if update_data.summary is not None:
+        doc.summary = update_data.summary
+
+    await db.commit()
+    await db.refresh(doc)
+    return doc
+
+
+@router.post(
+    "/api/cases/{case_id}/documents",
+    response_model=DocumentResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_document(
+    case_id: str,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Upload a document to a specific case."""
+    if not await _case_exists(db, case_id):
+        raise HTTPException(status_code=404, detail="Case not found.")
+    return await _save_upload(db, file, case_id)
+
+
+@router.get("/api/cases/{case_id}/documents", response_model=list[DocumentResponse])
+async def list_documents(case_id: str, db: AsyncSession = Depends(get_async_read_db)):
+    """List all documents for a specific case (without transcript/summary text)."""
+    if not await _case_exists(db, case_id):
+        raise HTTPException(status_code=404, detail="Case not found.")
+    return (await db.scalars(select(Document).where(Document.case_id == case_id))).all()
+
+
+@router.patch(
+    "/api/documents/{document_id}/analyze",
+    response_model=TranscriptionStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def analyze_document(
+    document_id: str,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Queue transcription and summary of an audio/video document and return
+    at once; poll GET /api/documents/{id}/transcription for progress and
+    segments, or follow /api/jobs/{job_id}/events.
+    """
+    doc = await _get_document(db, document_id)
+
+    if not doc.file_type or doc.file_type not in transcription.MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Document format not supported for transcription.")
+
+    problem = transcription.backend_problem()
+    if problem:
+        raise HTTPException(status_code=503, detail=f"Transcription is not available on this server: {problem}")
+
+    def request(session):
+        transcription.request(session, doc)
+        session.refresh(doc)
+        return transcription.status(session, doc)
+
+    return await db.run_sync(request)
+
+
+@router.get("/api/documents/{document_id}/transcription", response_model=TranscriptionStatus)
+async def get_transcription(
+    document_id: str,
+    after: int = -1,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Transcription progress plus the segments after index `after` (for incremental polling)."""
+    doc = await _get_document(db, document_id)
+    return await db.run_sync(lambda session: transcription.status(session, doc, after=after, limit=limit))
+
+
+@router.get("/api/documents/{document_id}/download")
+async def download_document(document_id: str, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    """Download a document by its ID."""
+    doc = await _get_document(db, document_id)
+    try:
+        return await run_in_threadpool(blob_store.download, doc, request.headers.get("accept-encoding", ""))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found in storage.")
+
+
+@router.delete("/api/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_document(document_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Delete a document and remove the file from disk."""
+    # The delete cascades to the transcript segments; load them now rather than lazily
+    doc = await _get_document(db, document_id, selectinload(Document.transcript_segments))
+
+    # A stored blob loses a reference; a file from before the blob store is removed from disk
+    await run_in_threadpool(blob_store.discard_legacy, doc)
+
+    await db.delete(doc)
+    await db.commit()
@@ -0,0 +1,128 @@
+"""
+Jobs API Router — submit background work, poll its status, fetch its result,
+and follow its progress as a Server-Sent Events stream.
+"""
+import asyncio
+import json
+import time
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, undefer
+
+import jobs
+from database import ReadSessionLocal, get_db, get_read_db
+from models import Case, Job
+from schemas import JobCreate, JobResponse
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+# How often the event stream looks at the job, and how long it may stay silent
+SSE_POLL_S = 0.5
+SSE_KEEPALIVE_S = 15.0
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_job(payload: JobCreate, db: Session = Depends(get_db)):
+    """Queue a job of a public kind (document_analysis, adversarial_review, query)."""
+    kind = jobs.KINDS.get(payload.kind)
+    if kind is None or not kind.public:
+        public = sorted(name for name, k in jobs.KINDS.items() if k.public)
+        raise HTTPException(status_code=400, detail=f"Unknown job kind '{payload.kind}'. Allowed: {', '.join(public)}")
+    if payload.case_id and db.query(Case.id).filter(Case.id == payload.case_id).first() is None:
+        raise HTTPException(status_code=404, detail="Case not found.")
+    job_id = jobs.enqueue(payload.kind, payload.payload, priority=payload.priority, case_id=payload.case_id, db=db)
+    return db.get(Job, job_id)
+
+
+@router.get("", response_model=list[JobResponse])
+def list_jobs(
+    status_filter: Optional[str] = None,
+    case_id: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+):
+    """Recent jobs, newest first."""
+    query = db.query(Job).order_by(Job.created_at.desc())
+    if status_filter:
+        query = query.filter(Job.status == status_filter)
+    if case_id:
+        query = query.filter(Job.case_id == case_id)
+    return query.limit(limit).all()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, db: Session = Depends(get_read_db)):
+    """Status and progress of a job."""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str, db: Session = Depends(get_read_db)):
+    """The job's result once it has succeeded; 409 with its status until then."""
+    job = db.query(Job).options(undefer(Job.result)).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if job.status != jobs.SUCCEEDED:
+        raise HTTPException(status_code=409, detail={"status": job.status, "error": job.error})
+    return json.loads(job.result) if job.result else None
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+def cancel_job(job_id: str, db: Session = Depends(get_db)):
+    """Cancel a queued job, or ask a running one to stop at its next progress report."""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    jobs.request_cancel(db, job)
+    db.refresh(job)
+    return job
+
+
+def _snapshot(job_id: str) -> Optional[dict]:
+    db = ReadSessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        return JobResponse.model_validate(job).model_dump(mode="json") if job else None
+    finally:
+        db.close()
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """
+    Server-Sent Events: a `progress` event whenever the job's status,
+    progress or message changes, then one `done` event when it finishes.
+    """
+    if await run_in_threadpool(_snapshot, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    async def stream():
+        last = None
+        last_sent = time.monotonic()
+        while not await request.is_disconnected():
+            state = await run_in_threadpool(_snapshot, job_id)
+            if state is None:
+                yield "event: error\ndata: {\"detail\": \"Job not found.\"}\n\n"
+                return
+            finished = state["status"] in jobs.FINISHED
+            key = (state["status"], state["progress"], state["message"], state["attempts"])
+            if key != last:
+                last, last_sent = key, time.monotonic()
+                yield f"event: {'done' if finished else 'progress'}\ndata: {json.dumps(state)}\n\n"
+            elif time.monotonic() - last_sent >= SSE_KEEPALIVE_S:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            if finished:
+                return
+            await asyncio.sleep(SSE_POLL_S)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
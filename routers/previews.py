@@ -0,0 +1,18 @@
+"""
+Previews API Router — thumbnails, poster frames and waveform summaries of
+uploaded files (preview.py). Documents link here through `preview_url`.
+"""
+from fastapi import APIRouter, HTTPException
+
+import preview
+
+router = APIRouter(prefix="/api/previews", tags=["Documents"])
+
+
+@router.get("/{key}")
+def get_preview(key: str):
+    """A rendered preview; its URL never changes content, so browsers cache it for good."""
+    try:
+        return preview.serve(key)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Preview not found.")
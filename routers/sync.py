@@ -0,0 +1,106 @@
+"""
+Sync API Router — incremental sync of cases, documents and calendar events
+from the change feed (change_feed.py).
+
+    GET /api/sync                 snapshot of everything, plus a token
+    GET /api/sync?since=<token>   what changed after the token: current rows
+                                  for created or edited records, tombstones
+                                  for deleted ones, and the next token
+
+A client keeps the token from each response and sends it back next time.
+A 410 means the token is too old (its changes were pruned) or belongs to
+another database: drop local state and start again without `since`.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import change_feed
+from database import get_read_db
+from models import CalendarEvent, Case, Change, Document, utcnow
+from schemas import SyncResponse, SyncTombstone
+from routers.calendar import EVENT_LOADS, _to_event_response
+from routers.cases import _counts, _to_case_response
+
+router = APIRouter(prefix="/api/sync", tags=["Sync"])
+
+# Ids per IN (...) when fetching changed rows
+FETCH_CHUNK = 500
+
+
+@router.get("", response_model=SyncResponse)
+def sync(
+    since: Optional[str] = Query(None, description="Token from the previous response; omit for a full snapshot"),
+    limit: int = Query(1000, ge=1, le=5000, description="Most changes to apply per response"),
+    db: Session = Depends(get_read_db),
+):
+    """Changes to cases, documents and calendar events since `since`."""
+    oldest, newest = db.query(func.min(Change.id), func.max(Change.id)).one()
+    if since is None:
+        # Token first: a change landing during the snapshot is sent again next time, never lost
+        return _snapshot(db, newest or 0)
+
+    try:
+        after = int(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since must be a token from a previous sync.")
+    if after < 0 or after > (newest or 0) or (oldest is not None and after < oldest - 1):
+        raise HTTPException(status_code=410, detail="Sync token expired; sync again without since.")
+
+    query = db.query(Change).filter(Change.id > after).order_by(Change.id)
+    if change_feed.SETTLE_S:
+        query = query.filter(Change.changed_at <= utcnow() - timedelta(seconds=change_feed.SETTLE_S))
+    changes = query.limit(limit + 1).all()
+    more = len(changes) > limit
+    changes = changes[:limit]
+    if not changes:
+        return SyncResponse(token=str(after))
+
+    # Only the current state matters: the latest row, or a tombstone if it is gone
+    touched: Dict[str, Dict[str, None]] = defaultdict(dict)  # entity -> ids, in order
+    for change in changes:
+        touched[change.entity][change.entity_id] = None
+    cases = _fetch(db, Case, list(touched["case"]))
+    documents = _fetch(db, Document, list(touched["document"]))
+    events = _fetch(db, CalendarEvent, list(touched["event"]), *EVENT_LOADS)
+    present = {"case": {c.id for c in cases}, "document": {d.id for d in documents}, "event": {e.id for e in events}}
+    deleted = [
+        SyncTombstone(type=entity, id=entity_id)
+        for entity, ids in touched.items() for entity_id in ids if entity_id not in present[entity]
+    ]
+    return _response(db, str(changes[-1].id), cases, documents, events, more=more, deleted=deleted)
+
+
+# ─── Helpers ──────────────────────────────────────────────────
+
+def _fetch(db: Session, model, ids: List[str], *options) -> list:
+    rows = []
+    for i in range(0, len(ids), FETCH_CHUNK):
+        rows += db.query(model).options(*options).filter(model.id.in_(ids[i:i + FETCH_CHUNK])).all()
+    return rows
+
+
+def _snapshot(db: Session, token: int) -> SyncResponse:
+    return _response(
+        db, str(token),
+        db.query(Case).order_by(Case.updated_at.desc()).all(),
+        db.query(Document).order_by(Document.uploaded_at.desc()).all(),
+        db.query(CalendarEvent).options(*EVENT_LOADS).order_by(CalendarEvent.event_date.asc()).all(),
+        full=True,
+    )
+
+
+def _response(db: Session, token: str, cases, documents, events, **extra) -> SyncResponse:
+    case_ids = [c.id for c in cases]
+    doc_counts = _counts(db, Document, case_ids)
+    event_counts = _counts(db, CalendarEvent, case_ids)
+    return SyncResponse(
+        token=token,
+        cases=[_to_case_response(c, doc_counts.get(c.id, 0), event_counts.get(c.id, 0)) for c in cases],
+        documents=documents,
+        events=[_to_event_response(e) for e in events],
+        **extra,
+    )
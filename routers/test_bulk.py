@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+
+# A throwaway database and blob store; set before the app is imported
+_TMP = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/lawbot.db"
+os.environ["LAWBOT_BLOB_DIR"] = os.path.join(_TMP, "blobs")
+os.environ["LAWBOT_JOB_INLINE_WORKERS"] = "0"
+os.environ["LAWBOT_PREVIEWS"] = "0"
+os.environ["LAWBOT_ENV_OVERRIDE"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from database import engine  # noqa: E402
+from models import Base  # noqa: E402
+
+
+def test_import_rejects_paths_outside_uploads():
+    Base.metadata.create_all(bind=engine)
+    victim = os.path.join(_TMP, "victim.txt")
+    with open(victim, "w") as f:
+        f.write("TOP SECRET")
+    records = [
+        {"type": "document", "id": "x1", "original_filename": "a.txt", "file_path": victim},
+        {"type": "document", "id": "x2", "original_filename": "a.txt",
+         "file_path": os.path.join("uploads", os.path.relpath(victim, "uploads"))},
+        {"type": "document", "id": "x3", "original_filename": "a.txt", "file_path": "blob:" + "0" * 64 + "/../x"},
+    ]
+    with TestClient(main.app) as client:
+        response = client.post(
+            "/api/bulk/import", content="\n".join(json.dumps(r) for r in records),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert result["imported"]["document"] == 0
+        assert result["failed"] == 3
+        for doc_id in ("x1", "x2", "x3"):
+            assert client.get(f"/api/documents/{doc_id}/download").status_code == 404
+            assert client.delete(f"/api/documents/{doc_id}").status_code == 404
+    assert os.path.isfile(victim)
@@ -2,7 +2,7 @@
 Pydantic schemas for request/response validation.
 Covers Cases, Documents, and Calendar Events.
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field
 
@@ -16,6 +16,9 @@ class CaseCreate(BaseModel):
     court: Optional[str] = None
     status: str = Field(default="active", pattern="^(active|closed|pending)$")
     description: Optional[str] = None
+    current_stage: Optional[str] = Field(None, max_length=255)
+    law_code: Optional[str] = Field(None, max_length=50)
+    stage_date: Optional[datetime] = None
 
 
 class CaseUpdate(BaseModel):
@@ -25,6 +28,9 @@ class CaseUpdate(BaseModel):
     court: Optional[str] = None
     status: Optional[str] = Field(None, pattern="^(active|closed|pending)$")
     description: Optional[str] = None
+    current_stage: Optional[str] = Field(None, max_length=255)
+    law_code: Optional[str] = Field(None, max_length=50)
+    stage_date: Optional[datetime] = None
 
 
 class DocumentResponse(BaseModel):
@@ -35,13 +41,46 @@ class DocumentResponse(BaseModel):
     file_type: Optional[str]
     file_size: Optional[int]
     uploaded_at: datetime
+    # Listings carry only the size and first characters of the generated
+    # text; the full transcript and summary come from GET /api/documents/{id}.
+    transcript_chars: int = 0
+    summary_chars: int = 0
+    transcript_preview: Optional[str] = None
+    summary_preview: Optional[str] = None
+    transcript_status: Optional[str] = None
+    transcript_progress: Optional[float] = None
+    preview_url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DocumentDetailResponse(DocumentResponse):
     transcript: Optional[str] = None
     summary: Optional[str] = None
 
+
+class TranscriptSegmentResponse(BaseModel):
+    idx: int
+    start_s: float
+    end_s: float
+    text: str
+
     class Config:
         from_attributes = True
 
 
+class TranscriptionStatus(BaseModel):
+    document_id: str
+    job_id: Optional[str] = None          # follow it at /api/jobs/{job_id}/events
+    status: Optional[str] = None          # queued | running | done | failed
+    progress: Optional[float] = None      # 0..1; None while the duration is unknown
+    duration_s: Optional[float] = None
+    error: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    segments: List[TranscriptSegmentResponse] = []  # those after the `after` index requested
+
+
 class DocumentUpdate(BaseModel):
     case_id: Optional[str] = None
     transcript: Optional[str] = None
@@ -68,6 +107,9 @@ class CaseResponse(BaseModel):
     court: Optional[str]
     status: str
     description: Optional[str]
+    current_stage: Optional[str] = None
+    law_code: Optional[str] = None
+    stage_date: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     document_count: int = 0
@@ -82,6 +124,38 @@ class CaseDetailResponse(CaseResponse):
     calendar_events: List[CalendarEventBrief] = []
 
 
+# ─── Job Schemas ──────────────────────────────────────────────
+
+class JobCreate(BaseModel):
+    kind: str                              # document_analysis | adversarial_review | query
+    payload: dict = {}
+    case_id: Optional[str] = None
+    priority: int = 0
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str                            # queued | running | succeeded | failed | cancelled
+    priority: int
+    case_id: Optional[str] = None
+    document_id: Optional[str] = None
+    progress: Optional[float] = None
+    message: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool = False
+    run_after: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 # ─── Calendar Event Schemas ───────────────────────────────────
 
 class CalendarEventCreate(BaseModel):
@@ -122,3 +196,97 @@ class CalendarEventResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# ─── Deadline Schemas ─────────────────────────────────────────
+
+class CaseDeadline(BaseModel):
+    case_id: str
+    case_title: str
+    current_stage: str
+    law_code: str
+    stage_date: date
+    next_procedural_step: str
+    statutory_reference: str
+    deadline: date
+    extended_deadline: date
+    days_remaining: int
+
+
+class DeadlineReport(BaseModel):
+    as_of: date
+    window_days: int
+    cases_scanned: int
+    deadlines: List[CaseDeadline] = []
+    unresolved_case_ids: List[str] = []
+
+
+class DeadlineSyncResult(BaseModel):
+    cases_scanned: int
+    created: int
+    updated: int
+    unchanged: int
+    removed: int = 0
+    unresolved_case_ids: List[str] = []
+
+
+# ─── Bulk Import / Export Schemas ─────────────────────────────
+
+class CaseImport(CaseCreate):
+    id: Optional[str] = Field(None, min_length=1, max_length=64)  # keep an exported id
+    ref: Optional[str] = None              # the firm's own key, for case_ref on later rows
+    created_at: Optional[datetime] = None
+
+
+class CalendarEventImport(CalendarEventCreate):
+    id: Optional[str] = Field(None, min_length=1, max_length=64)
+    case_ref: Optional[str] = None         # ref of a case earlier in the same upload
+    created_at: Optional[datetime] = None
+
+
+class DocumentImport(BaseModel):
+    """A document record brought in by bulk import; the file is already at file_path (blob:<key> or under uploads/)."""
+    id: Optional[str] = Field(None, min_length=1, max_length=64)
+    case_id: Optional[str] = None
+    case_ref: Optional[str] = None
+    original_filename: str = Field(..., min_length=1, max_length=255)
+    file_path: str = Field(..., min_length=1, max_length=500)
+    filename: Optional[str] = Field(None, max_length=255)   # default: basename of file_path
+    file_type: Optional[str] = Field(None, max_length=50)   # default: file extension
+    file_size: Optional[int] = Field(None, ge=0)
+    uploaded_at: Optional[datetime] = None
+    transcript: Optional[str] = None
+    summary: Optional[str] = None
+
+
+class ImportRowError(BaseModel):
+    line: int                              # 1-based line (CSV: record) in the upload
+    type: Optional[str] = None             # case | event | document
+    error: str
+
+
+class BulkImportResult(BaseModel):
+    format: str                            # ndjson | csv
+    dry_run: bool = False
+    rows: int
+    imported: dict                         # record type -> rows written
+    failed: int
+    errors: List[ImportRowError] = []
+    errors_truncated: bool = False
+
+
+# ─── Sync Schemas ─────────────────────────────────────────────
+
+class SyncTombstone(BaseModel):
+    type: str                              # case | document | event
+    id: str
+
+
+class SyncResponse(BaseModel):
+    token: str                             # pass as ?since= on the next call
+    full: bool = False                     # a snapshot: replace everything held locally
+    more: bool = False                     # more changes wait; call again with `token`
+    cases: List[CaseResponse] = []
+    documents: List[DocumentResponse] = []
+    events: List[CalendarEventResponse] = []
+    deleted: List[SyncTombstone] = []
@@ -0,0 +1,219 @@
+"""
+Conversation sessions for follow-up queries.
+
+A session is keyed by the client's session id. It holds a running summary of older turns plus the most recent
+turns verbatim. After every turn the session is compacted: turns beyond the
+recent-turn token budget are folded into the summary, and the summary itself
+is trimmed to its own budget, so the context sent with a follow-up stays small
+no matter how long the conversation runs.
+
+Compaction is extractive (the leading sentence of each folded turn), so it is
+instant, costs no LLM call and cannot introduce statements nobody made.
+
+Sessions live in an in-memory LRU; set LAWBOT_SESSION_DB to a SQLite file
+path to also persist them across restarts and share them between workers.
+Every LAWBOT_SESSION_PURGE_EVERY saves, the store drops expired sessions from
+memory and from SQLite.
+
+Env:
+    LAWBOT_SESSION_CAPACITY=10000     sessions kept in memory
+    LAWBOT_SESSION_TTL_S=86400        idle time after which a session is forgotten
+    LAWBOT_SESSION_DB=                optional SQLite file for persistence
+    LAWBOT_SESSION_PURGE_EVERY=500    saves between purges of expired sessions
+    LAWBOT_SESSION_RECENT_TOKENS=600  budget for verbatim recent turns
+    LAWBOT_SESSION_SUMMARY_TOKENS=300 budget for the running summary
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+CAPACITY = int(os.environ.get("LAWBOT_SESSION_CAPACITY", "10000"))
+TTL_S = float(os.environ.get("LAWBOT_SESSION_TTL_S", str(24 * 3600)))
+SESSION_DB = os.environ.get("LAWBOT_SESSION_DB", "")
+PURGE_EVERY = int(os.environ.get("LAWBOT_SESSION_PURGE_EVERY", "500"))
+RECENT_TOKENS = int(os.environ.get("LAWBOT_SESSION_RECENT_TOKENS", "600"))
+SUMMARY_TOKENS = int(os.environ.get("LAWBOT_SESSION_SUMMARY_TOKENS", "300"))
+# Recent turns are never folded below this many, whatever their size
+MIN_RECENT_TURNS = 2
+# Longest text kept for a single turn before it is even considered for the context
+MAX_TURN_CHARS = 2000
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English legal text)."""
+    return (len(text or "") + 3) // 4
+
+
+def _lead_sentence(text: str, max_chars: int = 200) -> str:
+    first = _SENTENCE_RE.split((text or "").strip(), maxsplit=1)[0]
+    return first if len(first) <= max_chars else first[: max_chars - 1].rstrip() + "…"
+
+
+@dataclass
+class Session:
+    key: str
+    summary: str = ""
+    turns: List[Dict[str, str]] = field(default_factory=list)
+    updated_at: float = field(default_factory=time.time)
+
+    def add_turn(self, user: str, assistant: str) -> None:
+        self.turns.append({"user": (user or "")[:MAX_TURN_CHARS], "assistant": (assistant or "")[:MAX_TURN_CHARS]})
+        self.updated_at = time.time()
+        self.compact()
+
+    def compact(self, recent_tokens: int = RECENT_TOKENS, summary_tokens: int = SUMMARY_TOKENS) -> None:
+        """Fold the oldest turns into the summary until both fit their budgets."""
+        while len(self.turns) > MIN_RECENT_TURNS and self._recent_tokens() > recent_tokens:
+            turn = self.turns.pop(0)
+            line = f"User asked: {_lead_sentence(turn['user'])} Answer: {_lead_sentence(turn['assistant'])}"
+            self.summary = f"{self.summary}\n{line}".strip()
+        # Oldest summary lines go first; they matter least to a follow-up
+        lines = self.summary.splitlines()
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > summary_tokens:
+            lines.pop(0)
+        self.summary = "\n".join(lines)
+
+    def _recent_tokens(self) -> int:
+        return sum(estimate_tokens(t["user"]) + estimate_tokens(t["assistant"]) for t in self.turns)
+
+    def context(self) -> str:
+        """Prompt-ready context for the next query; empty for a new session."""
+        parts = []
+        if self.summary:
+            parts.append(f"Earlier in this conversation:\n{self.summary}")
+        if self.turns:
+            recent = "\n".join(f"User: {t['user']}\nAssistant: {t['assistant']}" for t in self.turns)
+            parts.append(f"Most recent turns:\n{recent}")
+        return "\n\n".join(parts)
+
+
+class SessionStore:
+    def __init__(self, capacity: int = CAPACITY, ttl_s: float = TTL_S, db_path: str = SESSION_DB):
+        self.capacity = capacity
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._saves = 0
+        if db_path:
+            self._db = self._open(db_path)
+
+    @staticmethod
+    def _open(db_path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA busy_timeout=5000")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "key TEXT PRIMARY KEY, summary TEXT NOT NULL, turns TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        return db
+
+    def reopen(self) -> None:
+        """New SQLite connection, e.g. in a worker forked after the store was created."""
+        if self.db_path:
+            with self._lock:
+                self._db = self._open(self.db_path)
+
+    def get(self, key: str) -> Session:
+        """
+        The session for `key`; a fresh one if none or expired. With SQLite
+        configured the row is the source of truth (another worker may have
+        answered the previous turn), otherwise the in-memory LRU is.
+        """
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(key) if self._db is None else None
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT summary, turns, updated_at FROM sessions WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    session = Session(key, row[0], json.loads(row[1]), row[2])
+            if session is None or now - session.updated_at > self.ttl_s:
+                session = Session(key)
+            self._remember(session)
+            return session
+
+    def save(self, session: Session) -> None:
+        with self._lock:
+            self._remember(session)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO sessions (key, summary, turns, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET summary = excluded.summary, "
+                    "turns = excluded.turns, updated_at = excluded.updated_at",
+                    (session.key, session.summary, json.dumps(session.turns), session.updated_at),
+                )
+            self._saves += 1
+            purge = PURGE_EVERY > 0 and self._saves % PURGE_EVERY == 0
+        if purge:
+            self.purge_expired()
+
+    def record_turn(self, key: str, user: str, assistant: str) -> Session:
+        """Append a turn, compact, and persist."""
+        session = self.get(key)
+        session.add_turn(user, assistant)
+        self.save(session)
+        return session
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._sessions.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def _remember(self, session: Session) -> None:
+        # Caller holds the lock
+        self._sessions[session.key] = session
+        self._sessions.move_to_end(session.key)
+        while len(self._sessions) > self.capacity:
+            self._sessions.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Drop idle sessions from memory and SQLite; returns how many left memory."""
+        cutoff = time.time() - self.ttl_s
+        with self._lock:
+            stale = [k for k, s in self._sessions.items() if s.updated_at < cutoff]
+            for k in stale:
+                del self._sessions[k]
+            if self._db is not None:
+                self._db.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,))
+        return len(stale)
+
+
+def describe_response(response: Dict) -> str:
+    """Short text of what the assistant returned, as stored in the session."""
+    route = response.get("route")
+    result = response.get("result")
+    if response.get("error") or response.get("message"):
+        return response.get("error") or response.get("message")
+    if isinstance(result, dict):
+        for key in ("answer", "summary", "next_procedural_step", "response_message"):
+            if isinstance(result.get(key), str) and result[key]:
+                return result[key]
+        if isinstance(result.get("flagged_issues"), list):
+            issues = [i.get("type", "") for i in result["flagged_issues"] if isinstance(i, dict)]
+            return f"Flagged {len(issues)} issues in the draft: " + "; ".join(issues)
+        return json.dumps(result, ensure_ascii=False)[:500]
+    if isinstance(result, list):
+        titles = [str(r.get("title", "")) for r in result[:5] if isinstance(r, dict)]
+        source = "Indian Kanoon" if route == "legal_search" else "the web"
+        return f"Found {len(result)} results on {source}: " + "; ".join(t for t in titles if t)
+    if route == "multi_tool":
+        parts = [describe_response({"route": o.get("tool"), "result": o.get("result")})
+                 for o in (response.get("results") or {}).values() if o.get("status") == "ok"]
+        return " ".join(parts)
+    return ""
+
+
+store = SessionStore()
@@ -0,0 +1,263 @@
+"""
+Result cache shared by every worker process.
+
+Router decisions, Kanoon and SerpAPI search results and LLM answers are
+cached by a hash of the normalized input; view_cache.py keeps the case
+detail and calendar responses here too. With LAWBOT_CACHE_DB pointing at a
+SQLite file (WAL mode), all workers of a multi-process deployment read and
+fill the same cache, so adding workers adds throughput without multiplying
+upstream calls. Without it the cache is an in-memory SQLite database private
+to the process.
+
+Concurrent misses on one key are coalesced: threads within a worker wait on
+a per-key lock, and across workers the first to miss takes a short lease row
+while the others poll for its result (up to LAWBOT_CACHE_WAIT_S, never past
+the request's time budget) instead of calling the upstream themselves.
+
+Answers produced by a fallback (circuit_breaker.note_fallback) are never
+cached. Per the Kanoon SOP, queries themselves are not stored: keys are
+SHA-256 hashes and only the results are kept.
+
+Env:
+    LAWBOT_CACHE=1                 0 disables result caching
+    LAWBOT_CACHE_DB=               SQLite file shared by workers (default: per-process memory)
+    LAWBOT_CACHE_MAX_ROWS=50000    entries kept before the soonest-expiring are evicted
+    LAWBOT_CACHE_WAIT_S=10         longest wait for another worker computing the same key
+    LAWBOT_CACHE_<NS>_TTL_S        per-namespace lifetime (ROUTE, KANOON, SERP, LLM, VIEW)
+"""
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from telemetry import count
+from request_budget import upstream_timeout
+
+CACHE_ENABLED = os.environ.get("LAWBOT_CACHE", "1") != "0"
+CACHE_DB = os.environ.get("LAWBOT_CACHE_DB", "")
+MAX_ROWS = int(os.environ.get("LAWBOT_CACHE_MAX_ROWS", "50000"))
+WAIT_S = float(os.environ.get("LAWBOT_CACHE_WAIT_S", "10"))
+POLL_S = 0.05
+
+TTLS = {
+    "route": float(os.environ.get("LAWBOT_CACHE_ROUTE_TTL_S", "3600")),
+    "kanoon": float(os.environ.get("LAWBOT_CACHE_KANOON_TTL_S", str(24 * 3600))),
+    "serp": float(os.environ.get("LAWBOT_CACHE_SERP_TTL_S", "3600")),
+    "llm": float(os.environ.get("LAWBOT_CACHE_LLM_TTL_S", "3600")),
+    "view": float(os.environ.get("LAWBOT_CACHE_VIEW_TTL_S", "600")),
+}
+
+_SPACE_RE = re.compile(r"\s+")
+
+# Set by mark_uncacheable() while a cached function runs
+_uncacheable: contextvars.ContextVar[Optional[List[bool]]] = contextvars.ContextVar("lawbot_uncacheable", default=None)
+
+
+def normalize(text: Optional[str]) -> str:
+    """Case- and whitespace-insensitive form of a query, for cache keys."""
+    return _SPACE_RE.sub(" ", (text or "").strip().lower()).rstrip("?.! ")
+
+
+def mark_uncacheable() -> None:
+    """Keep the result of the cached call in progress (if any) out of the cache."""
+    flag = _uncacheable.get()
+    if flag is not None:
+        flag[0] = True
+
+
+def _hash_key(namespace: str, parts: Any) -> str:
+    raw = json.dumps([namespace, parts], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SharedCache:
+    def __init__(self, path: str = CACHE_DB, max_rows: int = MAX_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        self._local = threading.local()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_guard = threading.Lock()
+        self._writes = 0
+        self._owner_pid: Optional[int] = None
+        self._keeper: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.path:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        else:
+            # Named shared-cache memory DB: one per process, visible to all its threads
+            uri = f"file:lawbot-cache-{os.getpid()}-{id(self)}?mode=memory&cache=shared"
+            conn = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, ns TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        # Connections never cross a fork: a worker forked from a preloaded
+        # master opens its own on first use.
+        pid = os.getpid()
+        if self._owner_pid != pid:
+            with self._key_locks_guard:
+                if self._owner_pid != pid:
+                    self._local = threading.local()
+                    self._key_locks = {}
+                    self._keeper = None if self.path else self._connect()
+                    self._owner_pid = pid
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def get(self, namespace: str, parts: Any) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (_hash_key(namespace, parts), time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, parts: Any, value: Any, ttl_s: Optional[float] = None) -> bool:
+        """Store a JSON-serializable value; returns False if it is not serializable."""
+        try:
+            encoded = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return False
+        ttl = ttl_s if ttl_s is not None else TTLS.get(namespace, 3600)
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, ns, value, expires_at) VALUES (?, ?, ?, ?)",
+            (_hash_key(namespace, parts), namespace, encoded, time.time() + ttl),
+        )
+        self._writes += 1
+        if self._writes % 256 == 0:
+            self.purge()
+        return True
+
+    def purge(self) -> None:
+        """Drop expired entries and leases, then the soonest-expiring rows beyond max_rows."""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        conn.execute("DELETE FROM leases WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        conn = self._conn()
+        if namespace is None:
+            conn.execute("DELETE FROM entries")
+        else:
+            conn.execute("DELETE FROM entries WHERE ns = ?", (namespace,))
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._key_locks_guard:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                if len(self._key_locks) > 4096:
+                    self._key_locks = {k: v for k, v in self._key_locks.items() if v.locked()}
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def get_or_compute(self, namespace: str, parts: Any, compute: Callable[[], Any],
+                       ttl_s: Optional[float] = None) -> Any:
+        """
+        The cached value, or `compute()`'s result stored for next time.
+        Concurrent callers for the same key, in this process or another,
+        wait for the first one rather than repeating the computation.
+        A cache that is locked or broken degrades to calling `compute()`.
+        """
+        cached = self._safe(namespace, self.get, namespace, parts)
+        if cached is not None:
+            count("lawbot_cache_total", cache=namespace, result="hit")
+            return cached
+        key = _hash_key(namespace, parts)
+        with self._key_lock(key):
+            cached = self._safe(namespace, self.get, namespace, parts)
+            if cached is not None:
+                count("lawbot_cache_total", cache=namespace, result="hit")
+                return cached
+            leased = not self.path or self._safe(namespace, self._acquire_lease, key, default=True)
+            if not leased:
+                cached = self._safe(namespace, self._wait_for, namespace, parts, key)
+                if cached is not None:
+                    count("lawbot_cache_total", cache=namespace, result="shared_hit")
+                    return cached
+            count("lawbot_cache_total", cache=namespace, result="miss")
+            flag = [False]
+            token = _uncacheable.set(flag)
+            try:
+                value = compute()
+            finally:
+                _uncacheable.reset(token)
+                if self.path and leased:
+                    self._safe(namespace, self._release_lease, key)
+            if value is not None and not flag[0]:
+                self._safe(namespace, self.set, namespace, parts, value, ttl_s)
+            return value
+
+    @staticmethod
+    def _safe(namespace: str, fn: Callable[..., Any], *args, default: Any = None) -> Any:
+        try:
+            return fn(*args)
+        except sqlite3.Error:
+            count("lawbot_cache_total", cache=namespace, result="error")
+            return default
+
+    def _acquire_lease(self, key: str) -> bool:
+        now = time.time()
+        conn = self._conn()
+        conn.execute("DELETE FROM leases WHERE key = ? AND expires_at <= ?", (key, now))
+        return conn.execute(
+            "INSERT OR IGNORE INTO leases (key, expires_at) VALUES (?, ?)", (key, now + WAIT_S)
+        ).rowcount == 1
+
+    def _release_lease(self, key: str) -> None:
+        self._conn().execute("DELETE FROM leases WHERE key = ?", (key,))
+
+    def _wait_for(self, namespace: str, parts: Any, key: str) -> Optional[Any]:
+        """Poll for another worker's result until it lands, its lease ends, or our wait is up."""
+        deadline = time.monotonic() + upstream_timeout(WAIT_S)
+        conn = self._conn()
+        while time.monotonic() < deadline:
+            time.sleep(POLL_S)
+            cached = self.get(namespace, parts)
+            if cached is not None:
+                return cached
+            if conn.execute("SELECT 1 FROM leases WHERE key = ?", (key,)).fetchone() is None:
+                # The owner failed or its result was uncacheable; compute ourselves
+                return self.get(namespace, parts)
+        return None
+
+
+def cached(namespace: str, key: Callable[..., Any], ttl_s: Optional[float] = None):
+    """
+    Cache a function's results in the shared cache. `key` receives the
+    function's arguments and returns the JSON-serializable key parts, or
+    None to bypass the cache for that call (e.g. a follow-up with context).
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            parts = key(*args, **kwargs) if CACHE_ENABLED else None
+            if parts is None:
+                return fn(*args, **kwargs)
+            return cache.get_or_compute(namespace, parts, lambda: fn(*args, **kwargs), ttl_s)
+        wrapper.uncached = fn
+        return wrapper
+    return decorate
+
+
+cache = SharedCache()
@@ -0,0 +1,247 @@
+"""
+Lightweight in-process metrics and span timing for YuktiAI.
+Exposes Prometheus text format via render_prometheus() and, optionally,
+one structured JSON log line per span.
+
+Env:
+    LAWBOT_METRICS=0      disable all recording (span() becomes a no-op)
+    LAWBOT_JSON_LOGS=1    emit a JSON log line for every finished span (and log_event)
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, Tuple, Optional
+
+from request_budget import current_budget
+
+METRICS_ENABLED = os.environ.get("LAWBOT_METRICS", "1") != "0"
+JSON_LOGS = os.environ.get("LAWBOT_JSON_LOGS", "0") == "1"
+
+# Seconds. Upstream LLM calls regularly take several seconds, so the tail is wide.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+QUANTILES = (0.5, 0.95, 0.99)
+RESERVOIR_SIZE = 2048
+
+logger = logging.getLogger("lawbot.trace")
+
+trace_id_var: ContextVar[Optional[str]] = ContextVar("lawbot_trace_id", default=None)
+
+_NOOP = nullcontext()
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count", "recent")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        # Recent observations for p50/p95/p99; bounded so memory stays flat.
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantiles(self) -> Dict[float, float]:
+        if not self.recent:
+            return {}
+        ordered = sorted(self.recent)
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(round(q * last)))] for q in QUANTILES}
+
+
+class Registry:
+    """Thread-safe store for counters and histograms keyed by (name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {}
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def describe(self, name: str, text: str) -> None:
+        self._help[name] = text
+
+    def inc(self, name: str, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram()
+            hist.observe(value)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Plain-dict view (counters, gauges and histogram quantiles) for JSON consumers."""
+        with self._lock:
+            out = {
+                "counters": {n: {_fmt(k): v for k, v in s.items()} for n, s in self._counters.items()},
+                "gauges": {n: {_fmt(k): v for k, v in s.items()} for n, s in self._gauges.items()},
+                "histograms": {},
+            }
+            for name, series in self._histograms.items():
+                out["histograms"][name] = {
+                    _fmt(k): {
+                        "count": h.count,
+                        "sum": round(h.total, 6),
+                        **{f"p{int(q * 100)}": round(v, 6) for q, v in h.quantiles().items()},
+                    }
+                    for k, h in series.items()
+                }
+            return out
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                self._header(lines, name, "counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_fmt(key)} {value:g}")
+            for name, series in sorted(self._gauges.items()):
+                self._header(lines, name, "gauge")
+                for key, value in series.items():
+                    lines.append(f"{name}{_fmt(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                self._header(lines, name, "histogram")
+                for key, hist in series.items():
+                    running = 0
+                    for bound, bucket_count in zip(BUCKETS + (float("inf"),), hist.counts):
+                        running += bucket_count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{name}_bucket{_fmt(key + (('le', le),))} {running}")
+                    lines.append(f"{name}_sum{_fmt(key)} {hist.total:.6f}")
+                    lines.append(f"{name}_count{_fmt(key)} {hist.count}")
+                # Quantiles go in a separate summary-style family so the
+                # histogram above stays valid Prometheus exposition.
+                qname = f"{name}_quantile"
+                lines.append(f"# TYPE {qname} gauge")
+                for key, hist in series.items():
+                    for q, value in hist.quantiles().items():
+                        lines.append(f"{qname}{_fmt(key + (('quantile', f'{q:g}'),))} {value:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines, name: str, kind: str) -> None:
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._gauges.clear()
+
+
+def _fmt(key: LabelKey) -> str:
+    if not key:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in key)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+registry = Registry()
+registry.describe("lawbot_span_duration_seconds", "Wall time of traced spans (router, tools, upstream calls).")
+registry.describe("lawbot_span_errors_total", "Spans that finished by raising an exception.")
+registry.describe("lawbot_query_duration_seconds", "End-to-end /api/query latency by resolved route.")
+registry.describe("lawbot_upstream_retries_total", "Retries issued against an upstream service.")
+registry.describe("lawbot_request_cancelled_total", "Queries cancelled before completion (client went away).")
+
+
+@contextmanager
+def _span(name: str, labels: Dict[str, str]):
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        budget = current_budget.get()
+        if budget is not None:
+            stage = labels.get("tool") or labels.get("upstream")
+            budget.record(f"{name}:{stage}" if stage else name, elapsed, error)
+        if METRICS_ENABLED:
+            registry.observe("lawbot_span_duration_seconds", elapsed, span=name, **labels)
+            if error:
+                registry.inc("lawbot_span_errors_total", span=name, error=error, **labels)
+            log_event("span", span=name, duration_ms=round(elapsed * 1000, 3), error=error, **labels)
+
+
+def span(name: str, **labels):
+    """
+    Time a block of work:
+
+        with span("upstream", upstream="kanoon"):
+            requests.post(...)
+
+    Spans inside a request budget are also added to its stage breakdown.
+    Returns a shared no-op context when metrics are disabled and no budget
+    is active.
+    """
+    if not METRICS_ENABLED and current_budget.get() is None:
+        return _NOOP
+    return _span(name, labels)
+
+
+def log_event(event: str, **fields) -> None:
+    """One structured JSON log line, tagged with the current trace id (LAWBOT_JSON_LOGS=1 only)."""
+    if JSON_LOGS:
+        logger.info(json.dumps({"event": event, "trace_id": trace_id_var.get(), **fields}, default=str))
+
+
+def count(name: str, amount: float = 1.0, **labels) -> None:
+    if METRICS_ENABLED:
+        registry.inc(name, amount, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    if METRICS_ENABLED:
+        registry.observe(name, value, **labels)
+
+
+def gauge(name: str, value: float, **labels) -> None:
+    if METRICS_ENABLED:
+        registry.set(name, value, **labels)
+
+
+def new_trace_id() -> str:
+    trace_id = uuid.uuid4().hex[:16]
+    trace_id_var.set(trace_id)
+    return trace_id
+
+
+def render_prometheus() -> str:
+    return registry.render_prometheus()
@@ -1,11 +1,14 @@
 import os
 import json
 from typing import Dict, Any, List
-from dotenv import load_dotenv
-from openai import OpenAI
+
+from bootstrap import load_env, openai_client
+from telemetry import span
+from circuit_breaker import CircuitOpen, breaker
+from request_budget import BudgetExceeded
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 class APIKeyError(Exception):
     """Raised when the OpenAI API key is missing."""
@@ -44,7 +47,7 @@ def analyze_draft(draft_text: str, document_type: str, jurisdiction: str) -> Dic
             "message": "Document does not appear to be a legal draft."
         }
 
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
 
     # Define the strict JSON schema for the expected output
     response_format = {
@@ -109,20 +112,23 @@ def analyze_draft(draft_text: str, document_type: str, jurisdiction: str) -> Dic
     """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06", # Structured outputs supported
-            temperature=0.2, # Low temperature for deterministic analysis
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Please review the following draft:\n\n{draft_text}"}
-            ],
-            response_format=response_format
-        )
+        with breaker("openai").guard(), span("upstream", upstream="openai", op="adversarial_engine"):
+            response = client.chat.completions.create(
+                model="gpt-4o-2024-08-06", # Structured outputs supported
+                temperature=0.2, # Low temperature for deterministic analysis
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"Please review the following draft:\n\n{draft_text}"}
+                ],
+                response_format=response_format
+            )
         
         # The response is guaranteed to match our schema
         json_response = json.loads(response.choices[0].message.content)
         return json_response
 
+    except (CircuitOpen, BudgetExceeded):
+        raise
     except Exception as e:
         raise LLMExecutionError(f"Failed to execute LLM analysis: {str(e)}")
 
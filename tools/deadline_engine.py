@@ -0,0 +1,66 @@
+from datetime import date
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tools.procedural_rules import lookup_rule, CLOSED_WEEKDAYS, COURT_HOLIDAYS
+
+# numpy weekmask is Monday-first, 1 = court open
+_WEEKMASK = [0 if i in CLOSED_WEEKDAYS else 1 for i in range(7)]
+_HOLIDAYS = np.array(sorted(COURT_HOLIDAYS), dtype="datetime64[D]")
+
+
+def _roll_to_open_day(days: np.ndarray, extends: np.ndarray) -> np.ndarray:
+    """
+    Section 4, Limitation Act: a period ending on a closed day runs to the
+    next open day, where `extends` is set (not for custody and remand periods).
+    """
+    rolled = np.busday_offset(days, 0, roll="forward", weekmask=_WEEKMASK, holidays=_HOLIDAYS)
+    return np.where(extends, rolled, days)
+
+
+def compute_bulk_deadlines(
+    rows: Sequence[Tuple[Any, Optional[str], Optional[str], Optional[date]]],
+) -> Tuple[List[Dict[str, Any]], List[Any]]:
+    """
+    Compute statutory deadlines for many matters in one vectorized pass.
+
+    Args:
+        rows: (key, current_stage, law_code, stage_date) per matter.
+
+    Returns:
+        (resolved, unresolved_keys). Each resolved dict carries the key, the
+        matching rule fields, and 'deadline' / 'extended_deadline' dates.
+        Matters with no stage/date, or a stage the rules table does not know,
+        are returned as unresolved rather than sent to the LLM.
+    """
+    matched: List[Tuple[Any, Dict[str, Any], date]] = []
+    unresolved: List[Any] = []
+    for key, stage, code, started in rows:
+        rule = lookup_rule(stage, code) if stage and code and started else None
+        if rule and rule.get("timeline_days"):
+            matched.append((key, rule, date.fromisoformat(started.isoformat()[:10])))
+        else:
+            unresolved.append(key)
+
+    if not matched:
+        return [], unresolved
+
+    starts = np.array([r[2] for r in matched], dtype="datetime64[D]")
+    base_days = np.array([r[1]["timeline_days"] for r in matched], dtype="int64")
+    max_days = np.maximum(
+        base_days,
+        np.array([r[1].get("max_extension_days") or 0 for r in matched], dtype="int64"),
+    )
+
+    extends = np.array([r[1].get("extends_on_court_holiday", True) for r in matched], dtype=bool)
+
+    deadlines = _roll_to_open_day(starts + base_days.astype("timedelta64[D]"), extends)
+    extended = _roll_to_open_day(starts + max_days.astype("timedelta64[D]"), extends)
+
+    resolved = []
+    for (key, rule, started), due, outer in zip(matched, deadlines.tolist(), extended.tolist()):
+        out = dict(rule)
+        out.update({"key": key, "stage_date": started, "deadline": due, "extended_deadline": outer})
+        resolved.append(out)
+    return resolved, unresolved
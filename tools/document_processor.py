@@ -1,10 +1,14 @@
 import os
 import json
-from dotenv import load_dotenv
-from openai import OpenAI
+
+from bootstrap import load_env, openai_client
+from telemetry import span
+from circuit_breaker import CircuitOpen, breaker, note_fallback
+from request_budget import BudgetExceeded
+from lawbot_runtime.tools.summarize_doc import summarize_doc
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 class ProcessorError(Exception):
     """Raised when the Document Processor fails."""
@@ -34,7 +38,7 @@ def process_legal_document(document_text: str, document_type: str = "legal_docum
     if not api_key:
         raise ProcessorError("OPENAI_API_KEY is missing for Document Processor.")
 
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
 
     # Define the strict JSON schema for the output
     response_format = {
@@ -104,22 +108,43 @@ def process_legal_document(document_text: str, document_type: str = "legal_docum
     """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            temperature=0.0, # Zero creativity to prevent hallucinations
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Document Text to Analyze:\n\n{document_text}"}
-            ],
-            response_format=response_format
-        )
+        with breaker("openai").guard(), span("upstream", upstream="openai", op="document_processor"):
+            response = client.chat.completions.create(
+                model="gpt-4o-2024-08-06",
+                temperature=0.0, # Zero creativity to prevent hallucinations
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"Document Text to Analyze:\n\n{document_text}"}
+                ],
+                response_format=response_format
+            )
         
         raw_output = response.choices[0].message.content
         return json.loads(raw_output)
         
+    except CircuitOpen:
+        return _extractive_analysis(document_text)
+    except BudgetExceeded:
+        raise
     except Exception as e:
         raise ProcessorError(f"LLM processing failed: {str(e)}")
 
+
+def _extractive_analysis(document_text: str) -> dict:
+    """
+    Answer while the LLM is unavailable: an extractive summary sliced from the
+    text itself (summarize_doc), with no timeline and zero confidence.
+    """
+    note_fallback("openai", "extractive_summary")
+    sections = summarize_doc(document_text)
+    sentences = [s for key in ("facts", "issues", "reasoning") for s in sections[key]]
+    return {
+        "summary": " ".join(sentences),
+        "timeline": [],
+        "confidence_score": 0,
+        "abstentions": ["AI analysis temporarily unavailable; summary is extracted verbatim from the document."]
+    }
+
 if __name__ == "__main__":
     # Internal Test
     test_doc = """
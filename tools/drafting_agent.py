@@ -1,9 +1,12 @@
 import os
 import json
-from openai import OpenAI
-from dotenv import load_dotenv
 
-load_dotenv()
+from bootstrap import load_env, openai_client
+from telemetry import span
+from circuit_breaker import CircuitOpen, breaker
+from request_budget import BudgetExceeded
+
+load_env()
 
 def generate_draft(prompt: str) -> dict:
     """
@@ -15,7 +18,7 @@ def generate_draft(prompt: str) -> dict:
     if not api_key:
         return {"error": "OPENAI_API_KEY is missing."}
 
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
 
     response_format = {
         "type": "json_schema",
@@ -70,18 +73,21 @@ def generate_draft(prompt: str) -> dict:
     """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            temperature=0.2, # Low temperature for reliable legal formats
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            response_format=response_format
-        )
+        with breaker("openai").guard(), span("upstream", upstream="openai", op="drafting_agent"):
+            response = client.chat.completions.create(
+                model="gpt-4o-2024-08-06",
+                temperature=0.2, # Low temperature for reliable legal formats
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format=response_format
+            )
         
         return json.loads(response.choices[0].message.content)
         
+    except (CircuitOpen, BudgetExceeded):
+        raise
     except Exception as e:
         return {"error": f"Drafting LLM execution failed: {str(e)}"}
 
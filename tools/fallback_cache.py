@@ -0,0 +1,127 @@
+"""
+Last-good results of the search upstreams (Indian Kanoon, SerpAPI), served
+only when the upstream itself is unavailable (circuit open).
+
+A repeated query is answered from its stored result, however old up to
+LAWBOT_STALE_MAX_AGE_S. Any other query is answered from a small inverted
+index over the titles and snippets of every stored document, i.e. a local
+search over what the service has already seen.
+
+Per the Kanoon SOP, user queries are never stored: entries are keyed by a
+hash of the normalized query, and only the (public) returned documents are
+kept. Everything lives in process memory.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_ENTRIES = int(os.getenv("LAWBOT_STALE_CACHE_ENTRIES", "1024"))
+MAX_DOCS = int(os.getenv("LAWBOT_STALE_CACHE_DOCS", "20000"))
+MAX_AGE_S = float(os.getenv("LAWBOT_STALE_MAX_AGE_S", str(7 * 24 * 3600)))
+STALE_CACHE_ENABLED = os.getenv("LAWBOT_STALE_CACHE", "1") != "0"
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("the and for with under from that this what which case cases law judgment judgments".split())
+
+
+def _tokens(text: str) -> List[str]:
+    words = _WORD_RE.findall(_TAG_RE.sub(" ", text or "").lower())
+    return [w for w in words if (len(w) > 2 or w.isdigit()) and w not in _STOPWORDS]
+
+
+def _key(query: str, *extra: Any) -> Tuple:
+    normalized = " ".join(_tokens(query)) or (query or "").strip().lower()
+    return (hashlib.sha256(normalized.encode("utf-8")).hexdigest(),) + extra
+
+
+class FallbackCache:
+    def __init__(self, id_field: str, text_fields: Tuple[str, ...] = ("title", "snippet"),
+                 max_entries: int = MAX_ENTRIES, max_docs: int = MAX_DOCS, max_age_s: float = MAX_AGE_S):
+        self.id_field = id_field
+        self.text_fields = text_fields
+        self.max_entries = max_entries
+        self.max_docs = max_docs
+        self.max_age_s = max_age_s
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._docs: "OrderedDict[str, Tuple[Dict[str, Any], frozenset]]" = OrderedDict()
+        self._postings: Dict[str, set] = {}
+
+    def put(self, query: str, results: List[Dict[str, Any]], *extra: Any) -> None:
+        """Remember a successful result and index its documents."""
+        if not STALE_CACHE_ENABLED:
+            return
+        key = _key(query, *extra)
+        with self._lock:
+            self._entries[key] = (time.time(), results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            for doc in results:
+                self._index(doc)
+
+    def _index(self, doc: Dict[str, Any]) -> None:
+        # Caller holds the lock
+        doc_id = doc.get(self.id_field)
+        if not doc_id:
+            return
+        if doc_id in self._docs:
+            self._docs.move_to_end(doc_id)
+            return
+        tokens = frozenset(t for field in self.text_fields for t in _tokens(str(doc.get(field, ""))))
+        self._docs[doc_id] = (doc, tokens)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(doc_id)
+        while len(self._docs) > self.max_docs:
+            old_id, (_, old_tokens) = self._docs.popitem(last=False)
+            for token in old_tokens:
+                ids = self._postings.get(token)
+                if ids is not None:
+                    ids.discard(old_id)
+                    if not ids:
+                        del self._postings[token]
+
+    def get(self, query: str, *extra: Any) -> Optional[List[Dict[str, Any]]]:
+        """The stored result for this exact (normalized) query, if not too old."""
+        with self._lock:
+            hit = self._entries.get(_key(query, *extra))
+        if hit is None or time.time() - hit[0] > self.max_age_s:
+            return None
+        return hit[1]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank stored documents by how many of the query's terms they contain.
+        At least half the terms must match; ties go to the most recently seen.
+        """
+        terms = set(_tokens(query))
+        if not terms:
+            return []
+        needed = max(1, (len(terms) + 1) // 2)
+        with self._lock:
+            scores: Dict[str, int] = {}
+            for term in terms:
+                for doc_id in self._postings.get(term, ()):
+                    scores[doc_id] = scores.get(doc_id, 0) + 1
+            recency = {doc_id: i for i, doc_id in enumerate(self._docs)}
+            ranked = sorted(
+                (doc_id for doc_id, score in scores.items() if score >= needed),
+                key=lambda d: (scores[d], recency[d]),
+                reverse=True,
+            )
+            return [self._docs[doc_id][0] for doc_id in ranked[:limit]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._docs.clear()
+            self._postings.clear()
+
+
+kanoon_cache = FallbackCache(id_field="doc_id")
+serp_cache = FallbackCache(id_field="link")
@@ -1,15 +1,21 @@
 import os
 import json
-from dotenv import load_dotenv
-from openai import OpenAI
+from typing import Optional
 
-load_dotenv()
+from bootstrap import load_env, openai_client
+from telemetry import span
+from circuit_breaker import CircuitOpen, breaker
+from request_budget import BudgetExceeded
+from shared_cache import cached, normalize
+
+load_env()
 
 class ChatError(Exception):
     """Raised when the General Chat LLM fails."""
     pass
 
-def general_chat(query: str) -> dict:
+@cached("llm", key=lambda query, context=None: None if context else ["general_chat", normalize(query)])
+def general_chat(query: str, context: Optional[str] = None) -> dict:
     """
     Conversational legal Q&A powered by GPT-4o.
     Handles explanations, interpretations, tactical advice, hallucination traps,
@@ -17,6 +23,7 @@ def general_chat(query: str) -> dict:
     
     Args:
         query (str): The user's natural language legal question.
+        context (str): Optional compacted conversation so far, for follow-up questions.
         
     Returns:
         dict: A structured response with 'answer', 'citations', 'confidence', and 'abstentions'.
@@ -25,7 +32,7 @@ def general_chat(query: str) -> dict:
     if not api_key:
         raise ChatError("OPENAI_API_KEY is missing for General Chat.")
 
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
 
     response_format = {
         "type": "json_schema",
@@ -103,19 +110,24 @@ def general_chat(query: str) -> dict:
        bullet points for lists, and headers (##) for sections when the answer is long.
     """
 
+    messages = [{"role": "system", "content": system_prompt}]
+    if context:
+        messages.append({"role": "system", "content": f"Conversation so far (the user may be following up on it):\n{context}"})
+    messages.append({"role": "user", "content": query})
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            temperature=0.1,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": query}
-            ],
-            response_format=response_format
-        )
+        with breaker("openai").guard(), span("upstream", upstream="openai", op="general_chat"):
+            response = client.chat.completions.create(
+                model="gpt-4o-2024-08-06",
+                temperature=0.1,
+                messages=messages,
+                response_format=response_format
+            )
         
         return json.loads(response.choices[0].message.content)
 
+    except (CircuitOpen, BudgetExceeded):
+        raise
     except Exception as e:
         raise ChatError(f"General Chat LLM failed: {str(e)}")
 
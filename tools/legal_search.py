@@ -1,11 +1,17 @@
 import os
 import time
 import requests
-from typing import List, Dict, Any
-from dotenv import load_dotenv
+from typing import List, Dict, Any, Optional
+
+from bootstrap import load_env
+from telemetry import span, count
+from request_budget import upstream_timeout, budget_allows
+from circuit_breaker import CircuitOpen, breaker, note_fallback
+from tools.fallback_cache import kanoon_cache
+from shared_cache import cached, normalize
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 class AuthError(Exception):
     """Raised when API authorization fails."""
@@ -15,6 +21,7 @@ class APIError(Exception):
     """Raised when the API returns an unexpected error."""
     pass
 
+@cached("kanoon", key=lambda query, pagenum=0: [normalize(query), pagenum])
 def legal_search(query: str, pagenum: int = 0) -> List[Dict[str, Any]]:
     """
     Search Indian Kanoon for legal documents based on a query.
@@ -29,12 +36,15 @@ def legal_search(query: str, pagenum: int = 0) -> List[Dict[str, Any]]:
     Raises:
         AuthError: If the INDIAN_KANOON_TOKEN is missing or invalid.
         APIError: If the API returns an unexpected error or times out.
+        CircuitOpen: If Kanoon is unavailable and nothing similar has been seen before.
     """
     token = os.getenv("INDIAN_KANOON_TOKEN")
     if not token:
         raise AuthError("INDIAN_KANOON_TOKEN is not set in the environment.")
 
-    url = "https://api.indiankanoon.org/search/"
+    # Overridable so load tests can point at a local stand-in server
+    base_url = os.getenv("INDIAN_KANOON_BASE_URL", "https://api.indiankanoon.org").rstrip("/")
+    url = f"{base_url}/search/"
     headers = {
         "Authorization": f"Token {token}"
     }
@@ -45,11 +55,19 @@ def legal_search(query: str, pagenum: int = 0) -> List[Dict[str, Any]]:
 
     max_retries = 3
     retry_delay = 1 # Initial delay for exponential backoff
+    kanoon = breaker("kanoon")
 
     for attempt in range(max_retries):
+        # 15 second timeout as per SOP, cut short by the request's remaining budget
+        timeout = upstream_timeout(15)
+        try:
+            kanoon.allow()
+        except CircuitOpen:
+            return _search_fallback(query, pagenum)
         try:
-            # 15 second timeout as per SOP
-            response = requests.post(url, headers=headers, data=payload, timeout=15)
+            with span("upstream", upstream="kanoon", op="search"):
+                response = requests.post(url, headers=headers, data=payload, timeout=timeout)
+            kanoon.record_status(response.status_code)
             
             if response.status_code == 200:
                 data = response.json()
@@ -65,29 +83,61 @@ def legal_search(query: str, pagenum: int = 0) -> List[Dict[str, Any]]:
                         "docsource": doc.get("docsource", ""),
                         "url": f"https://indiankanoon.org/doc/{doc.get('tid')}/" if doc.get("tid") else ""
                     })
+                kanoon_cache.put(query, results, pagenum)
                 return results
 
             elif response.status_code == 403:
                 raise AuthError("Authorization failed. Ensure your Kanoon API token is valid.")
             
             elif response.status_code == 429:
-                if attempt < max_retries - 1:
+                if attempt < max_retries - 1 and budget_allows(retry_delay):
+                    count("lawbot_upstream_retries_total", upstream="kanoon", reason="429")
                     time.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
                     continue
                 else:
-                    raise APIError("Rate limit exceeded (429) and max retries reached.")
+                    raise APIError("Rate limit exceeded (429) and max retries or request budget reached.")
             
             else:
                 raise APIError(f"Unexpected API response {response.status_code}: {response.text}")
 
         except requests.exceptions.Timeout:
-            raise APIError("The Indian Kanoon API request timed out after 15 seconds.")
+            kanoon.record(False)
+            cached = _cached_results(query, pagenum)
+            if cached is not None:
+                return cached
+            raise APIError(f"The Indian Kanoon API request timed out after {timeout:g} seconds.")
         except requests.exceptions.RequestException as e:
+            kanoon.record(False)
+            cached = _cached_results(query, pagenum)
+            if cached is not None:
+                return cached
             raise APIError(f"A network error occurred: {str(e)}")
 
     return []
 
+
+def _cached_results(query: str, pagenum: int) -> Optional[List[Dict[str, Any]]]:
+    """Earlier Kanoon results for when the API is unreachable: same query first, then the local index."""
+    cached = kanoon_cache.get(query, pagenum)
+    if cached is not None:
+        note_fallback("kanoon", "stale_cache")
+        return cached
+    if pagenum == 0:
+        local = kanoon_cache.search(query)
+        if local:
+            note_fallback("kanoon", "local_index")
+            return local
+    return None
+
+
+def _search_fallback(query: str, pagenum: int) -> List[Dict[str, Any]]:
+    """Fast-fail path while the circuit is open."""
+    cached = _cached_results(query, pagenum)
+    if cached is None:
+        raise CircuitOpen("kanoon", breaker("kanoon").retry_after())
+    return cached
+
 if __name__ == "__main__":
     # Simple self-test
     try:
@@ -1,10 +1,15 @@
 import os
 import json
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
-from openai import OpenAI
 
-load_dotenv()
+from bootstrap import load_env, openai_client
+from telemetry import span
+from circuit_breaker import CircuitOpen, breaker, note_fallback
+from request_budget import BudgetExceeded
+from shared_cache import cached, normalize
+from tools.procedural_rules import lookup_rule, legacy_map, with_deadlines
+
+load_env()
 
 class APIKeyError(Exception):
     pass
@@ -13,66 +18,40 @@ class LLMExecutionError(Exception):
     pass
 
 
-# MVP Hardcoded Logic Core for common Indian procedural steps
-PROCEDURAL_MAP = {
-    "cpc": {
-        "summons received": {
-            "current_stage": "Summons received",
-            "next_procedural_step": "Filing of Written Statement",
-            "timeline_days": 30,
-            "max_extension_days": 120,
-            "statutory_reference": "Order VIII Rule 1, Civil Procedure Code (CPC)",
-            "confidence": "High (Hardcoded)"
-        },
-        "issues framed": {
-            "current_stage": "Issues framed by Court",
-            "next_procedural_step": "Filing list of witnesses & Evidence Affidavits",
-            "timeline_days": 15,
-            "max_extension_days": 15,
-            "statutory_reference": "Order XVI Rule 1, Civil Procedure Code (CPC)",
-            "confidence": "High (Hardcoded)"
-        }
-    },
-    "crpc": {
-        "fir registered": {
-            "current_stage": "FIR Registered",
-            "next_procedural_step": "Investigation by Police and Filing of Charge Sheet",
-            "timeline_days": 60,
-            "max_extension_days": 90, # 90 for severe offenses
-            "statutory_reference": "Section 167(2), Code of Criminal Procedure (CrPC)",
-            "confidence": "High (Hardcoded)"
-        }
-    }
-}
+# Deterministic core: the rules table in tools/data/procedural_rules.json,
+# exposed in its original {code: {stage: details}} shape for callers that
+# still read it directly.
+PROCEDURAL_MAP = legacy_map()
 
 
-def get_procedural_timeline(case_stage: str, law_code: str) -> Dict[str, Any]:
+@cached("llm", key=lambda case_stage, law_code, start_date=None: [
+    "procedural", normalize(case_stage), normalize(law_code), start_date])
+def get_procedural_timeline(case_stage: str, law_code: str, start_date: Optional[str] = None) -> Dict[str, Any]:
     """
     Map out procedural timelines and limitations under Indian Law.
     
     Args:
         case_stage (str): The current event (e.g., "Summons received").
         law_code (str): The applicable code ("CPC", "CrPC", "BNSS", etc).
+        start_date (str): Optional ISO date of the triggering event. When given,
+            table answers include 'deadline' and 'extended_deadline' computed
+            against the court-holiday calendar.
         
     Returns:
         Dict: A structured procedural mapping.
     """
     
-    # 1. Check Hardcoded Core first (Deterministic Safety)
-    law_code_key = law_code.lower()
-    stage_key = case_stage.lower()
-    
-    if law_code_key in PROCEDURAL_MAP:
-        for known_stage, details in PROCEDURAL_MAP[law_code_key].items():
-            if known_stage in stage_key or stage_key in known_stage:
-                return details
+    # 1. Check the rules table first (Deterministic Safety)
+    details = lookup_rule(case_stage, law_code)
+    if details:
+        return with_deadlines(details, start_date) if start_date else details
 
     # 2. If not found, use LLM augmentation
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise APIKeyError("OPENAI_API_KEY is not set in the environment.")
         
-    client = OpenAI(api_key=api_key)
+    client = openai_client(api_key)
 
     response_format = {
         "type": "json_schema",
@@ -104,22 +83,46 @@ def get_procedural_timeline(case_stage: str, law_code: str) -> Dict[str, Any]:
     """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            temperature=0.0, # Zero creativity required here
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"What is the limitation/timeline and next step for: {case_stage}?"}
-            ],
-            response_format=response_format
-        )
+        with breaker("openai").guard(), span("upstream", upstream="openai", op="procedural_navigator"):
+            response = client.chat.completions.create(
+                model="gpt-4o-2024-08-06",
+                temperature=0.0, # Zero creativity required here
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"What is the limitation/timeline and next step for: {case_stage}?"}
+                ],
+                response_format=response_format
+            )
         
         return json.loads(response.choices[0].message.content)
         
+    except CircuitOpen:
+        return _rules_only_answer(case_stage, law_code)
+    except BudgetExceeded:
+        raise
     except Exception as e:
         raise LLMExecutionError(f"Failed to execute Procedural LLM: {str(e)}")
 
 
+def _rules_only_answer(case_stage: str, law_code: str) -> Dict[str, Any]:
+    """
+    Answer while the LLM is unavailable: retry the rules table across every
+    code (the stage may be filed under another act), otherwise abstain.
+    """
+    note_fallback("openai", "rules_table")
+    details = lookup_rule(case_stage, "limitation")
+    if details:
+        return details
+    return {
+        "current_stage": case_stage,
+        "next_procedural_step": f"Not in the verified rules table for {law_code}; AI lookup is temporarily unavailable. Consult the statute directly.",
+        "timeline_days": 0,
+        "max_extension_days": 0,
+        "statutory_reference": "",
+        "confidence": "Abstain (LLM Unsure)"
+    }
+
+
 if __name__ == "__main__":
     # Self-test logic
     try:
@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import difflib
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Any, Optional, Iterable
+
+_DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# Extra rule tables / court calendars can be dropped in without code changes.
+RULES_PATH = os.getenv("PROCEDURAL_RULES_PATH", os.path.join(_DATA_DIR, "procedural_rules.json"))
+HOLIDAYS_PATH = os.getenv("COURT_HOLIDAYS_PATH", os.path.join(_DATA_DIR, "court_holidays.json"))
+
+# Fuzzy matches below this ratio are treated as misses. Kept high on purpose:
+# a wrong limitation period is worse than falling through to the LLM.
+FUZZY_CUTOFF = 0.85
+
+RULE_FIELDS = (
+    "current_stage",
+    "next_procedural_step",
+    "timeline_days",
+    "max_extension_days",
+    "statutory_reference",
+)
+
+_WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+class RulesTableError(Exception):
+    """Raised when a procedural rules or holiday table is malformed."""
+    pass
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace ('Cr.P.C.' -> 'cr p c')."""
+    return _NON_WORD_RE.sub(" ", (text or "").lower()).strip()
+
+
+def _load_json(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise RulesTableError(f"Could not load table {path}: {e}")
+
+
+def _compile_rules(table: Dict[str, Any]):
+    """
+    Build the lookup structures once:
+      code_index:  normalized code alias -> canonical code
+      stage_index: canonical code -> {normalized stage alias -> rule}
+    """
+    code_index: Dict[str, str] = {}
+    for code, aliases in table.get("codes", {}).items():
+        for alias in [code] + list(aliases):
+            code_index[normalize(alias)] = code
+
+    stage_index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for raw in table.get("rules", []):
+        missing = [f for f in ("code", "stage") + RULE_FIELDS if f not in raw]
+        if missing:
+            raise RulesTableError(f"Rule {raw.get('stage')!r} is missing fields: {', '.join(missing)}")
+        rule = {f: raw[f] for f in RULE_FIELDS}
+        # Custody, remand and notice periods run out on the day whether or not the court sits
+        rule["extends_on_court_holiday"] = bool(raw.get("extends_on_court_holiday", True))
+        rule["confidence"] = "High (Hardcoded)"
+        code = raw["code"]
+        code_index.setdefault(normalize(code), code)
+        bucket = stage_index.setdefault(code, {})
+        for alias in [raw["stage"]] + list(raw.get("aliases", [])):
+            bucket[normalize(alias)] = rule
+    return code_index, stage_index
+
+
+def _load_holidays(table: Dict[str, Any]):
+    closed = set()
+    for day in table.get("closed_weekdays", []):
+        if day.lower() not in _WEEKDAYS:
+            raise RulesTableError(f"Unknown weekday in holiday table: {day}")
+        closed.add(_WEEKDAYS.index(day.lower()))
+    holidays = set()
+    for value in table.get("holidays", []):
+        try:
+            holidays.add(date.fromisoformat(value))
+        except ValueError:
+            raise RulesTableError(f"Invalid holiday date: {value}")
+    return frozenset(closed), frozenset(holidays)
+
+
+CODE_INDEX, STAGE_INDEX = _compile_rules(_load_json(RULES_PATH))
+CLOSED_WEEKDAYS, COURT_HOLIDAYS = _load_holidays(_load_json(HOLIDAYS_PATH))
+
+# The Limitation Act is the source of most periods, so a question framed under
+# it is answered from every table rather than a single code.
+_ALL_CODES = "limitation"
+
+
+def resolve_code(law_code: str) -> Optional[str]:
+    """Map a free-text law code ('Cr.P.C.', 'Code of Civil Procedure') to its table key."""
+    return CODE_INDEX.get(normalize(law_code))
+
+
+def _candidates(code: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    if code == _ALL_CODES:
+        merged: Dict[str, Dict[str, Any]] = {}
+        for bucket in STAGE_INDEX.values():
+            merged.update(bucket)
+        return merged
+    return STAGE_INDEX.get(code, {})
+
+
+@lru_cache(maxsize=4096)
+def _lookup(stage_key: str, code: Optional[str]) -> Optional[Dict[str, Any]]:
+    candidates = _candidates(code)
+    if not candidates or not stage_key:
+        return None
+
+    # 1. Exact alias
+    if stage_key in candidates:
+        return candidates[stage_key]
+
+    # 2. Containment on word boundaries (the original PROCEDURAL_MAP
+    #    behaviour). The longest alias inside the stage wins, so
+    #    "commercial suit summons received" beats "summons received".
+    padded = f" {stage_key} "
+    within = [a for a in candidates if f" {a} " in padded]
+    if within:
+        return candidates[max(within, key=len)]
+    containing = [a for a in candidates if padded in f" {a} "]
+    if containing:
+        return candidates[min(containing, key=len)]
+
+    # 3. Conservative fuzzy match for typos and word-order noise
+    close = difflib.get_close_matches(stage_key, list(candidates), n=1, cutoff=FUZZY_CUTOFF)
+    if close:
+        return candidates[close[0]]
+    return None
+
+
+def lookup_rule(case_stage: str, law_code: str) -> Optional[Dict[str, Any]]:
+    """
+    Deterministic lookup of the next procedural step for a stage under a code.
+    Returns a copy of the matching rule, or None on a miss.
+    """
+    rule = _lookup(normalize(case_stage), resolve_code(law_code))
+    return dict(rule) if rule else None
+
+
+def is_court_closed(day: date, holidays: Optional[Iterable[date]] = None) -> bool:
+    if day.weekday() in CLOSED_WEEKDAYS:
+        return True
+    return day in (COURT_HOLIDAYS if holidays is None else holidays)
+
+
+def compute_deadline(
+    start, days: int, holidays: Optional[Iterable[date]] = None, extends_on_court_holiday: bool = True,
+) -> date:
+    """
+    Last day to act when a period of `days` runs from `start`.
+
+    The day of the triggering event is excluded (Section 12, Limitation Act),
+    and a period expiring on a day the court is closed extends to the day it
+    reopens (Section 4, Limitation Act) unless `extends_on_court_holiday` is
+    False, as for custody and remand periods.
+    """
+    if isinstance(start, datetime):
+        start = start.date()
+    elif isinstance(start, str):
+        start = date.fromisoformat(start[:10])
+    if holidays is not None:
+        holidays = frozenset(holidays)
+
+    deadline = start + timedelta(days=int(days))
+    while extends_on_court_holiday and is_court_closed(deadline, holidays):
+        deadline += timedelta(days=1)
+    return deadline
+
+
+def with_deadlines(rule: Dict[str, Any], start, holidays: Optional[Iterable[date]] = None) -> Dict[str, Any]:
+    """Return the rule with 'deadline' and 'extended_deadline' dates filled in."""
+    out = dict(rule)
+    if out.get("timeline_days"):
+        extends = out.get("extends_on_court_holiday", True)
+        out["deadline"] = compute_deadline(start, out["timeline_days"], holidays, extends).isoformat()
+        out["extended_deadline"] = compute_deadline(
+            start, max(out["timeline_days"], out.get("max_extension_days") or 0), holidays, extends
+        ).isoformat()
+    return out
+
+
+def legacy_map() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """The table in the old PROCEDURAL_MAP shape: {code: {stage: details}}."""
+    out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for code, bucket in STAGE_INDEX.items():
+        seen = set()
+        for alias, rule in bucket.items():
+            if id(rule) not in seen:
+                seen.add(id(rule))
+                out.setdefault(code, {})[alias] = rule
+    return out
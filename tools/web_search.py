@@ -1,10 +1,16 @@
 import os
 import requests
 from typing import List, Dict, Any
-from dotenv import load_dotenv
+
+from bootstrap import load_env
+from telemetry import span
+from request_budget import upstream_timeout
+from circuit_breaker import CircuitOpen, breaker, note_fallback
+from tools.fallback_cache import serp_cache
+from shared_cache import cached, normalize
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 class AuthError(Exception):
     """Raised when API authorization fails."""
@@ -14,6 +20,7 @@ class APIError(Exception):
     """Raised when the API returns an unexpected error."""
     pass
 
+@cached("serp", key=lambda query, num_results=3: [normalize(query), num_results])
 def web_search(query: str, num_results: int = 3) -> List[Dict[str, str]]:
     """
     Perform a general web search using Google (via SerpAPI).
@@ -39,7 +46,7 @@ def web_search(query: str, num_results: int = 3) -> List[Dict[str, str]]:
             }
         ]
 
-    url = "https://serpapi.com/search"
+    url = os.getenv("SERPAPI_URL", "https://serpapi.com/search")
     params = {
         "engine": "google",
         "q": query,
@@ -47,9 +54,17 @@ def web_search(query: str, num_results: int = 3) -> List[Dict[str, str]]:
         "num": num_results
     }
 
+    # 10 second timeout as per SOP, cut short by the request's remaining budget
+    timeout = upstream_timeout(10)
+    serpapi = breaker("serpapi")
+    try:
+        serpapi.allow()
+    except CircuitOpen:
+        return _search_fallback(query, num_results)
     try:
-        # 10 second timeout as per SOP
-        response = requests.get(url, params=params, timeout=10)
+        with span("upstream", upstream="serpapi", op="search"):
+            response = requests.get(url, params=params, timeout=timeout)
+        serpapi.record_status(response.status_code)
         
         if response.status_code == 200:
             data = response.json()
@@ -63,6 +78,7 @@ def web_search(query: str, num_results: int = 3) -> List[Dict[str, str]]:
                     "link": item.get("link", ""),
                     "snippet": item.get("snippet", "")
                 })
+            serp_cache.put(query, results, num_results)
             return results
 
         elif response.status_code in [401, 403]:
@@ -72,10 +88,41 @@ def web_search(query: str, num_results: int = 3) -> List[Dict[str, str]]:
             raise APIError(f"Unexpected API response {response.status_code}: {response.text}")
 
     except requests.exceptions.Timeout:
-        raise APIError("The SerpAPI request timed out after 10 seconds.")
+        serpapi.record(False)
+        cached = _cached_results(query, num_results)
+        if cached:
+            return cached
+        raise APIError(f"The SerpAPI request timed out after {timeout:g} seconds.")
     except requests.exceptions.RequestException as e:
+        serpapi.record(False)
+        cached = _cached_results(query, num_results)
+        if cached:
+            return cached
         raise APIError(f"A network error occurred: {str(e)}")
 
+
+def _cached_results(query: str, num_results: int) -> List[Dict[str, str]]:
+    """Earlier SerpAPI results for the same (or a similar) query; empty if none."""
+    cached = serp_cache.get(query, num_results) or serp_cache.search(query, limit=num_results)
+    if cached:
+        note_fallback("serpapi", "stale_cache")
+    return cached or []
+
+
+def _search_fallback(query: str, num_results: int) -> List[Dict[str, str]]:
+    """Fast-fail path while the circuit is open: earlier results, else say search is unavailable."""
+    cached = _cached_results(query, num_results)
+    if cached:
+        return cached
+    note_fallback("serpapi", "unavailable")
+    return [
+        {
+            "title": "Search Unavailable",
+            "link": "",
+            "snippet": "Web search is temporarily unavailable. Please try again in a few minutes."
+        }
+    ]
+
 if __name__ == "__main__":
     # Simple self-test
     try:
@@ -1,10 +1,14 @@
 import os
 import requests
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+
+from bootstrap import load_env
+from telemetry import span
+from request_budget import upstream_timeout
+from circuit_breaker import CircuitOpen, breaker
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 class WhatsAppError(Exception):
     """Raised when WhatsApp API returns an error."""
@@ -36,7 +40,8 @@ def send_whatsapp_message(to_phone_number_id: str, recipient_phone: str, message
         raise AuthError("WHATSAPP_API_TOKEN is not set in the environment.")
 
     # Using v18.0 as per the SOP
-    url = f"https://graph.facebook.com/v18.0/{to_phone_number_id}/messages"
+    base_url = os.getenv("META_GRAPH_BASE_URL", "https://graph.facebook.com").rstrip("/")
+    url = f"{base_url}/v18.0/{to_phone_number_id}/messages"
     
     headers = {
         "Authorization": f"Bearer {token}",
@@ -53,8 +58,16 @@ def send_whatsapp_message(to_phone_number_id: str, recipient_phone: str, message
         }
     }
 
+    timeout = upstream_timeout(10)
+    meta_graph = breaker("meta_graph")
+    try:
+        meta_graph.allow()
+    except CircuitOpen as e:
+        raise WhatsAppError(str(e))
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
+        with span("upstream", upstream="meta_graph", op="send_message"):
+            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        meta_graph.record_status(response.status_code)
         
         if response.status_code in [200, 201]:
             return response.json()
@@ -66,8 +79,10 @@ def send_whatsapp_message(to_phone_number_id: str, recipient_phone: str, message
             raise WhatsAppError(f"Unexpected response from Meta API (Status {response.status_code}): {response.text}")
             
     except requests.exceptions.Timeout:
-        raise WhatsAppError("The WhatsApp API request timed out after 10 seconds.")
+        meta_graph.record(False)
+        raise WhatsAppError(f"The WhatsApp API request timed out after {timeout:g} seconds.")
     except requests.exceptions.RequestException as e:
+        meta_graph.record(False)
         raise WhatsAppError(f"A network error occurred while sending WhatsApp message: {str(e)}")
 
 
@@ -0,0 +1,215 @@
+"""
+Background transcription of audio/video documents.
+
+PATCH /api/documents/{id}/analyze only enqueues a "transcribe" job (see
+jobs.py), so a two-hour hearing recording never holds a request worker.
+The document row mirrors the job for the UI (transcript_status /
+transcript_progress / transcript_error) and the timestamped segments are
+written to transcript_segments after every chunk, so
+GET /api/documents/{id}/transcription can show the transcript as it grows.
+
+When the job finishes, its segments are joined into Document.transcript
+and an extractive summary (lawbot_runtime summarize_doc, no LLM) is
+written to Document.summary.
+
+A job that is retried, or taken over after its worker stopped or died,
+continues after the last saved segment instead of starting over.
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import blob_store
+import jobs
+import change_feed  # noqa: F401  (progress commits reach the sync feed)
+import view_cache  # noqa: F401  (progress commits invalidate the cached case view)
+from database import SessionLocal
+from models import Document, Job, TranscriptSegment, utcnow
+from telemetry import observe
+from lawbot_runtime.tools.summarize_doc import summarize_doc
+from lawbot_runtime.tools.transcribe_audio import (
+    TranscriptionUnavailable, backend_problem, format_timestamp, probe_duration, transcribe_chunks,
+)
+
+MEDIA_TYPES = {"mp3", "wav", "m4a", "aac", "webm", "mp4", "mov", "avi", "mkv"}
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Below interactive background work such as queries (jobs.py priorities: higher first)
+PRIORITY = 0
+
+logger = logging.getLogger("lawbot.transcription")
+
+
+def _latest_job(db: Session, document_id: str) -> Optional[Job]:
+    return (
+        db.query(Job)
+        .filter(Job.document_id == document_id, Job.kind == "transcribe")
+        .order_by(Job.created_at.desc())
+        .first()
+    )
+
+
+def request(db: Session, doc: Document) -> str:
+    """
+    Queue a fresh transcription of `doc`, discarding any earlier result,
+    and return the job id. A job already queued or running is reused.
+    """
+    current = _latest_job(db, doc.id)
+    if current is not None and current.status in (jobs.QUEUED, jobs.RUNNING):
+        return current.id
+    db.query(TranscriptSegment).filter(TranscriptSegment.document_id == doc.id).delete()
+    doc.transcript = None
+    doc.summary = None
+    doc.transcript_status = QUEUED
+    doc.transcript_progress = 0.0
+    doc.transcript_error = None
+    doc.transcript_updated_at = utcnow()
+    db.commit()
+    return jobs.enqueue(
+        "transcribe", {"document_id": doc.id},
+        priority=PRIORITY, case_id=doc.case_id, document_id=doc.id, db=db,
+    )
+
+
+def status(db: Session, doc: Document, after: int = -1, limit: int = 500) -> dict:
+    """The job's state plus up to `limit` segments with an index above `after`."""
+    segments = (
+        db.query(TranscriptSegment)
+        .filter(TranscriptSegment.document_id == doc.id, TranscriptSegment.idx > after)
+        .order_by(TranscriptSegment.idx)
+        .limit(limit)
+        .all()
+    )
+    job = _latest_job(db, doc.id)
+    return {
+        "document_id": doc.id,
+        "job_id": job.id if job is not None else None,
+        "status": doc.transcript_status,
+        "progress": doc.transcript_progress,
+        "duration_s": doc.media_duration_s,
+        "error": doc.transcript_error,
+        "updated_at": doc.transcript_updated_at,
+        "segments": segments,
+    }
+
+
+def _still_exists(db: Session, document_id: str) -> bool:
+    return db.query(Document.id).filter(Document.id == document_id).first() is not None
+
+
+def _summarize(segments: List[TranscriptSegment], duration_s: Optional[float]) -> str:
+    sections = summarize_doc(" ".join(s.text for s in segments), max_sentences_per_section=2)
+    points = [sentence for key in ("facts", "issues", "arguments", "precedents", "reasoning") for sentence in sections[key]]
+    lines = ["**Meeting Summary**"]
+    if duration_s:
+        lines.append(f"- **Duration:** {format_timestamp(duration_s)}")
+    lines.append(f"- **Transcribed:** {utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC")
+    if points:
+        lines += ["", "**Extracted Highlights:**"] + [f"- {p}" for p in points]
+    return "\n".join(lines) + "\n"
+
+
+def _mark(document_id: str, **values) -> None:
+    db = SessionLocal()
+    try:
+        doc = db.get(Document, document_id)
+        if doc is not None:
+            for name, value in values.items():
+                setattr(doc, name, value)
+            doc.transcript_updated_at = utcnow()
+            db.commit()
+    finally:
+        db.close()
+
+
+def run_job(ctx: "jobs.JobContext", payload: Dict[str, Any]) -> Dict[str, Any]:
+    document_id = payload["document_id"]
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        doc = db.get(Document, document_id)
+        if doc is None:
+            raise jobs.PermanentJobError("Document was deleted.")
+        doc.transcript_status = RUNNING
+        doc.transcript_updated_at = utcnow()
+        db.commit()
+
+        last_idx, last_end = (
+            db.query(func.max(TranscriptSegment.idx), func.max(TranscriptSegment.end_s))
+            .filter(TranscriptSegment.document_id == document_id)
+            .one()
+        )
+        next_idx = -1 if last_idx is None else last_idx
+        # A temp copy when the blob store is remote or the blob compressed
+        with blob_store.local_path(doc) as media_path:
+            if doc.media_duration_s is None:
+                doc.media_duration_s = probe_duration(media_path)
+                db.commit()
+            duration = doc.media_duration_s
+
+            chunks = transcribe_chunks(media_path, start_s=last_end or 0.0)
+            try:
+                for position, segments in chunks:
+                    if not _still_exists(db, document_id):
+                        db.rollback()
+                        raise jobs.PermanentJobError("Document was deleted.")
+                    for seg in segments:
+                        next_idx += 1
+                        db.add(TranscriptSegment(
+                            document_id=document_id, idx=next_idx,
+                            start_s=seg["start"], end_s=seg["end"], text=seg["text"],
+                        ))
+                    if duration:
+                        doc.transcript_progress = min(1.0, position / duration)
+                    doc.transcript_updated_at = utcnow()
+                    db.commit()
+                    # Renews the job's lease; raises JobInterrupted if the job should stop
+                    ctx.progress(doc.transcript_progress, f"{format_timestamp(position)} transcribed")
+            finally:
+                chunks.close()
+
+        segments = doc.transcript_segments
+        doc.transcript = "\n".join(f"[{format_timestamp(s.start_s)}] {s.text}" for s in segments)
+        doc.summary = _summarize(segments, duration)
+        doc.transcript_status = DONE
+        doc.transcript_progress = 1.0
+        doc.transcript_error = None
+        doc.transcript_updated_at = utcnow()
+        db.commit()
+        observe("lawbot_transcription_seconds", time.perf_counter() - started)
+        return {"document_id": document_id, "segments": len(segments), "duration_s": duration}
+    except jobs.JobInterrupted:
+        db.rollback()
+        if ctx.cancelled:
+            _mark(document_id, transcript_status=None, transcript_error="Cancelled.")
+        else:
+            # Picked up again later, after the segments saved so far
+            _mark(document_id, transcript_status=QUEUED)
+        raise
+    except TranscriptionUnavailable as e:
+        db.rollback()
+        raise jobs.PermanentJobError(str(e)) from e
+    except jobs.PermanentJobError:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        # jobs.py retries it; on_failed marks the document once attempts run out
+        _mark(document_id, transcript_status=QUEUED, transcript_error=f"Retrying after {type(e).__name__}: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def _on_failed(payload: Dict[str, Any], error: str) -> None:
+    _mark(payload["document_id"], transcript_status=FAILED, transcript_error=error)
+
+
+jobs.register("transcribe", run_job, max_attempts=3, retry_delay_s=30.0, on_failed=_on_failed)
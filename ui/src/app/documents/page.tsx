@@ -217,6 +217,7 @@ export default function DocumentStoragePage() {
                                     }
                                 }
                             }
+                            const thumbnail = documentsApi.thumbnailUrl(doc);
 
                             return (
                                 <div
@@ -225,8 +226,11 @@ export default function DocumentStoragePage() {
                                     className="group relative bg-white border border-zinc-200 rounded-xl p-4 shadow-[0_1px_2px_rgba(0,0,0,0.02)] hover:shadow-md hover:border-zinc-300 transition-all flex flex-col h-40 justify-between cursor-pointer"
                                 >
                                     <div className="flex items-start justify-between">
-                                        <div className="w-10 h-10 rounded-lg bg-blue-50/50 border border-blue-100/50 flex items-center justify-center text-blue-700">
-                                            {getIconForCategory(catForIcon)}
+                                        <div className="w-10 h-10 rounded-lg bg-blue-50/50 border border-blue-100/50 flex items-center justify-center text-blue-700 overflow-hidden">
+                                            {thumbnail ? (
+                                                // eslint-disable-next-line @next/next/no-img-element
+                                                <img src={thumbnail} alt="" loading="lazy" className="w-full h-full object-cover" />
+                                            ) : getIconForCategory(catForIcon)}
                                         </div>
                                         <button
                                             onClick={(e) => { e.stopPropagation(); handleDownload(doc.id); }}
@@ -2,7 +2,7 @@
 
 import { useState, useEffect, useRef, useMemo } from "react";
 import { Search, Filter, Headphones, Video, FileAudio, Mic, StopCircle, Upload, Save, Clock, FileText, X } from "lucide-react";
-import { documentsApi, DocumentItem } from "@/lib/api";
+import { documentsApi, DocumentItem, TranscriptionStatus, TranscriptSegmentItem } from "@/lib/api";
 import { DocumentSelector } from "@/components/DocumentSelector";
 import { DocumentViewer } from "@/components/DocumentViewer";
 
@@ -14,6 +14,9 @@ export default function MeetingAssistantPage() {
     const [isLoading, setIsLoading] = useState(true);
     const [viewDocument, setViewDocument] = useState<DocumentItem | null>(null);
     const [isAnalyzing, setIsAnalyzing] = useState(false);
+    const [transcription, setTranscription] = useState<TranscriptionStatus | null>(null);
+    const [liveSegments, setLiveSegments] = useState<TranscriptSegmentItem[]>([]);
+    const pollRef = useRef<NodeJS.Timeout | null>(null);
     const [activeTab, setActiveTab] = useState<"transcript" | "summary">("transcript");
 
     // UI Search & Filter
@@ -34,7 +37,10 @@ export default function MeetingAssistantPage() {
 
     useEffect(() => {
         loadMeetings();
-        return () => stopRecordingCleanup();
+        return () => {
+            stopRecordingCleanup();
+            stopPolling();
+        };
     }, []);
 
     const loadMeetings = async () => {
@@ -63,16 +69,77 @@ export default function MeetingAssistantPage() {
         if (timerRef.current) clearInterval(timerRef.current);
     };
 
+    const stopPolling = () => {
+        if (pollRef.current) clearTimeout(pollRef.current);
+        pollRef.current = null;
+    };
+
+    // Transcription runs in the background: poll for progress and append new segments as they land
+    const pollTranscription = (docId: string, after: number) => {
+        stopPolling();
+        pollRef.current = setTimeout(async () => {
+            try {
+                const state = await documentsApi.transcription(docId, after);
+                setTranscription(state);
+                setLiveSegments(prev => [...prev, ...state.segments]);
+                const last = state.segments.length ? state.segments[state.segments.length - 1].idx : after;
+                if (state.status === "queued" || state.status === "running") {
+                    pollTranscription(docId, last);
+                } else {
+                    setIsAnalyzing(false);
+                    if (state.status === "done") {
+                        const detail = await documentsApi.get(docId);
+                        setViewDocument(current => (current?.id === detail.id ? detail : current));
+                        loadMeetings();
+                    }
+                }
+            } catch (error) {
+                console.error("Failed to poll transcription", error);
+                pollTranscription(docId, after);
+            }
+        }, 2000);
+    };
+
+    const closeDocument = () => {
+        stopPolling();
+        setIsAnalyzing(false);
+        setTranscription(null);
+        setViewDocument(null);
+    };
+
+    // Listings carry only transcript/summary sizes; fetch the full text when a meeting is opened
+    const openDocument = async (doc: DocumentItem) => {
+        stopPolling();
+        setViewDocument(doc);
+        setLiveSegments([]);
+        setTranscription(null);
+        if (doc.transcript_status === "queued" || doc.transcript_status === "running") {
+            setIsAnalyzing(true);
+            pollTranscription(doc.id, -1);
+            return;
+        }
+        setIsAnalyzing(false);
+        if (!doc.transcript_chars && !doc.summary_chars) return;
+        try {
+            const detail = await documentsApi.get(doc.id);
+            setViewDocument(current => (current?.id === detail.id ? detail : current));
+        } catch (error) {
+            console.error("Failed to load meeting details", error);
+        }
+    };
+
     const handleAnalyze = async (doc: DocumentItem) => {
         setIsAnalyzing(true);
+        setLiveSegments([]);
         try {
-            const updatedDoc = await documentsApi.analyzeMeeting(doc.id);
-            setViewDocument(updatedDoc);
-            loadMeetings();
+            const state = await documentsApi.analyzeMeeting(doc.id);
+            setTranscription(state);
+            setLiveSegments(state.segments);
+            const last = state.segments.length ? state.segments[state.segments.length - 1].idx : -1;
+            pollTranscription(doc.id, last);
         } catch (error) {
             console.error("Error analyzing meeting:", error);
-            alert("Failed to analyze meeting.");
-        } finally {
+            alert(error instanceof Error ? error.message : "Failed to analyze meeting.");
             setIsAnalyzing(false);
         }
     };
@@ -254,7 +321,7 @@ export default function MeetingAssistantPage() {
                                     return (
                                         <div
                                             key={meeting.id}
-                                            onClick={() => setViewDocument(meeting)}
+                                            onClick={() => openDocument(meeting)}
                                             className="bg-white border border-zinc-200 rounded-xl p-4 cursor-pointer hover:border-zinc-300 hover:shadow-sm transition-all flex flex-col justify-between"
                                         >
                                             <div className="flex gap-3 mb-4">
@@ -334,7 +401,7 @@ export default function MeetingAssistantPage() {
                     mode="media"
                     onClose={() => setIsUploadOpen(false)}
                     onSelect={(doc) => {
-                        setViewDocument(doc);
+                        openDocument(doc);
                         setIsUploadOpen(false);
                     }}
                 />
@@ -356,7 +423,7 @@ export default function MeetingAssistantPage() {
                                 </p>
                             </div>
                             <button
-                                onClick={() => setViewDocument(null)}
+                                onClick={closeDocument}
                                 className="w-8 h-8 rounded-full flex items-center justify-center text-zinc-500 hover:text-zinc-800 hover:bg-zinc-200 transition-colors"
                             >
                                 <X className="w-5 h-5" />
@@ -387,13 +454,13 @@ export default function MeetingAssistantPage() {
                                         />
                                     </div>
                                 ) : (
-                                    <DocumentViewer document={viewDocument} onClose={() => setViewDocument(null)} />
+                                    <DocumentViewer document={viewDocument} onClose={closeDocument} />
                                 )}
                             </div>
 
                             {/* Right Side - Analysis */}
                             <div className="w-1/2 flex flex-col bg-white">
-                                {!viewDocument.transcript && !viewDocument.summary ? (
+                                {!viewDocument.transcript_chars && !viewDocument.summary_chars ? (
                                     <div className="flex-1 flex flex-col items-center justify-center p-12 text-center">
                                         <div className="w-16 h-16 bg-blue-50 rounded-2xl flex items-center justify-center mb-6 border border-blue-100">
                                             <FileText className="w-8 h-8 text-blue-500" />
@@ -413,7 +480,9 @@ export default function MeetingAssistantPage() {
                                             {isAnalyzing ? (
                                                 <>
                                                     <div className="w-4 h-4 border-2 border-zinc-400 border-t-transparent rounded-full animate-spin"></div>
-                                                    Analyzing Audio...
+                                                    {transcription?.status === "queued"
+                                                        ? "Queued..."
+                                                        : `Transcribing${transcription?.progress != null ? ` ${Math.round(transcription.progress * 100)}%` : ""}...`}
                                                 </>
                                             ) : (
                                                 <>
@@ -421,6 +490,21 @@ export default function MeetingAssistantPage() {
                                                 </>
                                             )}
                                         </button>
+                                        {transcription?.status === "failed" && (
+                                            <p className="text-[13px] text-red-600 mt-4 max-w-sm">{transcription.error || "Transcription failed."}</p>
+                                        )}
+                                        {liveSegments.length > 0 && (
+                                            <div className="mt-8 w-full max-h-72 overflow-y-auto text-left space-y-3">
+                                                {liveSegments.map(seg => (
+                                                    <div key={seg.idx} className="flex gap-4 text-[13px]">
+                                                        <span className="text-zinc-400 font-mono shrink-0">
+                                                            [{new Date(seg.start_s * 1000).toISOString().substring(11, 19)}]
+                                                        </span>
+                                                        <span className="text-zinc-700 leading-relaxed">{seg.text}</span>
+                                                    </div>
+                                                ))}
+                                            </div>
+                                        )}
                                     </div>
                                 ) : (
                                     <>
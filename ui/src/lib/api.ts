@@ -45,10 +45,42 @@ export interface DocumentItem {
     file_type: string | null;
     file_size: number | null;
     uploaded_at: string;
+    transcript_chars?: number;
+    summary_chars?: number;
+    transcript_preview?: string | null;
+    summary_preview?: string | null;
+    transcript_status?: "queued" | "running" | "done" | "failed" | null;
+    transcript_progress?: number | null;
+    // Thumbnail (.jpg) or waveform summary (.json), once rendered; immutable, cached by the browser
+    preview_url?: string | null;
+    // Only on DocumentDetail (GET /api/documents/:id); listings omit the full text
     transcript?: string | null;
     summary?: string | null;
 }
 
+export interface DocumentDetail extends DocumentItem {
+    transcript: string | null;
+    summary: string | null;
+}
+
+export interface TranscriptSegmentItem {
+    idx: number;
+    start_s: number;
+    end_s: number;
+    text: string;
+}
+
+export interface TranscriptionStatus {
+    document_id: string;
+    job_id: string | null;
+    status: "queued" | "running" | "done" | "failed" | null;
+    progress: number | null;
+    duration_s: number | null;
+    error: string | null;
+    updated_at: string | null;
+    segments: TranscriptSegmentItem[];
+}
+
 export interface CalendarEventItem {
     id: string;
     case_id: string | null;
@@ -105,6 +137,8 @@ export const documentsApi = {
     list: (caseId: string) =>
         request<DocumentItem[]>(`/api/cases/${caseId}/documents`),
 
+    get: (id: string) => request<DocumentDetail>(`/api/documents/${id}`),
+
     upload: async (file: File, caseId?: string | null): Promise<DocumentItem> => {
         const formData = new FormData();
         formData.append("file", file);
@@ -131,11 +165,18 @@ export const documentsApi = {
     downloadUrl: (documentId: string) =>
         `${API_BASE}/api/documents/${documentId}/download`,
 
+    thumbnailUrl: (doc: DocumentItem): string | null =>
+        doc.preview_url && doc.preview_url.endsWith(".jpg") ? `${API_BASE}${doc.preview_url}` : null,
+
     delete: (documentId: string) =>
         request<void>(`/api/documents/${documentId}`, { method: "DELETE" }),
 
+    // Queues transcription; poll `transcription` for progress and new segments
     analyzeMeeting: (documentId: string) =>
-        request<DocumentItem>(`/api/documents/${documentId}/analyze`, { method: "PATCH" }),
+        request<TranscriptionStatus>(`/api/documents/${documentId}/analyze`, { method: "PATCH" }),
+
+    transcription: (documentId: string, after = -1) =>
+        request<TranscriptionStatus>(`/api/documents/${documentId}/transcription?after=${after}`),
 };
 
 // ─── Calendar Events ─────────────────────────────────────────
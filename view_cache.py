@@ -0,0 +1,228 @@
+"""
+Read-through cache for the case detail and calendar views, with ETags.
+
+GET /api/cases/{id} and GET /api/calendar/events are polled by the
+frontend. Their JSON is kept in the shared cache (shared_cache.py, so all
+workers see one copy) under a key built from the request and the version
+tokens of the data it shows:
+
+    case:<id>            the case, its documents and its events
+    calendar:<YYYY-MM>   events dated in that month
+    calendar:all         every event (windows without both bounds, or wider
+                         than LAWBOT_VIEW_CACHE_MAX_MONTHS)
+    calendar:epoch       events whose date a write could not tell
+
+A token is a random string. Writes replace the tokens they touch, which
+orphans every body and ETag built from the old ones; nothing is deleted,
+entries simply age out. The ETag is that key, so a client sending it back
+in If-None-Match gets a 304 from the cache alone, without a database query.
+
+Writes are noticed by SQLAlchemy session events: after each flush the new,
+changed and deleted cases, documents and events are turned into the tokens
+they affect (old and new case and date alike), and those are replaced once
+the transaction commits; a rollback drops them. Statements that bypass the
+unit of work (insert(Model) executemany in bulk import and deadline sync)
+report their rows with touch(). Processes that write (a separate
+`python jobs.py`, several API workers) must share LAWBOT_CACHE_DB, or their
+invalidations stay in their own memory.
+
+Env:
+    LAWBOT_VIEW_CACHE=1                0 serves both views straight from the database
+    LAWBOT_CACHE_VIEW_TTL_S=600        lifetime of a cached body (shared_cache.py)
+    LAWBOT_VIEW_CACHE_MAX_MONTHS=13    widest window cached per month
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+from itertools import chain
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from models import CalendarEvent, Case, Document
+from shared_cache import CACHE_ENABLED, cache
+from telemetry import count
+
+VIEW_CACHE = CACHE_ENABLED and os.environ.get("LAWBOT_VIEW_CACHE", "1") != "0"
+MAX_MONTHS = int(os.environ.get("LAWBOT_VIEW_CACHE_MAX_MONTHS", "13"))
+# Tokens outlive the bodies built on them; one that is evicted anyway only costs a miss
+TOKEN_TTL_S = 30 * 24 * 3600
+CACHE_CONTROL = "private, no-cache"
+
+_PENDING = "view_cache_scopes"
+
+logger = logging.getLogger("lawbot.view_cache")
+
+
+# ─── Scopes ───────────────────────────────────────────────────
+
+def case_scopes(case_id: str) -> List[str]:
+    return [f"case:{case_id}"]
+
+
+def calendar_scopes(start: Optional[datetime], end: Optional[datetime]) -> List[str]:
+    """The tokens a calendar window depends on."""
+    if start is None or end is None:
+        return ["calendar:all"]
+    months = (end.year - start.year) * 12 + end.month - start.month
+    if months >= MAX_MONTHS:
+        return ["calendar:all"]
+    year, month = start.year, start.month
+    scopes = ["calendar:epoch"]
+    for _ in range(months + 1):
+        scopes.append(f"calendar:{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return scopes
+
+
+def _event_scopes(case_ids: Iterable[Optional[str]], dates: Iterable[Any]) -> Set[str]:
+    scopes = {"calendar:all"}
+    scopes.update(f"case:{case_id}" for case_id in case_ids if case_id)
+    dates = list(dates)
+    if not dates:
+        scopes.add("calendar:epoch")
+    for value in dates:
+        if isinstance(value, datetime):
+            scopes.add(f"calendar:{value.year:04d}-{value.month:02d}")
+        else:
+            scopes.add("calendar:epoch")
+    return scopes
+
+
+# ─── Invalidation ─────────────────────────────────────────────
+
+def _values(obj: Any, attr: str) -> List[Any]:
+    """Every value `attr` had in this flush: before and after a change, or the current one."""
+    history = inspect(obj).attrs[attr].history
+    return [v for v in chain(history.added or (), history.unchanged or (), history.deleted or ()) if v is not None]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, _flush_context) -> None:
+    scopes: Set[str] = session.info.setdefault(_PENDING, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, CalendarEvent):
+            scopes |= _event_scopes(_values(obj, "case_id"), _values(obj, "event_date"))
+        elif isinstance(obj, Document):
+            scopes.update(f"case:{case_id}" for case_id in _values(obj, "case_id"))
+        elif isinstance(obj, Case):
+            scopes.add(f"case:{obj.id}")
+            title = inspect(obj).attrs.title.history
+            if obj not in session.new and title.added and title.deleted:
+                # Calendar responses show the case title
+                dates = session.connection().execute(
+                    select(CalendarEvent.event_date).where(CalendarEvent.case_id == obj.id)
+                ).scalars().all()
+                if dates:
+                    scopes |= _event_scopes((), dates)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    scopes = session.info.pop(_PENDING, None)
+    if scopes:
+        invalidate(scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def touch(session: Session, case_ids: Iterable[Optional[str]] = (), event_dates: Optional[Iterable[Any]] = None) -> None:
+    """
+    Record rows written without the unit of work (insert(Model) executemany):
+    the cases they belong to and, for calendar events, their dates. The
+    tokens are replaced when the session commits.
+    """
+    scopes: Set[str] = session.info.setdefault(_PENDING, set())
+    if event_dates is None:
+        scopes.update(f"case:{case_id}" for case_id in case_ids if case_id)
+    else:
+        scopes |= _event_scopes(case_ids, event_dates)
+
+
+def invalidate(scopes: Iterable[str]) -> None:
+    """Replace the tokens of `scopes`, so views built on them are recomputed."""
+    if not VIEW_CACHE:
+        return
+    try:
+        for scope in scopes:
+            cache.set("view_scope", scope, uuid.uuid4().hex, TOKEN_TTL_S)
+            count("lawbot_view_cache_invalidations_total", scope=scope.split(":")[0])
+    except sqlite3.Error:
+        # A token left behind keeps serving the old view: say so loudly
+        logger.exception("Could not invalidate cached views %s", sorted(scopes))
+        count("lawbot_view_cache_total", result="error")
+
+
+# ─── Serving ──────────────────────────────────────────────────
+
+def _token(scope: str) -> str:
+    token = cache.get("view_scope", scope)
+    if token is None:
+        token = uuid.uuid4().hex
+        cache.set("view_scope", scope, token, TOKEN_TTL_S)
+    return token
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def lookup(request: Request, view: str, parts: Any, scopes: List[str]) -> Tuple[Optional[str], Optional[Response]]:
+    """
+    (etag, response) for a cacheable GET: a 304 or the cached body when the
+    cache can answer, else (etag, None) and the caller builds the view and
+    passes it to store(). The etag is None when caching is off or broken.
+    """
+    if not VIEW_CACHE:
+        return None, None
+    try:
+        tokens = [_token(scope) for scope in scopes]
+        key = json.dumps([view, parts, tokens], sort_keys=True, default=str)
+        etag = '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+        if _not_modified(request, etag):
+            count("lawbot_view_cache_total", view=view, result="not_modified")
+            return etag, Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+        body = cache.get("view", etag)
+    except sqlite3.Error:
+        count("lawbot_view_cache_total", view=view, result="error")
+        return None, None
+    if body is None:
+        count("lawbot_view_cache_total", view=view, result="miss")
+        return etag, None
+    count("lawbot_view_cache_total", view=view, result="hit")
+    return etag, _response(body, etag)
+
+
+def store(etag: Optional[str], content: Any) -> Any:
+    """Cache a freshly built view (a response model or a list of them) under `etag` and return it."""
+    if etag is None:
+        return content
+    if isinstance(content, list):
+        body = "[" + ",".join(item.model_dump_json() for item in content) + "]"
+    else:
+        body = content.model_dump_json()
+    try:
+        cache.set("view", etag, body)
+    except sqlite3.Error:
+        count("lawbot_view_cache_total", result="error")
+    return _response(body, etag)
+
+
+def _response(body: str, etag: str) -> Response:
+    return Response(
+        content=body, media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )